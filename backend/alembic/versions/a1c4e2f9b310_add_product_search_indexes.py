@@ -0,0 +1,42 @@
+"""add product search indexes (pg_trgm + tsvector)
+
+Revision ID: a1c4e2f9b310
+Revises: 707c054ab4b0
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c4e2f9b310'
+down_revision: Union[str, None] = '707c054ab4b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app/utils/product_search.py içindeki PG_SEARCH_EXPR ile aynı olmalı
+SEARCH_EXPR = (
+    "lower(translate(coalesce(name, '') || ' ' || coalesce(brand, ''), "
+    "'İIıŞşĞğÜüÖöÇç', 'iiissgguuoocc'))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        f"CREATE INDEX IF NOT EXISTS ix_products_search_trgm "
+        f"ON products USING gin (({SEARCH_EXPR}) gin_trgm_ops)"
+    )
+    op.execute(
+        f"CREATE INDEX IF NOT EXISTS ix_products_search_tsv "
+        f"ON products USING gin (to_tsvector('simple', {SEARCH_EXPR}))"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_products_search_tsv")
+    op.execute("DROP INDEX IF EXISTS ix_products_search_trgm")
@@ -0,0 +1,33 @@
+"""add price_history (product_id, market_id, created_at, id) index
+
+Revision ID: a8d2c5e7f390
+Revises: f3b7d9e2a461
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d2c5e7f390'
+down_revision: Union[str, None] = 'f3b7d9e2a461'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Bir (ürün, market) çiftinin son fiyatı bu indeksle tek satır okunarak bulunur
+    op.create_index(
+        'ix_price_history_product_market_created',
+        'price_history',
+        ['product_id', 'market_id', 'created_at', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_price_history_product_market_created', table_name='price_history')
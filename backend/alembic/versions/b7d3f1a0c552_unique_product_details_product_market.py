@@ -0,0 +1,39 @@
+"""unique (product_id, market_id) on product_details
+
+Revision ID: b7d3f1a0c552
+Revises: a1c4e2f9b310
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3f1a0c552'
+down_revision: Union[str, None] = 'a1c4e2f9b310'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Aynı (ürün, market) için birden fazla satır varsa en yenisini tut
+    op.execute("""
+        DELETE FROM product_details pd
+        USING product_details newer
+        WHERE pd.product_id = newer.product_id
+          AND pd.market_id = newer.market_id
+          AND pd.id < newer.id
+    """)
+    op.create_unique_constraint(
+        'uq_product_details_product_market',
+        'product_details',
+        ['product_id', 'market_id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_product_details_product_market', 'product_details', type_='unique')
@@ -0,0 +1,32 @@
+"""add trigram index on products.barcode for barcode-fragment search
+
+Revision ID: c4e1a7d9b2f5
+Revises: a8d2c5e7f390
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1a7d9b2f5'
+down_revision: Union[str, None] = 'a8d2c5e7f390'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rakam sorguları barcode LIKE '%...%' ile aranır; tam tarama yerine bu indeks kullanılır
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_products_barcode_trgm "
+        "ON products USING gin (barcode gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_products_barcode_trgm")
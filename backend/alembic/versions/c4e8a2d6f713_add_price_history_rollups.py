@@ -0,0 +1,58 @@
+"""add price_history_rollups table
+
+Revision ID: c4e8a2d6f713
+Revises: b7d3f1a0c552
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a2d6f713'
+down_revision: Union[str, None] = 'b7d3f1a0c552'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'price_history_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('market_id', sa.Integer(), nullable=False),
+        sa.Column('granularity', sa.String(length=8), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('min_price', sa.Float(), nullable=False),
+        sa.Column('max_price', sa.Float(), nullable=False),
+        sa.Column('sum_price', sa.Float(), nullable=False),
+        sa.Column('sample_count', sa.Integer(), nullable=False),
+        sa.Column('last_price', sa.Float(), nullable=False),
+        sa.Column('last_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['market_id'], ['markets.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'product_id', 'market_id', 'granularity', 'bucket_start',
+            name='uq_price_history_rollups_bucket'
+        ),
+    )
+    op.create_index(op.f('ix_price_history_rollups_id'), 'price_history_rollups', ['id'], unique=False)
+    # Ürün grafiği sorgusu: product_id + granularity + bucket_start aralığı
+    op.create_index(
+        'ix_price_history_rollups_product_granularity_bucket',
+        'price_history_rollups',
+        ['product_id', 'granularity', 'bucket_start'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_price_history_rollups_product_granularity_bucket', table_name='price_history_rollups')
+    op.drop_index(op.f('ix_price_history_rollups_id'), table_name='price_history_rollups')
+    op.drop_table('price_history_rollups')
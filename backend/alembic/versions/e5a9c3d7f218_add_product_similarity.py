@@ -0,0 +1,46 @@
+"""add product_similarity tables
+
+Revision ID: e5a9c3d7f218
+Revises: d2f6b8c1e904
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9c3d7f218'
+down_revision: Union[str, None] = 'd2f6b8c1e904'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'product_similarity',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('neighbor_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['neighbor_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_id', 'rank'),
+    )
+    op.create_index('ix_product_similarity_neighbor', 'product_similarity', ['neighbor_id'], unique=False)
+    op.create_table(
+        'product_similarity_queue',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('queued_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('product_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('product_similarity_queue')
+    op.drop_index('ix_product_similarity_neighbor', table_name='product_similarity')
+    op.drop_table('product_similarity')
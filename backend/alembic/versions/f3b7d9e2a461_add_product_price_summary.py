@@ -0,0 +1,63 @@
+"""add product_price_summary table
+
+Revision ID: f3b7d9e2a461
+Revises: e5a9c3d7f218
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b7d9e2a461'
+down_revision: Union[str, None] = 'e5a9c3d7f218'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'product_price_summary',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('min_price', sa.Float(), nullable=False),
+        sa.Column('min_market_id', sa.Integer(), nullable=True),
+        sa.Column('max_price', sa.Float(), nullable=False),
+        sa.Column('avg_price', sa.Float(), nullable=False),
+        sa.Column('market_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['min_market_id'], ['markets.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('product_id'),
+    )
+    op.create_index('ix_product_price_summary_min_price', 'product_price_summary', ['min_price'], unique=False)
+    # Mevcut fiyatlardan ilk doldurma; en ucuz market eşitlikte en küçük market_id
+    op.execute("""
+        INSERT INTO product_price_summary (
+            product_id, min_price, min_market_id, max_price, avg_price, market_count, updated_at
+        )
+        SELECT agg.product_id, agg.min_price, cheapest.market_id, agg.max_price,
+               agg.avg_price, agg.market_count, now()
+        FROM (
+            SELECT product_id, min(price) AS min_price, max(price) AS max_price,
+                   avg(price) AS avg_price, count(*) AS market_count
+            FROM product_details
+            WHERE product_id IS NOT NULL
+            GROUP BY product_id
+        ) agg
+        JOIN (
+            SELECT DISTINCT ON (product_id) product_id, market_id
+            FROM product_details
+            WHERE product_id IS NOT NULL
+            ORDER BY product_id, price, market_id
+        ) cheapest ON cheapest.product_id = agg.product_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_price_summary_min_price', table_name='product_price_summary')
+    op.drop_table('product_price_summary')
@@ -6,7 +6,10 @@ from app.api.endpoints import (
     products,
     categories,
     markets,
-    favorites
+    favorites,
+    product_details,
+    price_alerts,
+    price_history
 )
 
 api_router = APIRouter()
@@ -16,4 +19,7 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(products.router, prefix="/products", tags=["products"])
 api_router.include_router(categories.router, prefix="/categories", tags=["categories"])
 api_router.include_router(markets.router, prefix="/markets", tags=["markets"])
-api_router.include_router(favorites.router, prefix="/favorites", tags=["favorites"]) 
\ No newline at end of file
+api_router.include_router(favorites.router, prefix="/favorites", tags=["favorites"])
+api_router.include_router(product_details.router, prefix="/product-details", tags=["product-details"])
+api_router.include_router(price_alerts.router, prefix="/price-alerts", tags=["price-alerts"])
+api_router.include_router(price_history.router, prefix="/price-history", tags=["price-history"])
@@ -52,11 +52,11 @@ async def login_for_access_token(
     try:
         # Trim whitespace from email
         email = login_data.email.strip()
-        logger.info(f"Login attempt for email: {email}")
+        logger.debug("Login attempt for email: %s", email)
         
         # Validate email format
         if '@' not in email:
-            logger.warning(f"Invalid email format: {email}")
+            logger.warning("Invalid email format: %s", email)
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail="Invalid email format. Please provide a valid email address."
@@ -64,7 +64,7 @@ async def login_for_access_token(
         
         user = crud.get_user_by_email(db, email=email)
         if not user:
-            logger.warning(f"User not found: {email}")
+            logger.warning("User not found: %s", email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found",
@@ -72,7 +72,7 @@ async def login_for_access_token(
             )
         
         if not verify_password(login_data.password, user.password):
-            logger.warning(f"Invalid password for user: {email}")
+            logger.warning("Invalid password for user: %s", email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect password",
@@ -84,7 +84,7 @@ async def login_for_access_token(
             data={"sub": str(user.id)}, expires_delta=access_token_expires
         )
         
-        logger.info(f"Successful login for user: {email}")
+        logger.debug("Successful login for user: %s", email)
         return {
             "access_token": access_token,
             "token_type": "bearer",
@@ -95,7 +95,7 @@ async def login_for_access_token(
             }
         }
     except Exception as e:
-        logger.error(f"Login error: {str(e)}", exc_info=True)
+        logger.error("Login error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -111,12 +111,12 @@ async def register_user(
         user_data.email = user_data.email.strip()
         user_data.name = user_data.name.strip()
         
-        logger.info(f"Registration attempt for email: {user_data.email}")
+        logger.debug("Registration attempt for email: %s", user_data.email)
         
         # Check if user already exists
         db_user = crud.get_user_by_email(db, email=user_data.email)
         if db_user:
-            logger.warning(f"User already exists: {user_data.email}")
+            logger.warning("User already exists: %s", user_data.email)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
@@ -131,7 +131,7 @@ async def register_user(
             data={"sub": str(user.id)}, expires_delta=access_token_expires
         )
         
-        logger.info(f"Successful registration for user: {user_data.email}")
+        logger.info("Successful registration for user: %s", user_data.email)
         return {
             "access_token": access_token,
             "token_type": "bearer",
@@ -142,7 +142,7 @@ async def register_user(
             }
         }
     except Exception as e:
-        logger.error(f"Registration error: {str(e)}", exc_info=True)
+        logger.error("Registration error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -155,7 +155,7 @@ async def read_users_me(
     try:
         return current_user
     except Exception as e:
-        logger.error(f"Error getting user details: {str(e)}", exc_info=True)
+        logger.error("Error getting user details: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
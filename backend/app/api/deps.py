@@ -1,4 +1,4 @@
-from typing import Generator, Optional
+from typing import AsyncGenerator, Generator, Optional
 import logging
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
@@ -10,6 +10,8 @@ from app import crud, models, schemas
 from app.core import security
 from app.core.config import settings
 from app.db.session import SessionLocal
+from app.db.async_session import AsyncSessionLocal, get_async_db  # noqa: F401
+from app.db import replica
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +27,28 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+def get_read_db(request: Request) -> Generator:
+    """
+    Salt okunur uç noktalar için oturum; okuma kopyası tanımlı, sağlıklı ve
+    yeterince güncelse GET istekleri kopyaya, diğerleri birincil sunucuya gider.
+    İstemcinin son yazması kopyaya henüz ulaşmamışsa okuma da birincilden yapılır.
+    """
+    session_factory = replica.ReplicaSessionLocal if replica.use_replica(request) else SessionLocal
+    try:
+        db = session_factory()
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(request: Request) -> AsyncGenerator:
+    """
+    get_read_db()'nin AsyncSession karşılığı.
+    """
+    use_replica = await replica.use_replica_async(request)
+    session_factory = replica.AsyncReplicaSessionLocal if use_replica else AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
+
 def get_current_user(
     request: Request,
     db: Session = Depends(get_db),
@@ -102,20 +102,20 @@ def login_access_token(
     OAuth2 compatible token login, get an access token for future requests.
     """
     try:
-        logger.info(f"Login attempt for user: {form_data.username}")
+        logger.debug("Login attempt for user: %s", form_data.username)
         
         user = crud.user.authenticate(
             db, email=form_data.username, password=form_data.password
         )
         if not user:
-            logger.warning(f"Authentication failed for user: {form_data.username}")
+            logger.warning("Authentication failed for user: %s", form_data.username)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         elif not user.is_active:
-            logger.warning(f"Inactive user attempt: {form_data.username}")
+            logger.warning("Inactive user attempt: %s", form_data.username)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Inactive user",
@@ -127,15 +127,14 @@ def login_access_token(
             data={"sub": str(user.id)}, expires_delta=access_token_expires
         )
         
-        logger.info(f"Successfully generated token for user: {user.email}")
-        logger.info(f"Token payload: {{'sub': '{user.id}'}}")
+        logger.debug("Generated token for user %s", user.id)
         
         return Token(access_token=access_token, token_type="bearer")
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Login error: {str(e)}", exc_info=True)
+        logger.error("Login error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
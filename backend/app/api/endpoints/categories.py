@@ -4,13 +4,17 @@ from typing import List
 
 from app.db.session import get_db
 from app.schemas.category import Category as CategorySchema, CategoryCreate, CategoryUpdate
+from app.utils.response_cache import response_cache
+from app.utils.category_tree import CategoryCycleError
 from ... import crud, schemas
 
 router = APIRouter()
 
 @router.post("", response_model=schemas.Category)
 def create_category(category: schemas.CategoryCreate, db: Session = Depends(get_db)):
-    return crud.create_category(db=db, category=category)
+    db_category = crud.create_category(db=db, category=category)
+    response_cache.invalidate("categories")
+    return db_category
 
 @router.get("", response_model=List[CategorySchema])
 def read_categories(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
@@ -26,9 +30,15 @@ def read_category(category_id: int, db: Session = Depends(get_db)):
 
 @router.put("/{category_id}", response_model=CategorySchema)
 def update_category(category_id: int, category: CategoryUpdate, db: Session = Depends(get_db)):
-    db_category = crud.update_category(db, category_id=category_id, category=category)
+    try:
+        db_category = crud.update_category(db, category_id=category_id, category=category)
+    except CategoryCycleError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
     if db_category is None:
         raise HTTPException(status_code=404, detail="Category not found")
+    # Alt ağaç değişmiş olabilir; kategoriye göre süzülmüş ürün listeleri de düşer
+    response_cache.invalidate("categories", f"category:{category_id}", "products")
     return db_category
 
 @router.delete("/{category_id}", response_model=CategorySchema)
@@ -36,4 +46,6 @@ def delete_category(category_id: int, db: Session = Depends(get_db)):
     db_category = crud.delete_category(db, category_id=category_id)
     if db_category is None:
         raise HTTPException(status_code=404, detail="Category not found")
-    return db_category 
\ No newline at end of file
+    # Alt ağaç değişmiş olabilir; kategoriye göre süzülmüş ürün listeleri de düşer
+    response_cache.invalidate("categories", f"category:{category_id}", "products")
+    return db_category
\ No newline at end of file
@@ -1,12 +1,10 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Body
 from sqlalchemy.orm import Session
-from sqlalchemy import text
 from app import crud, models, schemas
 from app.api import deps
 from app.models.product_detail import ProductDetail
 import logging
-import traceback
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -21,38 +19,38 @@ def create_favorite(
     """
     Add a product to favorites by updating product_details.
     """
-    logger.info(f"Creating favorite for product {product_id} and market {market_id} by user {current_user.id}")
+    logger.debug("Creating favorite for product %s and market %s by user %s", product_id, market_id, current_user.id)
     
     # Check if product exists
     product = crud.get_product(db, product_id)
     if not product:
-        logger.error(f"Product {product_id} not found")
+        logger.warning("Product %s not found", product_id)
         raise HTTPException(status_code=404, detail="Product not found")
     
     # Check if market exists
     market = crud.get_market(db, market_id)
     if not market:
-        logger.error(f"Market {market_id} not found")
+        logger.warning("Market %s not found", market_id)
         raise HTTPException(status_code=404, detail="Market not found")
     
     # Get product detail
     product_detail = crud.get_product_detail_by_product_and_market(db, product_id, market_id)
     if not product_detail:
-        logger.error(f"Product detail not found for product {product_id} and market {market_id}")
+        logger.warning("Product detail not found for product %s and market %s", product_id, market_id)
         raise HTTPException(status_code=404, detail="Product detail not found")
     
     # Check if already favorited
     if product_detail.is_favorite:
-        logger.warning(f"Product {product_id} already in favorites for user {current_user.id}")
+        logger.debug("Product %s already in favorites for user %s", product_id, current_user.id)
         raise HTTPException(status_code=400, detail="Product already in favorites")
     
     # Update product detail
     try:
         updated_detail = crud.update_product_detail_favorite(db, product_detail.id, True)
-        logger.info(f"Successfully created favorite: {updated_detail}")
+        logger.debug("Created favorite for product detail %s", updated_detail.id)
         return updated_detail
     except Exception as e:
-        logger.error(f"Error creating favorite: {str(e)}")
+        logger.error("Error creating favorite: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/{product_id}")
@@ -85,25 +83,13 @@ def read_favorites(
     Get all favorite products from product_details.
     """
     try:
-        logger.info("Getting all favorites")
-        logger.info(f"Database session: {db}")
-        
-        # Test database connection
-        try:
-            db.execute(text("SELECT 1"))
-            logger.info("Database connection successful")
-        except Exception as e:
-            logger.error(f"Database connection failed: {str(e)}")
-            raise HTTPException(status_code=500, detail="Database connection failed")
-        
+        # Bağlantı sağlığı havuzun pre-ping'iyle denetlenir; istek başına SELECT 1 yapılmaz
         favorites = crud.get_favorite_product_details(db, skip=skip, limit=limit)
-        logger.info(f"Found {len(favorites)} favorites")
-        logger.info(f"First favorite (if any): {favorites[0] if favorites else None}")
+        logger.debug("read_favorites: %d favorites", len(favorites))
         
         return favorites
     except Exception as e:
-        logger.error(f"Error in read_favorites: {str(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.error("Error in read_favorites: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/toggle/{detail_id}", response_model=schemas.ProductDetail)
@@ -115,25 +101,21 @@ def toggle_favorite(
     Toggle favorite status for a product detail.
     """
     try:
-        logger.info(f"Toggling favorite for detail_id: {detail_id}")
         product_detail = db.query(ProductDetail).filter(ProductDetail.id == detail_id).first()
         
         if not product_detail:
-            logger.error(f"Product detail not found for id: {detail_id}")
+            logger.warning("Product detail not found for id: %s", detail_id)
             raise HTTPException(status_code=404, detail="Product detail not found")
         
-        logger.info(f"Current favorite status: {product_detail.is_favorite}")
         product_detail.is_favorite = not product_detail.is_favorite
-        logger.info(f"New favorite status: {product_detail.is_favorite}")
         
         db.commit()
         db.refresh(product_detail)
-        logger.info(f"Successfully toggled favorite status for detail_id: {detail_id}")
+        logger.debug("Toggled favorite for detail %s to %s", detail_id, product_detail.is_favorite)
         
         return product_detail
     except Exception as e:
-        logger.error(f"Error in toggle_favorite: {str(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.error("Error in toggle_favorite: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/check/{product_id}")
@@ -1,13 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from typing import List
 
 from app.db.session import get_db
+from app.api import deps
 from app.models.market import Market
 from app.models.product import Product
 from app.models.product_detail import ProductDetail
 from app.schemas.market import Market as MarketSchema, MarketCreate, MarketUpdate
 from app.schemas.product import Product as ProductSchema
+from app.utils.price_summary import market_product_ids, refresh_price_summaries
+from app.utils.response_cache import response_cache
+from app.utils.price_matrix import price_matrix
+from app.utils.product_similarity import queue_similarity_refresh_many
 
 router = APIRouter()
 
@@ -17,16 +24,17 @@ def create_market(market: MarketCreate, db: Session = Depends(get_db)):
     db.add(db_market)
     db.commit()
     db.refresh(db_market)
+    response_cache.invalidate("markets")
     return db_market
 
 @router.get("/", response_model=List[MarketSchema])
-def read_markets(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    markets = db.query(Market).offset(skip).limit(limit).all()
-    return markets
+async def read_markets(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(deps.get_async_read_db)):
+    result = await db.execute(select(Market).order_by(Market.id).offset(skip).limit(limit))
+    return result.scalars().all()
 
 @router.get("/{market_id}", response_model=MarketSchema)
-def read_market(market_id: int, db: Session = Depends(get_db)):
-    db_market = db.query(Market).filter(Market.id == market_id).first()
+async def read_market(market_id: int, db: AsyncSession = Depends(deps.get_async_read_db)):
+    db_market = await db.get(Market, market_id)
     if db_market is None:
         raise HTTPException(status_code=404, detail="Market not found")
     return db_market
@@ -42,6 +50,7 @@ def update_market(market_id: int, market: MarketUpdate, db: Session = Depends(ge
     
     db.commit()
     db.refresh(db_market)
+    response_cache.invalidate("markets", f"market:{market_id}")
     return db_market
 
 @router.delete("/{market_id}", response_model=MarketSchema)
@@ -50,23 +59,37 @@ def delete_market(market_id: int, db: Session = Depends(get_db)):
     if db_market is None:
         raise HTTPException(status_code=404, detail="Market not found")
     
+    # Marketin fiyatları silinince bu ürünlerin özetleri değişir
+    product_ids = market_product_ids(db, market_id)
     db.delete(db_market)
+    db.flush()
+    refresh_price_summaries(db, product_ids)
+    queue_similarity_refresh_many(db, product_ids)
     db.commit()
+    price_matrix.remove_market(market_id)
+    # Silinen fiyatlar ürün listesindeki min/max fiyatı ve ürün sayfalarını da değiştirir
+    response_cache.invalidate(
+        "markets", f"market:{market_id}", f"market-products:{market_id}", "products",
+        *(f"product:{product_id}" for product_id in product_ids)
+    )
     return db_market
 
 @router.get("/{market_id}/products", response_model=List[ProductSchema])
-def get_market_products(market_id: int, db: Session = Depends(get_db)):
+async def get_market_products(market_id: int, db: AsyncSession = Depends(deps.get_async_read_db)):
     # Önce market'in var olup olmadığını kontrol et
-    market = db.query(Market).filter(Market.id == market_id).first()
+    market = await db.get(Market, market_id)
     if not market:
         raise HTTPException(status_code=404, detail="Market not found")
     
-    # Market'teki ürünleri getir
-    products = (
-        db.query(Product)
+    # Market'teki ürünleri getir; yanıt şeması ilişkileri okuduğu için
+    # hepsi önceden yüklenir (async oturumda tembel yükleme yapılamaz)
+    result = await db.execute(
+        select(Product)
         .join(ProductDetail)
         .filter(ProductDetail.market_id == market_id)
-        .all()
+        .options(
+            selectinload(Product.details).selectinload(ProductDetail.market),
+            selectinload(Product.categories)
+        )
     )
-    
-    return products 
\ No newline at end of file
+    return result.scalars().unique().all() 
\ No newline at end of file
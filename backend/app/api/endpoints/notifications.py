@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.db.session import get_db
 from app.models.notification import Notification
 from app.schemas.notification import Notification as NotificationSchema, NotificationCreate, NotificationUpdate
+from app.utils.pagination import paginate, set_next_cursor
 
 router = APIRouter()
 
@@ -17,10 +18,24 @@ def create_notification(notification: NotificationCreate, db: Session = Depends(
     return db_notification
 
 @router.get("/user/{user_id}", response_model=List[NotificationSchema])
-def read_user_notifications(user_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    notifications = db.query(Notification).filter(
-        Notification.user_id == user_id
-    ).offset(skip).limit(limit).all()
+def read_user_notifications(
+    response: Response,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    notifications, next_cursor = paginate(
+        db.query(Notification).filter(Notification.user_id == user_id),
+        sort_column=Notification.created_at,
+        id_column=Notification.id,
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        descending=True
+    )
+    set_next_cursor(response, next_cursor)
     return notifications
 
 @router.get("/{notification_id}", response_model=NotificationSchema)
@@ -5,6 +5,8 @@ from typing import List
 from app.db.session import get_db
 from app.models.price_alert import PriceAlert
 from app.schemas.price_alert import PriceAlert as PriceAlertSchema, PriceAlertCreate, PriceAlertUpdate
+from app.utils.alert_evaluator import alert_metrics
+from app.utils.alert_trigger import alert_target_index
 
 router = APIRouter()
 
@@ -26,6 +28,7 @@ def create_price_alert(price_alert: PriceAlertCreate, db: Session = Depends(get_
     db.add(db_price_alert)
     db.commit()
     db.refresh(db_price_alert)
+    alert_target_index.sync_alert(db_price_alert)
     return db_price_alert
 
 @router.get("/user/{user_id}", response_model=List[PriceAlertSchema])
@@ -35,6 +38,13 @@ def read_user_price_alerts(user_id: int, skip: int = 0, limit: int = 100, db: Se
     ).offset(skip).limit(limit).all()
     return price_alerts
 
+@router.get("/evaluator-metrics")
+def read_alert_evaluator_metrics():
+    """
+    Fiyat alarmı değerlendiricisinin verim sayaçları.
+    """
+    return {**alert_metrics.snapshot(), "trigger_index": alert_target_index.stats()}
+
 @router.get("/{price_alert_id}", response_model=PriceAlertSchema)
 def read_price_alert(price_alert_id: int, db: Session = Depends(get_db)):
     db_price_alert = db.query(PriceAlert).filter(PriceAlert.id == price_alert_id).first()
@@ -53,6 +63,7 @@ def update_price_alert(price_alert_id: int, price_alert: PriceAlertUpdate, db: S
     
     db.commit()
     db.refresh(db_price_alert)
+    alert_target_index.sync_alert(db_price_alert)
     return db_price_alert
 
 @router.delete("/{price_alert_id}", response_model=PriceAlertSchema)
@@ -63,4 +74,5 @@ def delete_price_alert(price_alert_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_price_alert)
     db.commit()
+    alert_target_index.discard(db_price_alert.id)
     return db_price_alert 
\ No newline at end of file
@@ -1,33 +1,75 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 from datetime import datetime, timedelta
 
 from app.db.session import get_db
+from app.api import deps
 from app.models.price_history import PriceHistory
-from app.schemas.price_history import PriceHistory as PriceHistorySchema, PriceHistoryCreate
+from app.schemas.price_history import PriceHistory as PriceHistorySchema, PriceHistoryCreate, PriceHistoryRollup
+from app.utils.pagination import paginate_async, set_next_cursor
+from app.utils.events import event_bus, PRICE_CHANGED
+from app.utils.price_history_writer import record_price
+from app.utils.price_rollups import read_rollups, rebuild_bucket_rollups
 
 router = APIRouter()
 
 @router.post("/", response_model=PriceHistorySchema)
 def create_price_history(price_history: PriceHistoryCreate, db: Session = Depends(get_db)):
-    db_price_history = PriceHistory(**price_history.dict())
-    db.add(db_price_history)
+    db_price_history = record_price(db, price_history.product_id, price_history.market_id, price_history.price)
+    if db_price_history is None:
+        # Fiyat değişmedi; yeni satır yazmadan son kaydı döndür
+        return db.query(PriceHistory).filter(
+            PriceHistory.product_id == price_history.product_id,
+            PriceHistory.market_id == price_history.market_id
+        ).order_by(PriceHistory.created_at.desc(), PriceHistory.id.desc()).first()
+
     db.commit()
+    event_bus.publish(
+        PRICE_CHANGED,
+        db=db,
+        product_id=db_price_history.product_id,
+        market_id=db_price_history.market_id,
+        price=db_price_history.price
+    )
     db.refresh(db_price_history)
     return db_price_history
 
-@router.get("/product/{product_id}", response_model=List[PriceHistorySchema])
-def read_product_price_history(
+@router.get("/product/{product_id}", response_model=Union[List[PriceHistoryRollup], List[PriceHistorySchema]])
+async def read_product_price_history(
+    response: Response,
     product_id: int,
     days: int = 30,
-    db: Session = Depends(get_db)
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    granularity: Optional[str] = Query(None, pattern="^(day|week|month)$"),
+    market_id: Optional[int] = None,
+    db: AsyncSession = Depends(deps.get_async_read_db)
 ):
     start_date = datetime.utcnow() - timedelta(days=days)
-    price_history = db.query(PriceHistory).filter(
+    if granularity:
+        # Ham satırlar yerine önceden toplanmış gün/hafta/ay kovaları
+        return await db.run_sync(read_rollups, product_id, granularity, start_date, market_id)
+
+    query = select(PriceHistory).filter(
         PriceHistory.product_id == product_id,
         PriceHistory.created_at >= start_date
-    ).order_by(PriceHistory.created_at.desc()).all()
+    )
+    if market_id is not None:
+        query = query.filter(PriceHistory.market_id == market_id)
+    # limit verilmezse eskisi gibi pencerenin tamamı döner
+    price_history, next_cursor = await paginate_async(
+        db,
+        query,
+        sort_column=PriceHistory.created_at,
+        id_column=PriceHistory.id,
+        limit=limit or (100 if cursor else None),
+        cursor=cursor,
+        descending=True
+    )
+    set_next_cursor(response, next_cursor)
     return price_history
 
 @router.get("/market/{market_id}", response_model=List[PriceHistorySchema])
@@ -49,5 +91,11 @@ def delete_price_history(price_history_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Price history not found")
     
     db.delete(db_price_history)
+    db.flush()
+    if db_price_history.created_at is not None:
+        # Silinen değişim noktası kovaların min/max/ortalamasında kalmasın
+        rebuild_bucket_rollups(
+            db, db_price_history.product_id, db_price_history.market_id, db_price_history.created_at
+        )
     db.commit()
     return db_price_history 
\ No newline at end of file
@@ -6,6 +6,7 @@ from app.db.database import get_db
 from app.models.product import Product
 from app.models.category import Category
 from app.schemas.category import CategoryResponse
+from app.utils.product_similarity import queue_similarity_refresh
 
 router = APIRouter()
 
@@ -30,6 +31,7 @@ def add_category_to_product(product_id: int, category_id: int, db: Session = Dep
         raise HTTPException(status_code=400, detail="Category already added to product")
     
     product.categories.append(category)
+    queue_similarity_refresh(db, product_id)
     db.commit()
     return {"message": "Category added to product successfully"}
 
@@ -47,5 +49,6 @@ def remove_category_from_product(product_id: int, category_id: int, db: Session
         raise HTTPException(status_code=400, detail="Category not associated with product")
     
     product.categories.remove(category)
+    queue_similarity_refresh(db, product_id)
     db.commit()
     return {"message": "Category removed from product successfully"} 
\ No newline at end of file
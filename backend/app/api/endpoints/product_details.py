@@ -1,24 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import io
+
+from fastapi import APIRouter, Depends, HTTPException, status, Response, UploadFile, File, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.db.session import get_db
 from app.models.product_detail import ProductDetail
 from app.schemas.product_detail import ProductDetail as ProductDetailSchema, ProductDetailCreate, ProductDetailUpdate
+from app.utils.pagination import paginate, set_next_cursor
+from app.utils.events import event_bus, PRICE_CHANGED
+from app.utils.product_similarity import queue_similarity_refresh_many
+from app.utils.response_cache import response_cache
+from app.utils.price_ingest import ingest_prices, detect_format, FORMATS, DEFAULT_CHUNK_SIZE
+from app.utils.price_summary import refresh_price_summaries
+from app.utils.price_matrix import price_matrix
 
 router = APIRouter()
 
 @router.post("/", response_model=ProductDetailSchema)
 def create_product_detail(product_detail: ProductDetailCreate, db: Session = Depends(get_db)):
+    existing_detail = db.query(ProductDetail.id).filter(
+        ProductDetail.product_id == product_detail.product_id,
+        ProductDetail.market_id == product_detail.market_id
+    ).first()
+    if existing_detail:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Product detail already exists for this market"
+        )
+
     db_product_detail = ProductDetail(**product_detail.dict())
     db.add(db_product_detail)
+    db.flush()
+    refresh_price_summaries(db, [db_product_detail.product_id])
+    queue_similarity_refresh_many(db, [db_product_detail.product_id])
     db.commit()
+    price_matrix.set_price(db_product_detail.product_id, db_product_detail.market_id, db_product_detail.price)
+    event_bus.publish(
+        PRICE_CHANGED,
+        db=db,
+        product_id=db_product_detail.product_id,
+        market_id=db_product_detail.market_id,
+        price=db_product_detail.price
+    )
     db.refresh(db_product_detail)
     return db_product_detail
 
+@router.post("/bulk")
+def bulk_ingest_product_details(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv veya ndjson; verilmezse dosya adından anlaşılır"),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=100_000),
+    db: Session = Depends(get_db)
+):
+    """
+    CSV/NDJSON fiyat dosyasını (product_id, market_id, price) toplu yükle.
+
+    Satırlar (product_id, market_id) anahtarına göre upsert edilir; fiyatı
+    değişenler price_history'ye eklenir.
+    """
+    fmt = format or detect_format(file.filename, file.content_type)
+    if fmt not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported format, expected one of: {', '.join(FORMATS)}"
+        )
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    return ingest_prices(db, stream, fmt, chunk_size)
+
 @router.get("/", response_model=List[ProductDetailSchema])
-def read_product_details(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    product_details = db.query(ProductDetail).offset(skip).limit(limit).all()
+def read_product_details(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    product_details, next_cursor = paginate(
+        db.query(ProductDetail),
+        sort_column=ProductDetail.id,
+        id_column=ProductDetail.id,
+        limit=limit,
+        cursor=cursor,
+        skip=skip
+    )
+    set_next_cursor(response, next_cursor)
     return product_details
 
 @router.get("/{product_detail_id}", response_model=ProductDetailSchema)
@@ -34,10 +100,25 @@ def update_product_detail(product_detail_id: int, product_detail: ProductDetailU
     if db_product_detail is None:
         raise HTTPException(status_code=404, detail="Product detail not found")
     
+    old_key = (db_product_detail.product_id, db_product_detail.market_id)
     for key, value in product_detail.dict(exclude_unset=True).items():
         setattr(db_product_detail, key, value)
     
+    db.flush()
+    refresh_price_summaries(db, [old_key[0], db_product_detail.product_id])
+    queue_similarity_refresh_many(db, [old_key[0], db_product_detail.product_id])
     db.commit()
+    if old_key != (db_product_detail.product_id, db_product_detail.market_id):
+        price_matrix.remove_price(*old_key)
+        response_cache.invalidate(f"product:{old_key[0]}", f"market-products:{old_key[1]}")
+    price_matrix.set_price(db_product_detail.product_id, db_product_detail.market_id, db_product_detail.price)
+    event_bus.publish(
+        PRICE_CHANGED,
+        db=db,
+        product_id=db_product_detail.product_id,
+        market_id=db_product_detail.market_id,
+        price=db_product_detail.price
+    )
     db.refresh(db_product_detail)
     return db_product_detail
 
@@ -48,5 +129,12 @@ def delete_product_detail(product_detail_id: int, db: Session = Depends(get_db))
         raise HTTPException(status_code=404, detail="Product detail not found")
     
     db.delete(db_product_detail)
+    db.flush()
+    refresh_price_summaries(db, [db_product_detail.product_id])
+    queue_similarity_refresh_many(db, [db_product_detail.product_id])
     db.commit()
-    return db_product_detail 
\ No newline at end of file
+    price_matrix.remove_price(db_product_detail.product_id, db_product_detail.market_id)
+    response_cache.invalidate(
+        "products", f"product:{db_product_detail.product_id}", f"market-products:{db_product_detail.market_id}"
+    )
+    return db_product_detail
@@ -1,21 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import logging
-from sqlalchemy import or_
+from sqlalchemy import case, select
 
 from app.db.session import get_db
 from app.models.product import Product
 from app.models.product_detail import ProductDetail
-from app.schemas.product import Product as ProductSchema, ProductCreate, ProductUpdate
+from app.models.product_similarity import ProductSimilarity
+from app.schemas.product import Product as ProductSchema, ProductCreate, ProductUpdate, ProductListItem
 from app import crud, schemas, models
 from app.api import deps
+from app.utils.product_search import (
+    check_search_offset, product_search_index, search_product_ids_async, set_search_truncated
+)
+from app.utils.pagination import paginate_async, set_next_cursor
+from app.utils.response_cache import response_cache
+from app.utils.price_matrix import price_matrix
+from app.utils.category_tree import subtree_product_ids, category_product_ids
+from app.utils.product_similarity import queue_similarity_refresh
+from app.utils.product_listing import listing_query, load_list_items, price_range_filters
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 @router.post("", response_model=schemas.Product)
 def create_product(product: schemas.ProductCreate, db: Session = Depends(get_db)):
-    return crud.create_product(db=db, product=product)
+    db_product = crud.create_product(db=db, product=product)
+    queue_similarity_refresh(db, db_product.id)
+    db.commit()
+    response_cache.invalidate("products")
+    return db_product
 
 @router.get("/test-details")
 def test_product_details(db: Session = Depends(get_db)):
@@ -23,26 +40,9 @@ def test_product_details(db: Session = Depends(get_db)):
     Test endpoint to check product details data.
     """
     try:
-        logging.info("Starting test_product_details function")
-        
         # Tüm ürün detaylarını çek
         details = db.query(ProductDetail).all()
-        
-        logging.info(f"Found {len(details)} product details")
-        
-        # İlk birkaç detayı logla
-        for i, detail in enumerate(details):
-            logging.info(f"Detail {i+1}:")
-            logging.info(f"  ID: {detail.id}")
-            logging.info(f"  Product ID: {detail.product_id}")
-            logging.info(f"  Market ID: {detail.market_id}")
-            logging.info(f"  Price: {detail.price}")
-            logging.info(f"  Calories: {detail.calories}")
-            logging.info(f"  Expiration Date: {detail.expiration_date}")
-            logging.info(f"  Is Favorite: {detail.is_favorite}")
-            logging.info(f"  Created At: {detail.created_at}")
-            logging.info(f"  Updated At: {detail.updated_at}")
-        
+        logger.debug("test_product_details: %d product details", len(details))
         
         return {
             "total_details": len(details),
@@ -62,7 +62,7 @@ def test_product_details(db: Session = Depends(get_db)):
             ]
         }
     except Exception as e:
-        logging.error(f"Error in test_product_details: {str(e)}")
+        logger.error("Error in test_product_details: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/product-details")
@@ -74,25 +74,9 @@ def get_product_details(
     Get all product details with their market information.
     """
     try:
-        logging.info("Starting get_product_details function")
-        
         # Tüm ürün detaylarını çek
         details = db.query(ProductDetail).all()
-        
-        logging.info(f"Found {len(details)} product details")
-        
-        # İlk birkaç detayı logla
-        for i, detail in enumerate(details[:5]):
-            logging.info(f"Detail {i+1}:")
-            logging.info(f"  ID: {detail.id}")
-            logging.info(f"  Product ID: {detail.product_id}")
-            logging.info(f"  Market ID: {detail.market_id}")
-            logging.info(f"  Price: {detail.price}")
-            logging.info(f"  Calories: {detail.calories}")
-            logging.info(f"  Expiration Date: {detail.expiration_date}")
-            logging.info(f"  Is Favorite: {detail.is_favorite}")
-            logging.info(f"  Created At: {detail.created_at}")
-            logging.info(f"  Updated At: {detail.updated_at}")
+        logger.debug("get_product_details: %d product details", len(details))
         
         return {
             "total_details": len(details),
@@ -112,7 +96,7 @@ def get_product_details(
             ]
         }
     except Exception as e:
-        logging.error(f"Error in get_product_details: {str(e)}")
+        logger.error("Error in get_product_details: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/favorites", response_model=List[schemas.ProductDetail])
@@ -124,8 +108,6 @@ def get_favorite_products(
     Get all products that are marked as favorite.
     """
     try:
-        logging.info("Starting get_favorite_products function")
-        
         # Favori olan ürün detaylarını bul
         favorite_details = db.query(ProductDetail).filter(
             ProductDetail.is_favorite == True
@@ -134,71 +116,87 @@ def get_favorite_products(
             joinedload(ProductDetail.market)
         ).all()
         
-        logging.info(f"Found {len(favorite_details)} favorite details")
-        
-        if not favorite_details:
-            logging.info("No favorite products found")
-            return []
-        
+        logger.debug("get_favorite_products: %d favorite details", len(favorite_details))
         return favorite_details
     except Exception as e:
-        logging.error(f"Error in get_favorite_products: {str(e)}")
+        logger.error("Error in get_favorite_products: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("", response_model=List[ProductSchema])
-def read_products(
+# Tam ürün şemasının okuduğu ilişkiler (tekil ürün ve benzer ürünler); async
+# oturumda tembel yükleme yapılamadığı için hepsi önceden yüklenir
+PRODUCT_LOAD_OPTIONS = (
+    selectinload(Product.details).selectinload(ProductDetail.market),
+    selectinload(Product.categories),
+)
+
+@router.get("", response_model=List[ProductListItem])
+async def read_products(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     category_id: Optional[int] = None,
+    include_descendants: bool = False,
     search: Optional[str] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(deps.get_async_read_db)
 ):
     try:
-        logging.info("Starting read_products function")
-        
-        # Önce ürünleri al
-        query = db.query(Product).options(
-            joinedload(Product.details).joinedload(ProductDetail.market)
-        )
+        # Liste sütunları ve fiyat özeti tek sorguda; kategoriler sayfa
+        # belirlendikten sonra sayfadaki id'ler için ayrı bir sorguyla gelir
+        query = listing_query()
         
         if category_id:
-            query = query.filter(Product.category_id == category_id)
+            # Alt kategoriler kapanış tablosundan tek alt sorguyla gelir
+            if include_descendants:
+                query = query.filter(Product.id.in_(subtree_product_ids(category_id)))
+            else:
+                query = query.filter(Product.id.in_(category_product_ids(category_id)))
         if search:
-            query = query.filter(Product.name.ilike(f"%{search}%"))
-        if min_price is not None:
-            query = query.filter(Product.price >= min_price)
-        if max_price is not None:
-            query = query.filter(Product.price <= max_price)
-        
-        products = query.offset(skip).limit(limit).all()
+            if cursor:
+                raise HTTPException(status_code=400, detail="cursor cannot be combined with search")
+            check_search_offset(skip)
+            # ILIKE taraması yerine arama indeksi; sonuçlar alaka sırasıyla döner
+            ranked_ids = await search_product_ids_async(db, search)
+            if not ranked_ids:
+                return []
+            set_search_truncated(response, ranked_ids)
+            query = query.filter(Product.id.in_(ranked_ids)).order_by(
+                case({product_id: rank for rank, product_id in enumerate(ranked_ids)}, value=Product.id)
+            )
+        if min_price is not None or max_price is not None:
+            query = query.filter(*price_range_filters(min_price, max_price))
         
-        # Debug logs
-        logging.info(f"Found {len(products)} products")
-        if products:
-            first_product = products[0]
-            logging.info(f"First product: ID={first_product.id}, Name={first_product.name}")
-            logging.info(f"Product details count: {len(first_product.details)}")
-            if first_product.details:
-                first_detail = first_product.details[0]
-                logging.info(f"First detail: Price={first_detail.price}, Market={first_detail.market.name if first_detail.market else 'No market'}")
-                logging.info(f"First detail is_favorite: {first_detail.is_favorite}")
+        if search:
+            result = await db.execute(query.offset(skip).limit(limit))
+            rows = result.all()
         else:
-            logging.warning("No products found in database")
-            
-            # Check if there are any products in the database
-            total_products = db.query(Product).count()
-            logging.info(f"Total products in database: {total_products}")
+            rows, next_cursor = await paginate_async(
+                db,
+                query,
+                sort_column=Product.id,
+                id_column=Product.id,
+                limit=limit,
+                cursor=cursor,
+                skip=skip,
+                scalars=False
+            )
+            set_next_cursor(response, next_cursor)
+        products = await load_list_items(db, rows)
+        
+        logger.debug("read_products: %d products", len(products))
         
         return products
+    except HTTPException:
+        raise
     except Exception as e:
-        logging.error(f"Error in read_products: {str(e)}")
+        logger.error("Error in read_products: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{product_id}", response_model=ProductSchema)
-def read_product(product_id: int, db: Session = Depends(get_db)):
-    db_product = crud.get_product(db=db, product_id=product_id)
+async def read_product(product_id: int, db: AsyncSession = Depends(deps.get_async_read_db)):
+    db_product = await db.get(Product, product_id, options=PRODUCT_LOAD_OPTIONS)
     if db_product is None:
         raise HTTPException(status_code=404, detail="Product not found")
     return db_product
@@ -212,8 +210,11 @@ def update_product(product_id: int, product: ProductUpdate, db: Session = Depend
     for key, value in product.dict(exclude_unset=True).items():
         setattr(db_product, key, value)
     
+    queue_similarity_refresh(db, product_id)
     db.commit()
     db.refresh(db_product)
+    product_search_index.update_product(db_product.id, db_product.name, db_product.brand, db_product.barcode)
+    response_cache.invalidate("products", f"product:{product_id}")
     return db_product
 
 @router.delete("/{product_id}", response_model=ProductSchema)
@@ -222,8 +223,12 @@ def delete_product(product_id: int, db: Session = Depends(get_db)):
     if db_product is None:
         raise HTTPException(status_code=404, detail="Product not found")
     
+    queue_similarity_refresh(db, product_id, deleted=True)
     db.delete(db_product)
     db.commit()
+    product_search_index.remove_product(product_id)
+    price_matrix.remove_product(product_id)
+    response_cache.invalidate("products", f"product:{product_id}")
     return db_product
 
 @router.patch("/{product_id}/details/{market_id}/favorite", response_model=schemas.ProductDetail)
@@ -251,96 +256,40 @@ def toggle_favorite(
         
         db.commit()
         db.refresh(product_detail)
+        response_cache.invalidate(f"product:{product_id}")
         
-        logging.info(f"Toggled favorite status for product {product_id} at market {market_id} to {product_detail.is_favorite}")
+        logger.debug(
+            "Toggled favorite status for product %s at market %s to %s",
+            product_id, market_id, product_detail.is_favorite
+        )
         
         return product_detail
     except Exception as e:
-        logging.error(f"Error in toggle_favorite: {str(e)}")
+        logger.error("Error in toggle_favorite: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{product_id}/similar", response_model=List[ProductSchema])
-def get_similar_products(
+async def get_similar_products(
     product_id: int,
-    limit: int = 5,
-    db: Session = Depends(get_db)
+    limit: int = Query(5, ge=1, le=100),
+    db: AsyncSession = Depends(deps.get_async_read_db)
 ):
     """
-    Belirli bir ürüne benzer ürünleri getir.
-    Benzerlik kriterleri:
-    1. Aynı kategoriye sahip olma
-    2. Benzer fiyat aralığında olma (±%20)
-    3. Benzer markaya sahip olma (varsa)
-    4. Benzer isim/anahtar kelimeler içerme
-    """
-    try:
-        # Önce mevcut ürünü bul
-        current_product = db.query(Product).filter(Product.id == product_id).first()
-        if not current_product:
-            raise HTTPException(status_code=404, detail="Product not found")
-
-        # Ürünün ortalama fiyatını hesapla
-        avg_price = 0
-        if current_product.details:
-            prices = [detail.price for detail in current_product.details if detail.price is not None]
-            if prices:
-                avg_price = sum(prices) / len(prices)
-
-        # Fiyat aralığını belirle (±%20)
-        min_price = avg_price * 0.8 if avg_price > 0 else 0
-        max_price = avg_price * 1.2 if avg_price > 0 else float('inf')
-
-        # Benzer ürünleri bul
-        query = (
-            db.query(Product)
-            .filter(
-                Product.category_id == current_product.category_id,
-                Product.id != product_id  # Mevcut ürünü hariç tut
-            )
-            .options(
-                joinedload(Product.details).joinedload(ProductDetail.market)
-            )
-        )
+    Belirli bir ürüne benzer ürünleri benzerlik sırasıyla getir.
 
-        # Fiyat filtresi ekle
-        if avg_price > 0:
-            query = query.join(ProductDetail).filter(
-                ProductDetail.price >= min_price,
-                ProductDetail.price <= max_price
-            )
-
-        # Marka filtresi ekle (eğer ürünün markası varsa)
-        if current_product.brand:
-            query = query.filter(Product.brand == current_product.brand)
-
-        # İsim benzerliği için anahtar kelimeleri ayır
-        keywords = current_product.name.lower().split()
-        if keywords:
-            # En az bir anahtar kelimeyi içeren ürünleri bul
-            name_conditions = [Product.name.ilike(f"%{keyword}%") for keyword in keywords]
-            query = query.filter(or_(*name_conditions))
-
-        # Sonuçları sırala ve limit uygula
-        similar_products = query.limit(limit).all()
-
-        # Eğer yeterli benzer ürün bulunamazsa, sadece kategori bazlı arama yap
-        if len(similar_products) < limit:
-            additional_products = (
-                db.query(Product)
-                .filter(
-                    Product.category_id == current_product.category_id,
-                    Product.id != product_id,
-                    ~Product.id.in_([p.id for p in similar_products])  # Zaten bulunan ürünleri hariç tut
-                )
-                .options(
-                    joinedload(Product.details).joinedload(ProductDetail.market)
-                )
-                .limit(limit - len(similar_products))
-                .all()
-            )
-            similar_products.extend(additional_products)
-
-        return similar_products
-    except Exception as e:
-        logging.error(f"Error in get_similar_products: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+    Komşu listeleri çevrimdışı hesaplanır (isim/marka/açıklama TF-IDF,
+    kategori ve fiyat bandı; bkz. app/utils/product_similarity.py); burada
+    yalnızca product_similarity tablosundan indeksli bir okuma yapılır.
+    """
+    result = await db.execute(
+        select(Product)
+        .join(ProductSimilarity, ProductSimilarity.neighbor_id == Product.id)
+        .where(ProductSimilarity.product_id == product_id)
+        .order_by(ProductSimilarity.rank)
+        .limit(limit)
+        .options(*PRODUCT_LOAD_OPTIONS)
+    )
+    similar_products = result.scalars().all()
+    if not similar_products and await db.get(Product, product_id) is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return similar_products
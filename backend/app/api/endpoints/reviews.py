@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.db.session import get_db
 from app.models.comment import Comment
 from app.schemas.comment import Comment as CommentSchema, CommentCreate, CommentUpdate
+from app.utils.pagination import paginate, set_next_cursor
 
 router = APIRouter()
 
@@ -17,8 +18,27 @@ def create_comment(comment: CommentCreate, db: Session = Depends(get_db)):
     return db_comment
 
 @router.get("/", response_model=List[CommentSchema])
-def read_comments(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    comments = db.query(Comment).offset(skip).limit(limit).all()
+def read_comments(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    product_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    query = db.query(Comment)
+    if product_id is not None:
+        query = query.filter(Comment.product_id == product_id)
+    comments, next_cursor = paginate(
+        query,
+        sort_column=Comment.created_at,
+        id_column=Comment.id,
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        descending=True
+    )
+    set_next_cursor(response, next_cursor)
     return comments
 
 @router.get("/{comment_id}", response_model=CommentSchema)
@@ -34,8 +34,7 @@ def create_shopping_list_endpoint(
     Create new shopping list.
     """
     try:
-        logger.info("=== Shopping List Creation Request ===")
-        logger.info(f"Raw request data: {shopping_list_in.dict()}")
+        logger.debug("Shopping list creation request: %s", shopping_list_in.name)
         
         # Create shopping list with default user_id=1
         result = create_shopping_list(
@@ -43,15 +42,10 @@ def create_shopping_list_endpoint(
             shopping_list=shopping_list_in
         )
         
-        logger.info(f"Successfully created shopping list with ID: {result.id}")
         return result
         
     except Exception as e:
-        logger.error("=== Error Creating Shopping List ===")
-        logger.error(f"Error type: {type(e).__name__}")
-        logger.error(f"Error message: {str(e)}")
-        logger.error(f"Request data: {shopping_list_in.dict() if hasattr(shopping_list_in, 'dict') else shopping_list_in}")
-        logger.error("===================================")
+        logger.error("Error creating shopping list: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating shopping list: {str(e)}"
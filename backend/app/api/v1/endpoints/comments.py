@@ -1,5 +1,5 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 import logging
@@ -8,6 +8,7 @@ from app.api import deps
 from app.crud import crud_review
 from app.schemas.review import Comment, CommentCreate, CommentUpdate
 from app.models.user import User
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -23,18 +24,18 @@ def create_comment(
     Yeni bir yorum oluştur.
     """
     try:
-        logger.info(f"Creating comment: {comment_in.dict()}")
+        logger.debug("Creating comment for product %s", comment_in.product_id)
         comment = crud_review.create_review(db=db, obj_in=comment_in, user_id=current_user.id)
-        logger.info(f"Comment created successfully: {comment.id}")
+        logger.debug("Comment created: %s", comment.id)
         return comment
     except SQLAlchemyError as e:
-        logger.error(f"Database error while creating comment: {str(e)}")
+        logger.error("Database error while creating comment: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Veritabanı işlemi sırasında bir hata oluştu"
         )
     except Exception as e:
-        logger.error(f"Unexpected error while creating comment: {str(e)}")
+        logger.error("Unexpected error while creating comment: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -43,18 +44,25 @@ def create_comment(
 @router.get("/product/{product_id}", response_model=List[Comment])
 def get_product_comments(
     product_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(deps.get_db)
 ) -> List[Comment]:
     """
     Bir ürüne ait yorumları getir.
     """
     try:
-        logger.info(f"Getting comments for product: {product_id}")
-        comments = crud_review.get_product_reviews(db=db, product_id=product_id)
-        logger.info(f"Found {len(comments)} comments")
+        logger.debug("Getting comments for product: %s", product_id)
+        comments, next_cursor = crud_review.get_product_reviews(
+            db=db, product_id=product_id, skip=skip, limit=limit, cursor=cursor
+        )
+        set_next_cursor(response, next_cursor)
+        logger.debug("Found %d comments", len(comments))
         return comments
     except SQLAlchemyError as e:
-        logger.error(f"Database error while getting comments: {str(e)}")
+        logger.error("Database error while getting comments: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Veritabanı işlemi sırasında bir hata oluştu"
@@ -86,7 +94,7 @@ def update_comment(
         comment = crud_review.update_review(db=db, db_obj=comment, obj_in=comment_in)
         return comment
     except SQLAlchemyError as e:
-        logger.error(f"Database error while updating comment: {str(e)}")
+        logger.error("Database error while updating comment: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Veritabanı işlemi sırasında bir hata oluştu"
@@ -116,7 +124,7 @@ def delete_comment(
             )
         crud_review.delete_review(db=db, review_id=comment_id)
     except SQLAlchemyError as e:
-        logger.error(f"Database error while deleting comment: {str(e)}")
+        logger.error("Database error while deleting comment: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Veritabanı işlemi sırasında bir hata oluştu"
@@ -136,7 +144,7 @@ def get_user_comments(
         comments = crud_review.get_user_reviews(db=db, user_id=current_user.id, skip=skip, limit=limit)
         return comments
     except SQLAlchemyError as e:
-        logger.error(f"Database error while getting user comments: {str(e)}")
+        logger.error("Database error while getting user comments: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Veritabanı işlemi sırasında bir hata oluştu"
@@ -1,6 +1,9 @@
 from typing import List, Optional, Any
-from fastapi import APIRouter, Depends, HTTPException, Query, Body, status, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, status, Response, Header
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import models, schemas, crud
 from app.api import deps
 from app.models.shopping_list import ShoppingList, ShoppingListItem
@@ -10,11 +13,11 @@ from app.schemas.shopping_list import (
     ShoppingList,
     ShoppingListCreate,
     ShoppingListUpdate,
-    ShoppingListItem,
     ShoppingListItemCreate,
     ShoppingListItemUpdate,
     ShoppingListItemInDB,
-    MarketComparisonResponse
+    MarketComparisonResponse,
+    OptimalPlanResponse
 )
 from app.crud.crud_shopping_list import (
     create_shopping_list,
@@ -25,28 +28,20 @@ from app.crud.crud_shopping_list import (
     generate_share_token,
     create_shopping_list_item
 )
-from app.utils.pdf_generator import generate_shopping_list_pdf
+from app.utils.pdf_generator import render_to_spool, iter_file, pdf_executor
+from app.utils.market_comparison import compare_markets, compare_markets_async, list_items_with_unit_prices
+from app.utils.pdf_cache import pdf_cache, export_cache_key
+from app.utils.http_cache import make_etag, etag_matches, not_modified
+from app.utils.basket_planner import plan_shopping_list
+import asyncio
 import json
 from app.models.user import User
 import logging
 from app.models.product_detail import ProductDetail
-from pydantic import BaseModel
-from sqlalchemy import text
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-class MarketComparisonResponse(BaseModel):
-    market_id: int
-    market_name: str
-    total_price: float
-    items: List[dict]
-    found_products: int
-    total_products: int
-    
-    class Config:
-        from_attributes = True
-
 @router.post("/", response_model=ShoppingList)
 def create_shopping_list_endpoint(
     *,
@@ -57,8 +52,7 @@ def create_shopping_list_endpoint(
     Create new shopping list.
     """
     try:
-        logger.info("=== Shopping List Creation Request ===")
-        logger.info(f"Raw request data: {shopping_list_in.dict()}")
+        logger.debug("Shopping list creation request: %s", shopping_list_in.name)
         
         # Create shopping list with default user_id=1
         result = create_shopping_list(
@@ -66,15 +60,10 @@ def create_shopping_list_endpoint(
             shopping_list=shopping_list_in
         )
         
-        logger.info(f"Successfully created shopping list with ID: {result.id}")
         return result
         
     except Exception as e:
-        logger.error("=== Error Creating Shopping List ===")
-        logger.error(f"Error type: {type(e).__name__}")
-        logger.error(f"Error message: {str(e)}")
-        logger.error(f"Request data: {shopping_list_in.dict() if hasattr(shopping_list_in, 'dict') else shopping_list_in}")
-        logger.error("===================================")
+        logger.error("Error creating shopping list: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating shopping list: {str(e)}"
@@ -99,88 +88,45 @@ def read_shopping_lists(
         
         return lists
     except Exception as e:
-        logger.error(f"Error retrieving shopping lists: {str(e)}", exc_info=True)
+        logger.error("Error retrieving shopping lists: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
 @router.get("/{shopping_list_id}/markets", response_model=List[MarketComparisonResponse])
-def get_markets_for_shopping_list(
+async def get_markets_for_shopping_list(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     shopping_list_id: int,
 ):
     """
     Alışveriş listesindeki ürünleri satan marketleri getir.
     """
-    # 1. Alışveriş listesindeki ürünleri al
-    items = db.query(ShoppingListItem).filter(
-        ShoppingListItem.shopping_list_id == shopping_list_id
-    ).all()
-    
-    if not items:
-        return []
-    
-    # 2. Bu ürünleri satan marketleri bul
-    product_ids = [item.product_id for item in items]
-    
-    # 3. SQL ile marketleri çek
-    query = text("""
-        SELECT DISTINCT m.id, m.name
-        FROM shopping_list_items sli
-        JOIN product_details pd ON sli.product_id = pd.product_id
-        JOIN markets m ON pd.market_id = m.id
-        WHERE sli.shopping_list_id = :list_id
-    """)
-    
-    result = db.execute(query, {"list_id": shopping_list_id})
-    markets = result.fetchall()
-    
-    comparisons = []
-    
-    for market in markets:
-        # 4. Her market için fiyat hesapla
-        price_query = text("""
-            SELECT p.name, sli.quantity, pd.price
-            FROM shopping_list_items sli
-            JOIN product_details pd ON sli.product_id = pd.product_id
-            JOIN products p ON sli.product_id = p.id
-            WHERE sli.shopping_list_id = :list_id AND pd.market_id = :market_id
-        """)
-        
-        price_result = db.execute(price_query, {
-            "list_id": shopping_list_id,
-            "market_id": market.id
-        })
-        
-        items_list = []
-        total_price = 0
-        
-        for row in price_result:
-            item_price = float(row.price) * row.quantity
-            total_price += item_price
-            
-            items_list.append({
-                "product_id": 0,  # Gerekirse eklenebilir
-                "product_name": row.name,
-                "price": float(row.price),
-                "quantity": row.quantity
-            })
-        
-        comparisons.append({
-            "market_id": market.id,
-            "market_name": market.name,
-            "total_price": total_price,
-            "items": items_list,
-            "found_products": len(items_list),
-            "total_products": len(items)
-        })
-    
-    # 5. Fiyata göre sırala
-    comparisons.sort(key=lambda x: x["total_price"])
-    
-    return comparisons
+    return await compare_markets_async(db, shopping_list_id)
+
+@router.get("/{shopping_list_id}/optimal-plan", response_model=OptimalPlanResponse)
+def get_optimal_plan_for_shopping_list(
+    *,
+    db: Session = Depends(deps.get_db),
+    shopping_list_id: int,
+    max_markets: int = Query(2, ge=1, le=10, description="Kullanılabilecek en fazla market sayısı"),
+    time_budget_ms: float = Query(50.0, gt=0, le=2000, description="Çözücü için süre bütçesi (ms)"),
+):
+    """
+    Her ürünü en fazla K market arasından en ucuz olanından alacak şekilde
+    alışveriş planı oluştur.
+    """
+    shopping_list = get_shopping_list(db, shopping_list_id)
+    if not shopping_list:
+        raise HTTPException(status_code=404, detail="Alışveriş listesi bulunamadı")
+
+    return plan_shopping_list(
+        db,
+        shopping_list_id,
+        max_markets=max_markets,
+        time_budget_ms=time_budget_ms
+    )
 
 @router.get("/{id}", response_model=ShoppingList)
 def read_shopping_list(
@@ -212,6 +158,7 @@ def update_shopping_list_endpoint(
     result = get_shopping_list(db=db, shopping_list_id=id)
     if not result:
         raise HTTPException(status_code=404, detail="Shopping list not found")
+    pdf_cache.invalidate_list(id)
     return update_shopping_list(
         db=db,
         shopping_list_id=id,
@@ -230,6 +177,7 @@ def delete_shopping_list_endpoint(
     result = get_shopping_list(db=db, shopping_list_id=id)
     if not result:
         raise HTTPException(status_code=404, detail="Shopping list not found")
+    pdf_cache.invalidate_list(id)
     return delete_shopping_list(db=db, shopping_list_id=id)
 
 @router.get("/{shopping_list_id}/items", response_model=List[ShoppingListItemInDB])
@@ -265,6 +213,7 @@ def create_shopping_list_item_endpoint(
     if db_shopping_list.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
+    pdf_cache.invalidate_list(shopping_list_id)
     return create_shopping_list_item(
         db=db,
         shopping_list_id=shopping_list_id,
@@ -289,6 +238,7 @@ def delete_shopping_list_item(
     if not db_item or db_item.shopping_list_id != shopping_list_id:
         raise HTTPException(status_code=404, detail="Item not found")
     if crud.delete_shopping_list_item(db, item_id):
+        pdf_cache.invalidate_list(shopping_list_id)
         return {"message": "Item deleted successfully"}
     raise HTTPException(status_code=500, detail="Error deleting item")
 
@@ -320,47 +270,74 @@ def create_shopping_list_items_bulk(
             )
             db_items.append(db_item)
         
+        pdf_cache.invalidate_list(shopping_list_id)
         return db_items
         
     except Exception as e:
-        logger.error(f"Error creating shopping list items: {str(e)}", exc_info=True)
+        logger.error("Error creating shopping list items: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
+def _load_export(db: Session, shopping_list_id: int):
+    shopping_list = get_shopping_list(db, shopping_list_id)
+    if not shopping_list:
+        return None, None, None
+    market_comparisons = compare_markets(db, shopping_list_id)
+    items = list_items_with_unit_prices(db, shopping_list_id, market_comparisons)
+    return shopping_list, items, market_comparisons
+
 @router.get("/{shopping_list_id}/export")
-def export_shopping_list(
+async def export_shopping_list(
     *,
     db: Session = Depends(deps.get_db),
     shopping_list_id: int,
+    stream: bool = Query(True, description="PDF'i parça parça akıt"),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     Alışveriş listesini PDF olarak dışa aktar.
+
+    Karşılaştırma ve kalemler iki sorguyla önceden çekilir; PDF ayrı bir
+    işçi havuzunda geçici dosyaya üretilip parça parça gönderilir.
+    Üretilen PDF'ler liste içeriğinin özetiyle önbelleğe alınır ve aynı
+    özet ETag olarak döner; içerik değişmediyse 304 döner.
+
+    Uç nokta asenkrondur: veritabanı okumaları ve önbellek dosya işlemleri
+    genel iş parçacığı havuzunda, PDF üretimi yalnızca pdf_executor'da
+    yapılır; üretim beklenirken genel havuzdan iş parçacığı tutulmaz.
     """
-    shopping_list = get_shopping_list(db, shopping_list_id)
-    if not shopping_list:
+    shopping_list, items, market_comparisons = await run_in_threadpool(_load_export, db, shopping_list_id)
+    if shopping_list is None:
         raise HTTPException(status_code=404, detail="Alışveriş listesi bulunamadı")
-    
-    # Market karşılaştırmasını al
-    market_comparisons = get_markets_for_shopping_list(
-        db=db,
-        shopping_list_id=shopping_list_id,
-    )
-    
-    # PDF oluştur
-    pdf_content = generate_shopping_list_pdf(
-        shopping_list=shopping_list,
-        market_comparisons=market_comparisons
-    )
-    
-    return Response(
-        content=pdf_content,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f'attachment; filename="{shopping_list.name}.pdf"'
-        }
-    )
+
+    cache_key = export_cache_key(shopping_list.name, items, market_comparisons)
+    etag = make_etag(cache_key)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, "private, no-cache")
+
+    pdf_file = await run_in_threadpool(pdf_cache.open, cache_key, shopping_list_id)
+    if pdf_file is None:
+        loop = asyncio.get_running_loop()
+        pdf_file = await loop.run_in_executor(
+            pdf_executor, render_to_spool, shopping_list.name, items, market_comparisons
+        )
+        await run_in_threadpool(pdf_cache.store, cache_key, pdf_file, shopping_list_id)
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="{shopping_list.name}.pdf"',
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+    }
+    if not stream:
+        try:
+            content = await run_in_threadpool(pdf_file.read)
+        finally:
+            pdf_file.close()
+        return Response(content=content, media_type="application/pdf", headers=headers)
+
+    return StreamingResponse(iter_file(pdf_file), media_type="application/pdf", headers=headers)
 
 @router.post("/{shopping_list_id}/share")
 def share_shopping_list(
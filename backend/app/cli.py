@@ -1,7 +1,11 @@
 import os
+import json
+import time
+from datetime import timezone
 import click
 from sqlalchemy import text
 from app.db.database import engine
+from app.db.session import SessionLocal
 from app.core.security import get_password_hash
 from app.models import User
 
@@ -46,5 +50,151 @@ def create_admin(email, password, name):
     finally:
         db.close()
 
+@cli.command()
+@click.option('--batch-size', default=5000, show_default=True, help='Alerts evaluated per batch')
+@click.option('--interval', default=0, show_default=True, help='Seconds between runs (0 = run once)')
+def evaluate_alerts(batch_size, interval):
+    """Evaluate active price alerts against current minimum prices."""
+    from app.utils.alert_evaluator import evaluate_price_alerts
+
+    while True:
+        db = SessionLocal()
+        try:
+            run = evaluate_price_alerts(db, batch_size=batch_size)
+            click.echo(json.dumps(run))
+        finally:
+            db.close()
+        if not interval:
+            break
+        time.sleep(interval)
+
+@cli.command()
+@click.argument('source', type=click.Path(allow_dash=True))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']), default=None, help='Input format (default: from file extension)')
+@click.option('--chunk-size', default=10000, show_default=True, help='Rows validated and written per transaction')
+def ingest_prices(source, fmt, chunk_size):
+    """Bulk load market prices from a CSV/NDJSON file ('-' for stdin)."""
+    import sys
+    from app.utils.price_ingest import ingest_prices as run_ingest, detect_format
+
+    fmt = fmt or detect_format(source)
+    stream = sys.stdin if source == '-' else open(source, 'r', encoding='utf-8-sig', newline='')
+    db = SessionLocal()
+    try:
+        report = run_ingest(db, stream, fmt, chunk_size)
+        click.echo(json.dumps(report, indent=2, ensure_ascii=False))
+    finally:
+        db.close()
+        if stream is not sys.stdin:
+            stream.close()
+
+@cli.command()
+@click.option('--products-per-batch', default=1000, show_default=True, help='Product id range compacted per transaction')
+@click.option('--dry-run', is_flag=True, help='Only count redundant rows')
+def compact_price_history(products_per_batch, dry_run):
+    """Collapse runs of identical prices in price_history."""
+    from app.utils.price_history_writer import compact_price_history as run_compaction
+
+    db = SessionLocal()
+    try:
+        click.echo(json.dumps(run_compaction(db, products_per_batch, dry_run)))
+    finally:
+        db.close()
+
+@cli.command()
+@click.option('--batch-size', default=50000, show_default=True, help='price_history rows read per transaction')
+def rebuild_price_rollups(batch_size):
+    """Rebuild day/week/month price rollups from price_history."""
+    from app.utils.price_rollups import rebuild_rollups
+
+    db = SessionLocal()
+    try:
+        click.echo(json.dumps(rebuild_rollups(db, batch_size)))
+    finally:
+        db.close()
+
+@cli.command()
+@click.option('--batch-size', default=5000, show_default=True, help='Products summarized per transaction')
+def rebuild_price_summaries(batch_size):
+    """Rebuild per-product price summaries from product_details."""
+    from app.utils.price_summary import rebuild_price_summaries as run_rebuild
+
+    db = SessionLocal()
+    try:
+        click.echo(json.dumps(run_rebuild(db, batch_size)))
+    finally:
+        db.close()
+
+@cli.command()
+def rebuild_category_tree():
+    """Rebuild the category closure table from categories.parent_id."""
+    from app.utils.category_tree import rebuild_category_tree as run_rebuild
+
+    db = SessionLocal()
+    try:
+        click.echo(json.dumps(run_rebuild(db)))
+    finally:
+        db.close()
+
+@cli.command()
+@click.option('--products', default=10000, show_default=True, help='Products to generate')
+@click.option('--markets', default=40, show_default=True, help='Markets to generate (20-100 is realistic)')
+@click.option('--years', default=3.0, show_default=True, help='Years of price history')
+@click.option('--seed', default=1, show_default=True, help='Random seed; same seed and sizes give the same data')
+@click.option('--annual-inflation', default=0.35, show_default=True, help='Yearly price drift of regular prices')
+@click.option('--end-date', type=click.DateTime(formats=['%Y-%m-%d']), default=None, help='Last day of price history (default: now)')
+@click.option('--product-batch', default=500, show_default=True, help='Products generated and committed per transaction')
+@click.option('--chunk-size', default=100000, show_default=True, help='price_history rows written per bulk insert')
+@click.option('--rebuild/--no-rebuild', default=True, show_default=True, help='Rebuild category tree, price summaries and rollups afterwards')
+def generate_dataset(products, markets, years, seed, annual_inflation, end_date, product_batch, chunk_size, rebuild):
+    """Generate a deterministic synthetic catalog with price history for scale testing."""
+    from app.utils.category_tree import rebuild_category_tree
+    from app.utils.dataset_generator import generate_dataset as run_generate
+    from app.utils.price_rollups import rebuild_rollups
+    from app.utils.price_summary import rebuild_price_summaries as rebuild_summaries
+
+    db = SessionLocal()
+    try:
+        report = run_generate(
+            db, products=products, markets=markets, years=years, seed=seed,
+            annual_inflation=annual_inflation,
+            end=end_date.replace(tzinfo=timezone.utc) if end_date else None,
+            product_batch=product_batch, chunk_size=chunk_size
+        )
+        if rebuild:
+            report["category_tree"] = rebuild_category_tree(db)
+            report["price_summaries"] = rebuild_summaries(db)
+            report["price_rollups"] = rebuild_rollups(db)
+        click.echo(json.dumps(report, indent=2, ensure_ascii=False))
+    finally:
+        db.close()
+
+@cli.command()
+def rebuild_similarity():
+    """Recompute top-K similar products for every product."""
+    from app.utils.product_similarity import rebuild_similarity as run_rebuild
+
+    db = SessionLocal()
+    try:
+        click.echo(json.dumps(run_rebuild(db)))
+    finally:
+        db.close()
+
+@cli.command()
+@click.option('--interval', default=0, show_default=True, help='Seconds between runs (0 = run once)')
+def refresh_similarity(interval):
+    """Recompute similar products for queued (changed) products and those they affect."""
+    from app.utils.product_similarity import refresh_similarity as run_refresh
+
+    while True:
+        db = SessionLocal()
+        try:
+            click.echo(json.dumps(run_refresh(db)))
+        finally:
+            db.close()
+        if not interval:
+            break
+        time.sleep(interval)
+
 if __name__ == '__main__':
     cli() 
\ No newline at end of file
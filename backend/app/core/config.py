@@ -34,6 +34,107 @@ class Settings(BaseSettings):
             return self.SQLALCHEMY_DATABASE_URI
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
 
+    # Connection pool settings
+    # Havuz başına kalıcı bağlantı sayısı ve yoğunlukta açılabilecek ek bağlantı
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    # Boş bağlantı beklemenin üst sınırı (saniye)
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_PRE_PING: bool = True
+    # Bu kadar saniyeden eski bağlantılar yeniden açılır (-1: kapalı)
+    DB_POOL_RECYCLE: int = 1800
+    # PostgreSQL statement_timeout (ms, 0: sınırsız)
+    DB_STATEMENT_TIMEOUT_MS: int = 30_000
+    # PgBouncer transaction modunda havuzu PgBouncer yönetir (NullPool)
+    DB_PGBOUNCER_TRANSACTION_MODE: bool = False
+
+    # Read replica settings
+    # Verilirse katalog okumaları (GET) bu salt okunur kopyaya yönlendirilir
+    REPLICA_DATABASE_URI: Optional[str] = None
+    # Kopya bu kadar saniyeden fazla gerideyse okumalar birincil sunucuya döner
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    # Gecikme ölçümünün yenilenme aralığı (saniye)
+    REPLICA_LAG_CHECK_INTERVAL: float = 2.0
+
+    # Response cache settings
+    # "memory": süreç içi LRU, "redis": paylaşılan Redis uyumlu sunucu, "off": kapalı
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_MAX_ENTRIES: int = 5000
+    # Bu uç noktaların dışındaki yazmalar için üst sınır (saniye)
+    RESPONSE_CACHE_TTL_SECONDS: float = 300.0
+
+    # Logging settings
+    LOG_LEVEL: str = "INFO"
+    # Logger bazında seviyeler, e.g: '{"app.api": "DEBUG", "uvicorn.access": "WARNING"}'
+    LOG_LEVELS: Dict[str, str] = {}
+    # "text" veya "json" (satır başına bir JSON kaydı)
+    LOG_FORMAT: str = "text"
+    # Kayıtlar bu boyda bir kuyruk üzerinden ayrı thread'de yazılır; kuyruk
+    # doluysa kayıt düşürülür (0: kuyruk yok, istek thread'inde yazılır)
+    LOG_QUEUE_SIZE: int = 10_000
+    # DEBUG kayıtları: (logger, mesaj şablonu) başına saniyede en fazla bu
+    # kadar (0: sınırsız) ve bu oranda örneklenir
+    LOG_DEBUG_RATE_LIMIT: int = 20
+    LOG_DEBUG_SAMPLE_RATE: float = 1.0
+
+    # Request metrics settings
+    # İstek başına gecikme, sorgu sayısı/süresi ve yanıt boyutu; /metrics'te
+    # Prometheus biçiminde yayınlanır
+    REQUEST_METRICS_ENABLED: bool = True
+
+    # Query inspector settings
+    # "off": kapalı, "log": N+1, yavaş sorgu ve bütçe aşımlarını EXPLAIN ile
+    # logla, "raise": ayrıca isteği QueryBudgetExceeded ile düşür (testler/CI)
+    QUERY_INSPECTOR_MODE: str = "off"
+    # Bu süreyi aşan ifadeler yavaş sayılır (ms)
+    SLOW_QUERY_MS: float = 500.0
+    # Aynı biçimdeki ifade bir istekte bu kadar tekrarlanırsa N+1 sayılır
+    N_PLUS_ONE_THRESHOLD: int = 10
+    QUERY_INSPECTOR_EXPLAIN: bool = True
+    # Rota şablonu -> istek başına en fazla sorgu; varsayılan bütçelerin üzerine yazılır
+    # e.g: '{"/api/v1/products": 4}'
+    QUERY_BUDGETS: Dict[str, int] = {}
+
+    # Similar products settings
+    # Ürün başına saklanan komşu sayısı
+    SIMILARITY_TOP_K: int = 20
+    # Metin (TF-IDF) ve kategori özelliklerinin karma boyutları
+    SIMILARITY_TEXT_DIM: int = 1024
+    SIMILARITY_CATEGORY_DIM: int = 64
+    # Benzerlik skoru = ağırlıklı metin + kategori + fiyat bandı kosinüsü
+    SIMILARITY_TEXT_WEIGHT: float = 0.6
+    SIMILARITY_CATEGORY_WEIGHT: float = 0.25
+    SIMILARITY_PRICE_WEIGHT: float = 0.15
+    # Bir seferde hesaplanan skor matrisinin en fazla eleman sayısı (float32)
+    SIMILARITY_BLOCK_ELEMENTS: int = 16_000_000
+
+    # Search settings
+    # "auto": PostgreSQL'de pg_trgm/tsvector, diğerlerinde süreç içi indeks
+    # "memory": her zaman süreç içi indeks
+    SEARCH_BACKEND: str = "auto"
+    # Bir aramanın sıralanan en fazla sonucu; daha derin sayfalar 400 döner
+    SEARCH_MAX_RESULTS: int = 1000
+    # Süreç içi indeksin başka süreçlerin yazmalarını kontrol etme aralığı (0: kapalı)
+    SEARCH_INDEX_CHECK_SECONDS: float = 5.0
+
+    # Süreç içi fiyat matrisinin başka süreçlerin yazmalarını kontrol etme aralığı (0: kapalı)
+    PRICE_MATRIX_CHECK_SECONDS: float = 5.0
+
+    # Price alert settings
+    # Olay tabanlı tetikleme indeksinin başka süreçlerdeki değişiklikler için
+    # yeniden yüklenme aralığı (0: yalnızca ilk kullanımda yükle)
+    ALERT_INDEX_TTL_SECONDS: int = 300
+
+    # PDF export settings
+    # Aynı anda en fazla bu kadar PDF üretilir; üretilen dosya bu eşiğe kadar
+    # bellekte, sonrasında geçici dosyada tutulur.
+    PDF_EXPORT_WORKERS: int = 2
+    PDF_SPOOL_MAX_MEMORY: int = 4 * 1024 * 1024
+    # Üretilmiş PDF önbelleği; dizin verilmezse sistem geçici dizini kullanılır
+    PDF_CACHE_DIR: Optional[str] = None
+    PDF_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
     # JWT settings
     SECRET_KEY: str = "your-super-secret-key-here"  # Sabit bir değer kullanıyoruz
     ALGORITHM: str = "HS256"
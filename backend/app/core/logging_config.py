@@ -0,0 +1,152 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    """Tek satırlık JSON kayıtları (log toplayıcılar için)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DebugRateLimitFilter(logging.Filter):
+    """
+    DEBUG kayıtlarını örnekler ve (logger, mesaj şablonu) başına saniyede en
+    fazla `limit` kayıtla sınırlar; daha yüksek seviyeler hiç etkilenmez.
+
+    Şablon, biçimlenmemiş mesajdır; bu yüzden loglar f-string yerine
+    logger.debug("... %s", değer) biçiminde yazılmalıdır.
+    """
+
+    def __init__(self, limit: int, sample_rate: float, window: float = 1.0):
+        super().__init__()
+        self.limit = limit
+        self.sample_rate = sample_rate
+        self.window = window
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._counts: Dict[Tuple[str, Any], int] = {}
+        self.sampled_out = 0
+        self.rate_limited = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.sampled_out += 1
+            return False
+        if not self.limit:
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.window:
+                self._window_start = now
+                self._counts.clear()
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+        if count > self.limit:
+            self.rate_limited += 1
+            return False
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Kayıtları sınırlı bir kuyruğa bırakır; yazma işi QueueListener
+    thread'inde yapılır. Kuyruk doluysa kayıt beklenmeden düşürülür.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Yalnızca mesaj argümanlarla birleştirilir (nesneler başka thread'de
+        # okunmasın diye); zaman damgası ve JSON biçimlemesi dinleyicide yapılır
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_rate_limit: Optional[DebugRateLimitFilter] = None
+
+
+def setup_logging() -> None:
+    """
+    Kök logger'ı Settings'e göre kur; birden fazla çağrı etkisizdir.
+
+    LOG_LEVEL kök seviyedir, LOG_LEVELS logger bazında üzerine yazar
+    (ör. {"app.api": "DEBUG", "uvicorn.access": "WARNING"}).
+    """
+    global _listener, _queue_handler, _rate_limit
+    if _rate_limit is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
+    _rate_limit = DebugRateLimitFilter(settings.LOG_DEBUG_RATE_LIMIT, settings.LOG_DEBUG_SAMPLE_RATE)
+
+    if settings.LOG_QUEUE_SIZE > 0:
+        _queue_handler = NonBlockingQueueHandler(queue.Queue(settings.LOG_QUEUE_SIZE))
+        handler: logging.Handler = _queue_handler
+        _listener = QueueListener(_queue_handler.queue, stream, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+    else:
+        handler = stream
+    handler.addFilter(_rate_limit)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+
+def render_logging_metrics() -> str:
+    """Düşürülen ve elenen kayıt sayaçları (Prometheus metin biçimi)."""
+    counters = (
+        ("log_records_dropped_total", "Log records dropped because the queue was full.",
+         _queue_handler.dropped if _queue_handler is not None else 0),
+        ("log_debug_sampled_out_total", "DEBUG records skipped by sampling.",
+         _rate_limit.sampled_out if _rate_limit is not None else 0),
+        ("log_debug_rate_limited_total", "DEBUG records skipped by the per-message rate limit.",
+         _rate_limit.rate_limited if _rate_limit is not None else 0),
+    )
+    lines = []
+    for name, documentation, value in counters:
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} counter", f"{name} {value}"]
+    return "\n".join(lines) + "\n"
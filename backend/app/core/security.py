@@ -37,13 +37,10 @@ def create_access_token(
     
     # Ensure subject is string
     subject_str = str(subject)
-    logger.info(f"Creating token with subject: {subject_str}")
-    
     to_encode = {"exp": expire, "sub": subject_str}
-    logger.info(f"Token payload: {to_encode}")
-    
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
-    logger.info(f"Created token: {encoded_jwt}")
+    # Token ve payload loglanmaz
+    logger.debug("Created token for subject %s", subject_str)
     
     return encoded_jwt
 
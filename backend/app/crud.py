@@ -5,6 +5,8 @@ from datetime import datetime
 
 from . import models, schemas
 from .core.security import get_password_hash
+from .utils.price_summary import refresh_price_summaries
+from .utils.price_matrix import price_matrix
 
 # User CRUD
 def get_user(db: Session, user_id: int):
@@ -230,7 +232,10 @@ def get_product_details(db: Session, product_id: int, skip: int = 0, limit: int
 def create_product_detail(db: Session, detail: schemas.ProductDetailCreate):
     db_detail = models.ProductDetail(**detail.dict())
     db.add(db_detail)
+    db.flush()
+    refresh_price_summaries(db, [db_detail.product_id])
     db.commit()
+    price_matrix.set_price(db_detail.product_id, db_detail.market_id, db_detail.price)
     db.refresh(db_detail)
     return db_detail
 
@@ -2,6 +2,8 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.models.category import Category
 from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.utils import category_tree
+from app.utils.product_similarity import queue_similarity_refresh_many
 
 def get_category(db: Session, category_id: int) -> Optional[Category]:
     """Get a category by ID."""
@@ -15,15 +17,22 @@ def create_category(db: Session, category: CategoryCreate) -> Category:
     """Create a new category."""
     db_category = Category(**category.dict())
     db.add(db_category)
+    db.flush()
+    category_tree.add_category(db, db_category.id, db_category.parent_id)
     db.commit()
     db.refresh(db_category)
     return db_category
 
 def update_category(db: Session, category_id: int, category: CategoryUpdate) -> Optional[Category]:
-    """Update a category."""
+    """Update a category; moving it under a new parent also moves its subtree."""
     db_category = get_category(db, category_id)
     if db_category:
-        for key, value in category.dict(exclude_unset=True).items():
+        update_data = category.dict(exclude_unset=True)
+        if "parent_id" in update_data and update_data["parent_id"] != db_category.parent_id:
+            category_tree.move_category(db, category_id, update_data["parent_id"])
+            # Alt ağaçtaki ürünlerin kategori ataları değişti
+            queue_similarity_refresh_many(db, db.execute(category_tree.subtree_product_ids(category_id)).scalars())
+        for key, value in update_data.items():
             setattr(db_category, key, value)
         db.commit()
         db.refresh(db_category)
@@ -33,6 +42,8 @@ def delete_category(db: Session, category_id: int) -> bool:
     """Delete a category."""
     db_category = get_category(db, category_id)
     if db_category:
+        queue_similarity_refresh_many(db, db.execute(category_tree.category_product_ids(category_id)).scalars())
+        category_tree.remove_category(db, category_id)
         db.delete(db_category)
         db.commit()
         return True
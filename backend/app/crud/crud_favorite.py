@@ -4,7 +4,6 @@ from app import models, schemas
 from app.models.favorite import Favorite
 from app.models.product_detail import ProductDetail
 import logging
-import traceback
 
 logger = logging.getLogger(__name__)
 
@@ -73,23 +72,15 @@ def get_favorite_product_details(
     Get all favorite products from product_details table.
     """
     try:
-        logger.info("Getting favorite product details")
-        logger.info(f"Skip: {skip}, Limit: {limit}")
-        
-        # Test query
-        test_query = db.query(ProductDetail).filter(ProductDetail.is_favorite == True)
-        logger.info(f"Generated SQL: {test_query.statement}")
-        
-        # Execute query
-        favorites = test_query.offset(skip).limit(limit).all()
-        logger.info(f"Found {len(favorites)} favorite products")
-        
-        if favorites:
-            logger.info(f"First favorite product: {favorites[0]}")
-            logger.info(f"First favorite product details: id={favorites[0].id}, product_id={favorites[0].product_id}, is_favorite={favorites[0].is_favorite}")
-        
+        favorites = (
+            db.query(ProductDetail)
+            .filter(ProductDetail.is_favorite == True)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        logger.debug("Found %d favorite products (skip=%s, limit=%s)", len(favorites), skip, limit)
         return favorites
     except Exception as e:
-        logger.error(f"Error in get_favorite_product_details: {str(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.error("Error in get_favorite_product_details: %s", e, exc_info=True)
         raise 
\ No newline at end of file
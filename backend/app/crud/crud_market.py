@@ -2,6 +2,7 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.models.market import Market
 from app.schemas.market import MarketCreate, MarketUpdate
+from app.utils.price_summary import market_product_ids, refresh_price_summaries
 
 def get_market(db: Session, market_id: int) -> Optional[Market]:
     """Get a market by ID."""
@@ -33,7 +34,10 @@ def delete_market(db: Session, market_id: int) -> bool:
     """Delete a market."""
     db_market = get_market(db, market_id)
     if db_market:
+        product_ids = market_product_ids(db, market_id)
         db.delete(db_market)
+        db.flush()
+        refresh_price_summaries(db, product_ids)
         db.commit()
         return True
     return False 
\ No newline at end of file
@@ -2,6 +2,8 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.models.product import Product
 from app.schemas.product import ProductCreate, ProductUpdate
+from app.utils.product_search import product_search_index
+from app.utils.price_matrix import price_matrix
 
 def get_product(db: Session, product_id: int) -> Optional[Product]:
     """Get a product by ID."""
@@ -17,6 +19,7 @@ def create_product(db: Session, product: ProductCreate) -> Product:
     db.add(db_product)
     db.commit()
     db.refresh(db_product)
+    product_search_index.update_product(db_product.id, db_product.name, db_product.brand, db_product.barcode)
     return db_product
 
 def update_product(db: Session, product_id: int, product: ProductUpdate) -> Optional[Product]:
@@ -27,6 +30,7 @@ def update_product(db: Session, product_id: int, product: ProductUpdate) -> Opti
             setattr(db_product, key, value)
         db.commit()
         db.refresh(db_product)
+        product_search_index.update_product(db_product.id, db_product.name, db_product.brand, db_product.barcode)
     return db_product
 
 def delete_product(db: Session, product_id: int) -> bool:
@@ -35,5 +39,7 @@ def delete_product(db: Session, product_id: int) -> bool:
     if db_product:
         db.delete(db_product)
         db.commit()
+        product_search_index.remove_product(product_id)
+        price_matrix.remove_product(product_id)
         return True
     return False 
\ No newline at end of file
@@ -1,7 +1,8 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from app.models.review import Comment
-from app.schemas.review import ReviewCreate, ReviewUpdate
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session, joinedload
+from app.models.comment import Comment
+from app.schemas.review import CommentCreate, CommentUpdate
+from app.utils.pagination import paginate
 
 def get_review(db: Session, review_id: int) -> Optional[Comment]:
     return db.query(Comment).filter(Comment.id == review_id).first()
@@ -22,7 +23,7 @@ def get_reviews(
         
     return query.offset(skip).limit(limit).all()
 
-def create_review(db: Session, review: ReviewCreate) -> Comment:
+def create_review(db: Session, review: CommentCreate) -> Comment:
     db_review = Comment(
         user_id=review.user_id,
         product_id=review.product_id,
@@ -30,14 +31,14 @@ def create_review(db: Session, review: ReviewCreate) -> Comment:
         rating=review.rating
         )
     db.add(db_review)
-        db.commit()
+    db.commit()
     db.refresh(db_review)
     return db_review
 
 def update_review(
     db: Session,
     review_id: int,
-    review: ReviewUpdate
+    review: CommentUpdate
 ) -> Optional[Comment]:
     db_review = get_review(db, review_id)
     if not db_review:
@@ -63,20 +64,28 @@ def get_product_reviews(
     db: Session,
     product_id: int,
     skip: int = 0,
-    limit: int = 100
-) -> List[Comment]:
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Tuple[List[Comment], Optional[str]]:
     """
-    Bir ürüne ait yorumları getir.
+    Bir ürüne ait yorumları en yeniden eskiye getir.
+    Bir sonraki sayfanın cursor'ını da döndürür.
     """
-    reviews = db.query(Comment).filter(
-        Comment.product_id == product_id
-    ).offset(skip).limit(limit).all()
+    reviews, next_cursor = paginate(
+        db.query(Comment).options(joinedload(Comment.user)).filter(Comment.product_id == product_id),
+        sort_column=Comment.created_at,
+        id_column=Comment.id,
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        descending=True
+    )
     
-    # Her yorum için kullanıcı adını ekle
+    # Her yorum için kullanıcı adını ekle; kullanıcılar aynı sorguda yüklenir
     for review in reviews:
-        review.user_name = review.user.username
+        review.user_name = review.user.name if review.user else None
     
-    return reviews
+    return reviews, next_cursor
 
 def get_user_reviews(
     db: Session,
@@ -87,12 +96,12 @@ def get_user_reviews(
     """
     Bir kullanıcının yorumlarını getir.
     """
-    reviews = db.query(Comment).filter(
+    reviews = db.query(Comment).options(joinedload(Comment.user)).filter(
         Comment.user_id == user_id
     ).offset(skip).limit(limit).all()
     
-    # Her yorum için kullanıcı adını ekle
+    # Her yorum için kullanıcı adını ekle; kullanıcılar aynı sorguda yüklenir
     for review in reviews:
-        review.user_name = review.user.username
+        review.user_name = review.user.name if review.user else None
     
     return reviews 
\ No newline at end of file
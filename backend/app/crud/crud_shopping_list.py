@@ -18,8 +18,7 @@ def create_shopping_list(
     Create new shopping list.
     """
     try:
-        logger.info(f"Creating shopping list for user {user_id}")
-        logger.info(f"Shopping list data: {shopping_list}")
+        logger.debug("Creating shopping list for user %s", user_id)
         
         # Create shopping list
         db_obj = ShoppingList(
@@ -32,12 +31,12 @@ def create_shopping_list(
         db.commit()
         db.refresh(db_obj)
         
-        logger.info(f"Created shopping list with ID: {db_obj.id}")
+        logger.info("Created shopping list %s", db_obj.id)
         return db_obj
         
     except Exception as e:
         db.rollback()
-        logger.error(f"Error creating shopping list: {str(e)}", exc_info=True)
+        logger.error("Error creating shopping list: %s", e, exc_info=True)
         raise
 
 def get_shopping_list(
@@ -75,8 +74,7 @@ def update_shopping_list(
     Update shopping list.
     """
     try:
-        logger.info(f"Updating shopping list {shopping_list_id}")
-        logger.info(f"Update data: {shopping_list_update}")
+        logger.debug("Updating shopping list %s", shopping_list_id)
         
         db_obj = get_shopping_list(db, shopping_list_id)
         if not db_obj:
@@ -93,12 +91,12 @@ def update_shopping_list(
         db.commit()
         db.refresh(db_obj)
         
-        logger.info(f"Updated shopping list: {db_obj}")
+        logger.debug("Updated shopping list %s", db_obj.id)
         return db_obj
         
     except Exception as e:
         db.rollback()
-        logger.error(f"Error updating shopping list: {str(e)}", exc_info=True)
+        logger.error("Error updating shopping list: %s", e, exc_info=True)
         raise
 
 def delete_shopping_list(
@@ -119,7 +117,7 @@ def delete_shopping_list(
         
     except Exception as e:
         db.rollback()
-        logger.error(f"Error deleting shopping list: {str(e)}", exc_info=True)
+        logger.error("Error deleting shopping list: %s", e, exc_info=True)
         raise
 
 def create_shopping_list_item(
@@ -133,8 +131,7 @@ def create_shopping_list_item(
     Create new shopping list item.
     """
     try:
-        logger.info(f"Creating shopping list item for list {shopping_list_id}")
-        logger.info(f"Item data: product_id={product_id}, quantity={quantity}, notes={notes}")
+        logger.debug("Creating item for shopping list %s: product_id=%s, quantity=%s", shopping_list_id, product_id, quantity)
         
         # Create shopping list item
         db_obj = ShoppingListItem(
@@ -155,12 +152,12 @@ def create_shopping_list_item(
             joinedload(ShoppingListItem.product)
         ).filter(ShoppingListItem.id == db_obj.id).first()
         
-        logger.info(f"Created shopping list item with ID: {db_obj.id}")
+        logger.debug("Created shopping list item %s", db_obj.id)
         return db_obj
         
     except Exception as e:
         db.rollback()
-        logger.error(f"Error creating shopping list item: {str(e)}", exc_info=True)
+        logger.error("Error creating shopping list item: %s", e, exc_info=True)
         raise
 
 def get_shopping_list_item(
@@ -0,0 +1,35 @@
+from typing import AsyncGenerator
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.engine import make_async_engine
+
+# Senkron sürücüleri asenkron karşılıklarına eşle
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """postgresql://... adresini postgresql+asyncpg://... biçimine çevir."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+# Asenkron veritabanı motoru (asyncpg)
+async_engine = make_async_engine(async_database_url(settings.get_database_url))
+
+# expire_on_commit=False: commit sonrası nesneler yanıt üretilirken tekrar
+# yüklenmeye çalışılmaz (async oturumda örtük IO yapılamaz)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
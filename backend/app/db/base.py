@@ -5,12 +5,16 @@ from app.db.session import Base
 from app.db.base_class import Base  # noqa
 from app.models.user import User  # noqa
 from app.models.category import Category  # noqa
+from app.models.category_closure import CategoryClosure  # noqa
 from app.models.market import Market  # noqa
 from app.models.product import Product  # noqa
 from app.models.product_detail import ProductDetail  # noqa
+from app.models.product_price_summary import ProductPriceSummary  # noqa
+from app.models.product_similarity import ProductSimilarity, ProductSimilarityQueue  # noqa
 from app.models.comment import Comment  # noqa
 from app.models.rating import Rating  # noqa
 from app.models.price_history import PriceHistory  # noqa
+from app.models.price_history_rollup import PriceHistoryRollup  # noqa
 from app.models.price_alert import PriceAlert  # noqa
 from app.models.search_history import SearchHistory  # noqa
 from app.models.shopping_list import ShoppingList, ShoppingListItem  # noqa
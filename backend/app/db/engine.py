@@ -0,0 +1,231 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from app.core.config import settings
+from app.utils.request_metrics import instrument_engine
+
+
+class PoolMetrics:
+    """
+    Bir bağlantı havuzunun süreç boyunca biriken sayaçları.
+
+    Bağlantı bekleme süresi, havuzdan bağlantı istenmesiyle alınması
+    arasındaki süredir; doluluk, kullanılan bağlantıların havuzun
+    üst sınırına (pool_size + max_overflow) oranıdır.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.engine: Optional[Engine] = None
+        self.capacity = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connections_opened = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.in_use = 0
+        self.in_use_peak = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self.in_use += 1
+            self.in_use_peak = max(self.in_use_peak, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def attach(self, engine: Engine, capacity: int) -> None:
+        self.engine = engine
+        self.capacity = capacity
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pool": self.engine.pool.status() if self.engine is not None else None,
+                "capacity": self.capacity,
+                "in_use": self.in_use,
+                "in_use_peak": self.in_use_peak,
+                "saturation": round(self.in_use / self.capacity, 3) if self.capacity else None,
+                "peak_saturation": round(self.in_use_peak / self.capacity, 3) if self.capacity else None,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connections_opened": self.connections_opened,
+                "wait_ms_avg": round(self.wait_seconds_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+class _TimedPoolMixin:
+    """
+    Havuzdan bağlantı alma süresini ölçer (boş bağlantı yoksa beklenen süre dahil).
+    """
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() havuzu yeniden oluşturur; sayaçlar korunmalı
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+pool_metrics = {
+    "sync": PoolMetrics("sync"),
+    "async": PoolMetrics("async"),
+}
+
+
+def _is_postgres(url: str) -> bool:
+    return make_url(url).get_backend_name() == "postgresql"
+
+
+def engine_options(url: str, *, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Settings'teki havuz ve zaman aşımı ayarlarından create_engine argümanlarını üret.
+
+    PgBouncer transaction modunda havuzu PgBouncer yönettiği için uygulama
+    tarafında havuz tutulmaz (NullPool); asyncpg'nin hazırlanmış ifade
+    önbelleği de kapatılır, çünkü ifadeler farklı sunucu bağlantılarına düşebilir.
+    """
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    connect_args: Dict[str, Any] = {}
+
+    if not _is_postgres(url):
+        # SQLite gibi yerel veritabanlarında varsayılan havuzlar korunur
+        return options
+
+    if settings.DB_PGBOUNCER_TRANSACTION_MODE:
+        options["poolclass"] = NullPool
+        if is_async:
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+    else:
+        options.update(
+            poolclass=TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+        # Doğrudan bağlantıda zaman aşımı başlangıç parametresiyle verilir;
+        # PgBouncer bunu kabul etmediği için o modda SET LOCAL kullanılır
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            if is_async:
+                connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+            else:
+                connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def _set_local_timeout(connection) -> None:
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}")
+
+
+def _configure(engine: Engine, url: str, metrics: PoolMetrics) -> None:
+    if not _is_postgres(url):
+        return
+    if settings.DB_PGBOUNCER_TRANSACTION_MODE:
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            event.listen(engine, "begin", _set_local_timeout)
+        return
+    engine.pool.metrics = metrics
+    metrics.attach(engine, settings.DB_POOL_SIZE + max(settings.DB_MAX_OVERFLOW, 0))
+
+
+def _metrics(name: str) -> PoolMetrics:
+    return pool_metrics.setdefault(name, PoolMetrics(name))
+
+
+def make_engine(url: Optional[str] = None, metrics_name: str = "sync") -> Engine:
+    """
+    Uygulamanın senkron motoru; süreç başına bir kez oluşturulur (app.db.session).
+    """
+    url = url or settings.get_database_url
+    engine = create_engine(url, **engine_options(url))
+    _configure(engine, url, _metrics(metrics_name))
+    instrument_engine(engine)
+    return engine
+
+
+def make_async_engine(url: str, metrics_name: str = "async") -> AsyncEngine:
+    """
+    Asenkron (asyncpg) motor; `url` zaten async sürücüyü içermelidir.
+    """
+    engine = create_async_engine(url, **engine_options(url, is_async=True))
+    _configure(engine.sync_engine, url, _metrics(metrics_name))
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+def pool_stats() -> Dict[str, Any]:
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+
+
+def render_pool_metrics() -> str:
+    """Havuz başına bekleme ve doluluk sayaçları (Prometheus metin biçimi)."""
+    metrics = (
+        ("db_pool_capacity", "gauge", "Pool capacity (pool_size + max_overflow).", "capacity"),
+        ("db_pool_connections_in_use", "gauge", "Connections currently checked out.", "in_use"),
+        ("db_pool_connections_in_use_peak", "gauge", "Most connections checked out at once.", "in_use_peak"),
+        ("db_pool_checkouts_total", "counter", "Connections handed out by the pool.", "checkouts"),
+        ("db_pool_checkout_timeouts_total", "counter", "Checkouts that timed out waiting for a connection.", "timeouts"),
+        ("db_pool_connections_opened_total", "counter", "Database connections opened.", "connections_opened"),
+        ("db_pool_checkout_wait_seconds_total", "counter", "Time spent waiting for a connection.", "wait_seconds_total"),
+        ("db_pool_checkout_wait_seconds_max", "gauge", "Longest wait for a connection.", "wait_seconds_max"),
+    )
+    pools = list(pool_metrics.values())
+    lines = []
+    for name, kind, documentation, attribute in metrics:
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+        for pool in pools:
+            with pool._lock:
+                value = getattr(pool, attribute)
+            lines.append(f'{name}{{pool="{pool.name}"}} {value}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,281 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.async_session import async_database_url, async_engine
+from app.db.engine import make_async_engine, make_engine
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+# İstemcinin birincil sunucuya son yazdığı an (Unix zamanı). Tarayıcılar
+# çerezi, diğer istemciler yanıttaki başlığı sonraki isteklerde geri gönderir
+LAST_WRITE_COOKIE = "db_last_write"
+LAST_WRITE_HEADER = "x-last-write"
+
+# Kopyanın birincil sunucunun ne kadar gerisinde olduğu (saniye). WAL'ın
+# tamamı uygulanmışsa gecikme 0 sayılır; aksi halde boşta bekleyen bir
+# birincil sunucuda son işlem zamanı eskidikçe gecikme yanlışlıkla büyürdü.
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaMonitor:
+    """
+    Okuma kopyasının gecikmesini izler ve bir okumanın kopyaya gidip
+    gidemeyeceğine karar verir.
+
+    Kopya erişilemezse, gecikmesi REPLICA_MAX_LAG_SECONDS'ı aşarsa ya da
+    istemcinin birincil sunucuya yaptığı son yazma kopyaya henüz ulaşmamış
+    olabilirse okuma birincil sunucuya döner (yazdığını okuma tutarlılığı).
+    Yazma zamanı istemci başına tutulur; bir istemcinin yazması diğerlerinin
+    okumalarını kopyadan uzaklaştırmaz.
+    """
+
+    def __init__(self, max_lag: float, check_interval: float):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._checking = False
+        self.lag: Optional[float] = None
+        self.healthy = False
+        self.checked_at: Optional[float] = None
+        # Kopyanın uyguladığı son işlemin tahmini Unix zamanı (ölçüm anı - gecikme)
+        self.replayed_until: Optional[float] = None
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.failed_checks = 0
+
+    def claim_check(self) -> bool:
+        """
+        Ölçüm zamanı geldiyse ölçümü bu çağırana ver; aynı anda tek ölçüm yapılır.
+        """
+        with self._lock:
+            if self._checking:
+                return False
+            if self.checked_at is not None and time.monotonic() - self.checked_at < self.check_interval:
+                return False
+            self._checking = True
+            return True
+
+    def record_check(self, lag: Optional[float]) -> None:
+        with self._lock:
+            self._checking = False
+            self.checked_at = time.monotonic()
+            self.lag = lag
+            self.healthy = lag is not None
+            self.replayed_until = time.time() - lag if lag is not None else None
+            if lag is None:
+                self.failed_checks += 1
+
+    def choose_replica(self, last_write: Optional[float] = None) -> bool:
+        use = self.healthy and self.lag is not None and self.lag <= self.max_lag
+        if use and last_write is not None:
+            # İstemcinin son yazması kopyanın son ölçümde uyguladığı konumdan
+            # yeniyse kopyada henüz görünmüyor olabilir
+            use = self.replayed_until is not None and last_write <= self.replayed_until
+        with self._lock:
+            if use:
+                self.replica_reads += 1
+            else:
+                self.primary_reads += 1
+        return use
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "configured": True,
+                "healthy": self.healthy,
+                "lag_seconds": round(self.lag, 3) if self.lag is not None else None,
+                "max_lag_seconds": self.max_lag,
+                "replica_reads": self.replica_reads,
+                "primary_reads": self.primary_reads,
+                "failed_checks": self.failed_checks,
+            }
+
+
+def _measures_lag(url: str) -> bool:
+    return make_url(url).get_backend_name() == "postgresql"
+
+
+replica_monitor: Optional[ReplicaMonitor] = None
+ReplicaSessionLocal = None
+AsyncReplicaSessionLocal = None
+
+if settings.REPLICA_DATABASE_URI:
+    replica_engine = make_engine(settings.REPLICA_DATABASE_URI, metrics_name="replica_sync")
+    async_replica_engine = make_async_engine(
+        async_database_url(settings.REPLICA_DATABASE_URI), metrics_name="replica_async"
+    )
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    AsyncReplicaSessionLocal = async_sessionmaker(
+        async_replica_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    replica_monitor = ReplicaMonitor(settings.REPLICA_MAX_LAG_SECONDS, settings.REPLICA_LAG_CHECK_INTERVAL)
+
+
+class _RequestWrite:
+    __slots__ = ("written_at",)
+
+    def __init__(self):
+        self.written_at: Optional[float] = None
+
+
+_request_write: ContextVar[Optional[_RequestWrite]] = ContextVar("replica_request_write", default=None)
+
+
+def _record_primary_write(*args) -> None:
+    # Birincil sunucuya yapılan her commit (ORM, COPY veya ham SQL) o anki
+    # isteğe yazılır; istek dışındaki (CLI, arka plan) commit'ler yok sayılır
+    current = _request_write.get()
+    if current is not None:
+        current.written_at = time.time()
+
+
+if replica_monitor is not None:
+    event.listen(engine, "commit", _record_primary_write)
+    event.listen(async_engine.sync_engine, "commit", _record_primary_write)
+
+
+def client_last_write(request) -> Optional[float]:
+    """
+    İstemcinin çerez ya da başlıkla bildirdiği son yazma zamanı.
+    """
+    value = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(LAST_WRITE_COOKIE)
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def use_replica(request) -> bool:
+    """
+    Bu isteğin okumalarının kopyaya gidip gitmeyeceği (senkron ölçüm).
+    """
+    if replica_monitor is None or request.method not in READ_METHODS:
+        return False
+    if replica_monitor.claim_check():
+        lag = None
+        try:
+            if _measures_lag(settings.REPLICA_DATABASE_URI):
+                with replica_engine.connect() as connection:
+                    lag = float(connection.execute(LAG_QUERY).scalar())
+            else:
+                lag = 0.0
+        except Exception as e:
+            logger.warning("Replica lag check failed, reading from primary: %s", e)
+        finally:
+            replica_monitor.record_check(lag)
+    return replica_monitor.choose_replica(client_last_write(request))
+
+
+async def use_replica_async(request) -> bool:
+    """
+    use_replica()'nın asenkron karşılığı; ölçüm async motorla yapılır.
+    """
+    if replica_monitor is None or request.method not in READ_METHODS:
+        return False
+    if replica_monitor.claim_check():
+        lag = None
+        try:
+            if _measures_lag(settings.REPLICA_DATABASE_URI):
+                async with async_replica_engine.connect() as connection:
+                    lag = float((await connection.execute(LAG_QUERY)).scalar())
+            else:
+                lag = 0.0
+        except Exception as e:
+            logger.warning("Replica lag check failed, reading from primary: %s", e)
+        finally:
+            replica_monitor.record_check(lag)
+    return replica_monitor.choose_replica(client_last_write(request))
+
+
+def replica_stats() -> Dict[str, Any]:
+    if replica_monitor is None:
+        return {"configured": False}
+    return replica_monitor.stats()
+
+
+def render_replica_metrics() -> str:
+    """Okuma kopyasının gecikmesi ve yönlendirme sayaçları (Prometheus metin biçimi)."""
+    stats = replica_stats()
+    metrics = [("db_replica_configured", "gauge", "Whether a read replica is configured.", int(stats["configured"]))]
+    if stats["configured"]:
+        lag = stats["lag_seconds"]
+        metrics += [
+            ("db_replica_healthy", "gauge", "Whether the last replica lag check succeeded.", int(stats["healthy"])),
+            ("db_replica_lag_seconds", "gauge", "Replica lag at the last check.", "NaN" if lag is None else lag),
+            ("db_replica_reads_total", "counter", "Reads routed to the replica.", stats["replica_reads"]),
+            ("db_replica_primary_reads_total", "counter", "Reads routed to the primary.", stats["primary_reads"]),
+            ("db_replica_failed_checks_total", "counter", "Replica lag checks that failed.", stats["failed_checks"]),
+        ]
+    lines = []
+    for name, kind, documentation, value in metrics:
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}", f"{name} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+def _last_write_headers(written_at: float) -> List[tuple]:
+    value = f"{written_at:.3f}"
+    # Bu süreden eski bir yazma, gecikmesi sınırın altındaki kopyada görünür
+    max_age = int(settings.REPLICA_MAX_LAG_SECONDS + settings.REPLICA_LAG_CHECK_INTERVAL) + 1
+    cookie = SimpleCookie()
+    cookie[LAST_WRITE_COOKIE] = value
+    cookie[LAST_WRITE_COOKIE]["max-age"] = max_age
+    cookie[LAST_WRITE_COOKIE]["path"] = "/"
+    cookie[LAST_WRITE_COOKIE]["httponly"] = True
+    cookie[LAST_WRITE_COOKIE]["samesite"] = "Lax"
+    return [
+        (b"set-cookie", cookie.output(header="").strip().encode("latin-1")),
+        (LAST_WRITE_HEADER.encode("latin-1"), value.encode("latin-1")),
+    ]
+
+
+class ReadYourWritesMiddleware:
+    """
+    Birincil sunucuya commit yapan isteklerin yanıtına yazma zamanını çerez ve
+    başlık olarak ekleyen ASGI ara katmanı; istemcinin sonraki okumaları bu
+    zamana göre kopyaya ya da birincil sunucuya yönlendirilir. Kopya tanımlı
+    değilse isteğe dokunmaz.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or replica_monitor is None:
+            await self.app(scope, receive, send)
+            return
+
+        current = _RequestWrite()
+        token = _request_write.set(current)
+
+        async def mark(message):
+            if message["type"] == "http.response.start" and current.written_at is not None:
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + _last_write_headers(current.written_at)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, mark)
+        finally:
+            _request_write.reset(token)
@@ -1,13 +1,17 @@
-from sqlalchemy import create_engine
+import logging
+
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.engine import make_engine
 
-# Debug: Print the database URL
-print("Database URL:", settings.get_database_url)
+logger = logging.getLogger(__name__)
+# Parola loglara yazılmaz
+logger.info("Database URL: %s", make_url(settings.get_database_url).render_as_string(hide_password=True))
 
-# SQLAlchemy database engine
-engine = create_engine(settings.get_database_url)
+# SQLAlchemy database engine; havuz ayarları Settings'ten (app/db/engine.py)
+engine = make_engine(settings.get_database_url)
 
 # SessionLocal class for database sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -1,5 +1,6 @@
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 from typing import List
@@ -10,6 +11,12 @@ import logging
 from app.api import api_router
 from app.api.auth import router as auth_router
 from app.core.config import settings
+from app.core.logging_config import render_logging_metrics, setup_logging
+from app.utils.request_metrics import RequestMetricsMiddleware, request_metrics
+from app.utils.price_matrix import render_price_matrix_metrics
+from app.utils.response_cache import ResponseCacheMiddleware, render_response_cache_metrics
+from app.db.engine import render_pool_metrics
+from app.db.replica import ReadYourWritesMiddleware, render_replica_metrics
 from app import crud, models
 from app.schemas import (
     User, UserCreate, Category, CategoryCreate, Comment, CommentCreate,
@@ -30,8 +37,8 @@ Base.metadata.create_all(bind=engine)
 # Create static directories if they don't exist
 os.makedirs("static/markets", exist_ok=True)
 
-# Logging ayarları
-logging.basicConfig(level=logging.INFO)
+# Logging ayarları (seviyeler, biçim ve kuyruk Settings'ten)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
@@ -51,6 +58,11 @@ origins = [
     "http://127.0.0.1:3001",
 ]
 
+# Katalog GET yanıtları önbelleği (ETag/304 dahil). CORS'tan önce eklenir ki
+# onun içinde çalışsın: önbellekten dönen yanıtlar da isteğin Origin'ine göre
+# CORS başlıklarını alır, saklanan yanıtlar Origin'e bağlı başlık taşımaz
+app.add_middleware(ResponseCacheMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -61,6 +73,29 @@ app.add_middleware(
     max_age=3600,
 )
 
+# Yazma yapan isteklere son yazma zamanını ekler (okuma kopyası yönlendirmesi)
+app.add_middleware(ReadYourWritesMiddleware)
+
+# İstek ölçümleri; en son eklenen en dışta çalışır, önbellek isabetleri de ölçülür
+app.add_middleware(RequestMetricsMiddleware)
+
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    """
+    Rota başına gecikme, sorgu sayısı/süresi ve yanıt boyutu; bağlantı
+    havuzu, okuma kopyası, yanıt önbelleği ve fiyat matrisi sayaçları
+    (Prometheus).
+    """
+    return PlainTextResponse(
+        request_metrics.render()
+        + render_logging_metrics()
+        + render_pool_metrics()
+        + render_replica_metrics()
+        + render_response_cache_metrics()
+        + render_price_matrix_metrics(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 
 
 # API router'ı ekle
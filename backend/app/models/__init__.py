@@ -1,12 +1,16 @@
 from .base_class import Base
 from .user import User
 from .category import Category
+from .category_closure import CategoryClosure
 from .market import Market
 from .product import Product
 from .product_detail import ProductDetail
+from .product_price_summary import ProductPriceSummary
+from .product_similarity import ProductSimilarity, ProductSimilarityQueue
 from .comment import Comment
 from .rating import Rating
 from .price_history import PriceHistory
+from .price_history_rollup import PriceHistoryRollup
 from .price_alert import PriceAlert
 from .search_history import SearchHistory
 from .shopping_list import ShoppingList, ShoppingListItem
@@ -19,12 +23,17 @@ __all__ = [
     "Base",
     "User",
     "Category",
+    "CategoryClosure",
     "Market",
     "Product",
     "ProductDetail",
+    "ProductPriceSummary",
+    "ProductSimilarity",
+    "ProductSimilarityQueue",
     "Comment",
     "Rating",
     "PriceHistory",
+    "PriceHistoryRollup",
     "PriceAlert",
     "SearchHistory",
     "ShoppingList",
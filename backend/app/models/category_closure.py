@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from app.db.base_class import Base
+
+class CategoryClosure(Base):
+    """
+    Kategori ağacının kapanış tablosu: her (ata, torun) çifti için bir satır,
+    her kategori kendisinin depth=0 atasıdır.
+    """
+    __tablename__ = "category_closure"
+    __table_args__ = (
+        Index("ix_category_closure_descendant", "descendant_id"),
+    )
+
+    ancestor_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    depth = Column(Integer, nullable=False)
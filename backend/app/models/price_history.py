@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
 class PriceHistory(Base):
     __tablename__ = "price_history"
+    __table_args__ = (
+        # (ürün, market) çiftinin son fiyatı için; bkz. price_history_writer
+        Index("ix_price_history_product_market_created", "product_id", "market_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, UniqueConstraint, Index
+from app.db.base_class import Base
+
+class PriceHistoryRollup(Base):
+    __tablename__ = "price_history_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "product_id", "market_id", "granularity", "bucket_start",
+            name="uq_price_history_rollups_bucket"
+        ),
+        Index("ix_price_history_rollups_product_granularity_bucket", "product_id", "granularity", "bucket_start"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    market_id = Column(Integer, ForeignKey("markets.id", ondelete="CASCADE"), nullable=False)
+    granularity = Column(String(8), nullable=False)  # day | week | month
+    bucket_start = Column(DateTime, nullable=False)
+    min_price = Column(Float, nullable=False)
+    max_price = Column(Float, nullable=False)
+    sum_price = Column(Float, nullable=False)
+    sample_count = Column(Integer, nullable=False)
+    last_price = Column(Float, nullable=False)
+    last_at = Column(DateTime, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, DateTime, func, Table
+from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, DateTime, func, Table, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -7,7 +7,9 @@ product_category = Table(
     'product_category',
     Base.metadata,
     Column('product_id', Integer, ForeignKey('products.id'), primary_key=True),
-    Column('category_id', Integer, ForeignKey('categories.id'), primary_key=True)
+    Column('category_id', Integer, ForeignKey('categories.id'), primary_key=True),
+    # Kategori (ve alt ağaç) filtresi category_id ile başlar
+    Index('ix_product_category_category_id', 'category_id', 'product_id')
 )
 
 class Product(Base):
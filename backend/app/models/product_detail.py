@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, func, Boolean
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, func, Boolean, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 from datetime import datetime
 
 class ProductDetail(Base):
     __tablename__ = "product_details"
+    __table_args__ = (
+        UniqueConstraint("product_id", "market_id", name="uq_product_details_product_market"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"))
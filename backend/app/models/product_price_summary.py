@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
+from app.db.base_class import Base
+
+class ProductPriceSummary(Base):
+    """
+    product_details'in ürün başına özeti; fiyat yazan her yol aynı
+    transaction'da günceller (app.utils.price_summary).
+    """
+    __tablename__ = "product_price_summary"
+    __table_args__ = (
+        # Fiyat aralığı filtresi için
+        Index("ix_product_price_summary_min_price", "min_price"),
+    )
+
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    min_price = Column(Float, nullable=False)
+    min_market_id = Column(Integer, ForeignKey("markets.id", ondelete="SET NULL"))
+    max_price = Column(Float, nullable=False)
+    avg_price = Column(Float, nullable=False)
+    market_count = Column(Integer, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
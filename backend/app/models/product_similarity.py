@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index, func
+from app.db.base_class import Base
+
+class ProductSimilarity(Base):
+    """
+    Her ürün için önceden hesaplanmış en benzer K ürün; rank 0 en benzeridir.
+    """
+    __tablename__ = "product_similarity"
+    __table_args__ = (
+        # Ürün silindiğinde onu listesinde tutan ürünleri bulmak için
+        Index("ix_product_similarity_neighbor", "neighbor_id"),
+    )
+
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    neighbor_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False)
+
+
+class ProductSimilarityQueue(Base):
+    """
+    Komşu listesi yeniden hesaplanacak ürünler (refresh-similarity tüketir).
+    """
+    __tablename__ = "product_similarity_queue"
+
+    product_id = Column(Integer, primary_key=True)
+    queued_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -17,14 +17,13 @@ def get_favorite_products(db: Session = Depends(get_db)):
     try:
         # Get all product details that are marked as favorite
         favorite_details = db.query(ProductDetail).filter(ProductDetail.is_favorite == True).all()
-        logger.info(f"Found {len(favorite_details)} favorite product details")
+        logger.debug("Found %d favorite product details", len(favorite_details))
         
         # Get the corresponding products
         favorite_products = []
         for detail in favorite_details:
             product = db.query(Product).filter(Product.id == detail.product_id).first()
             if product:
-                logger.info(f"Found product: {product.name} (ID: {product.id})")
                 # Convert to response model
                 product_response = ProductResponse(
                     id=product.id,
@@ -38,10 +37,10 @@ def get_favorite_products(db: Session = Depends(get_db)):
                 )
                 favorite_products.append(product_response)
             else:
-                logger.warning(f"Product not found for detail ID: {detail.id}")
+                logger.warning("Product not found for detail ID: %s", detail.id)
         
-        logger.info(f"Returning {len(favorite_products)} favorite products")
+        logger.debug("Returning %d favorite products", len(favorite_products))
         return favorite_products
     except Exception as e:
-        logger.error(f"Error in get_favorite_products: {str(e)}")
+        logger.error("Error in get_favorite_products: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
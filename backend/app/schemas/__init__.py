@@ -7,7 +7,7 @@ from .market import Market, MarketCreate, MarketUpdate
 from .product_detail import ProductDetail, ProductDetailCreate, ProductDetailUpdate, ProductDetailInDB
 from .comment import Comment, CommentCreate, CommentUpdate, CommentInDB
 from .rating import Rating, RatingCreate, RatingUpdate, RatingInDB
-from .price_history import PriceHistory, PriceHistoryCreate, PriceHistoryUpdate, PriceHistoryInDB
+from .price_history import PriceHistory, PriceHistoryCreate, PriceHistoryUpdate, PriceHistoryInDB, PriceHistoryRollup
 from .price_alert import PriceAlert, PriceAlertCreate, PriceAlertUpdate, PriceAlertInDB, PriceAlertBase
 from .search_history import SearchHistory, SearchHistoryCreate, SearchHistoryUpdate, SearchHistoryInDB
 from .shopping_list import ShoppingListInDB, ShoppingListItemInDB, ShoppingListItemBase, ShoppingListItemCreate, ShoppingListItemUpdate, ShoppingListCreate, ShoppingListUpdate
@@ -25,4 +25,23 @@ class PriceHistoryInDB(PriceHistoryBase):
         from_attributes = True
 
 class PriceHistory(PriceHistoryInDB):
-    pass 
\ No newline at end of file
+    pass
+
+class PriceHistoryRollup(BaseModel):
+    """
+    Gün/hafta/ay fiyat kovası. avg_price kovadaki fiyat değişim noktalarının
+    ortalamasıdır (süreyle ağırlıklı değildir); fiyatın değişmediği
+    aralıklar için kova dönmez.
+    """
+    product_id: int
+    market_id: int
+    granularity: str
+    bucket_start: datetime
+    min_price: float
+    max_price: float
+    avg_price: float
+    last_price: float
+    sample_count: int
+
+    class Config:
+        from_attributes = True 
\ No newline at end of file
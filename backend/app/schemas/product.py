@@ -58,6 +58,22 @@ class ProductUpdate(BaseModel):
 class ProductInDB(ProductBase, BaseSchema):
     pass
 
+class ProductListItem(BaseModel):
+    """Liste uç noktası için hafif ürün özeti; detaylar /products/{id}'dedir."""
+    id: int
+    name: str
+    brand: Optional[str] = None
+    image_url: Optional[str] = None
+    min_price: Optional[float] = None
+    min_market_id: Optional[int] = None
+    max_price: Optional[float] = None
+    avg_price: Optional[float] = None
+    market_count: int = 0
+    category_ids: List[int] = []
+
+    class Config:
+        from_attributes = True
+
 class Product(ProductInDB):
     id: int
     details: List[ProductDetail] = []
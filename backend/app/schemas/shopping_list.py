@@ -66,6 +66,29 @@ class MarketComparisonResponse(BaseModel):
     market_name: str
     total_price: float
     items: List[MarketComparisonItem]
+    found_products: int
+    missing_products: int = 0
+    total_products: int
+    rank: Optional[int] = None
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        from_attributes = True 
+
+class OptimalPlanMarket(BaseModel):
+    market_id: int
+    market_name: str
+    total_price: float
+    items: List[MarketComparisonItem]
+
+class OptimalPlanResponse(BaseModel):
+    shopping_list_id: int
+    max_markets: int
+    total_price: float
+    found_products: int
+    missing_products: int
+    total_products: int
+    missing_product_ids: List[int] = []
+    markets: List[OptimalPlanMarket]
+    solver: str
+    optimal: bool
+    elapsed_ms: float
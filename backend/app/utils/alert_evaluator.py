@@ -0,0 +1,230 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import exists, select, update, insert
+from sqlalchemy.orm import Session
+
+from app.models.notification import Notification
+from app.models.price_alert import PriceAlert
+from app.models.product import Product
+from app.models.product_price_summary import ProductPriceSummary
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+
+ALERT_TITLE = "Fiyat alarmı"
+
+
+def alert_message(product_name: str, price: float, target_price: float) -> str:
+    return f"{product_name} fiyatı {price:.2f} TL'ye düştü (hedef: {target_price:.2f} TL)"
+
+
+class AlertMetrics:
+    """
+    Değerlendiricinin süreç boyunca biriken sayaçları.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.batches = 0
+        self.alerts_scanned = 0
+        self.alerts_triggered = 0
+        self.alerts_rearmed = 0
+        self.notifications_created = 0
+        self.busy_seconds = 0.0
+        self.last_run: Optional[Dict[str, Any]] = None
+
+    def record(self, run: Dict[str, Any]) -> None:
+        with self._lock:
+            self.runs += 1
+            self.batches += run["batches"]
+            self.alerts_scanned += run["alerts_scanned"]
+            self.alerts_triggered += run["alerts_triggered"]
+            self.alerts_rearmed += run["alerts_rearmed"]
+            self.notifications_created += run["notifications_created"]
+            self.busy_seconds += run["elapsed_seconds"]
+            self.last_run = run
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "batches": self.batches,
+                "alerts_scanned": self.alerts_scanned,
+                "alerts_triggered": self.alerts_triggered,
+                "alerts_rearmed": self.alerts_rearmed,
+                "notifications_created": self.notifications_created,
+                "busy_seconds": round(self.busy_seconds, 3),
+                "alerts_per_second": round(self.alerts_scanned / self.busy_seconds, 1) if self.busy_seconds else 0.0,
+                "last_run": self.last_run,
+            }
+
+
+alert_metrics = AlertMetrics()
+
+
+def _batch_statement(last_id: int, batch_size: int):
+    """
+    Aktif alarmların bir dilimini, ürünün güncel en düşük fiyatıyla birlikte seç.
+
+    En düşük fiyat product_price_summary'den birincil anahtarla okunur;
+    alarm başına sorgu ya da product_details üzerinde gruplama yapılmaz.
+    """
+    batch = (
+        select(
+            PriceAlert.id,
+            PriceAlert.user_id,
+            PriceAlert.product_id,
+            PriceAlert.target_price,
+            PriceAlert.notified,
+        )
+        .where(PriceAlert.is_active.is_(True), PriceAlert.id > last_id)
+        .order_by(PriceAlert.id)
+        .limit(batch_size)
+        .cte("alert_batch")
+    )
+    return (
+        select(
+            batch.c.id,
+            batch.c.user_id,
+            batch.c.target_price,
+            batch.c.notified,
+            ProductPriceSummary.min_price,
+            Product.name.label("product_name"),
+        )
+        .select_from(batch)
+        .join(Product, Product.id == batch.c.product_id)
+        .outerjoin(ProductPriceSummary, ProductPriceSummary.product_id == batch.c.product_id)
+        .order_by(batch.c.id)
+    )
+
+
+def apply_alert_batch(db: Session, rows, now: datetime) -> Dict[str, int]:
+    """
+    Değerlendirilmiş bir alarm dilimini veritabanına yaz.
+
+    Tetiklenen alarmlar yalnızca hâlâ bildirilmemişlerse işaretlenir ve
+    bildirim yalnızca bu UPDATE'in döndürdüğü alarmlar için eklenir; aynı
+    alarmı eşzamanlı işaretleyen fiyat yazımı tetikleyicisiyle yarışta çift
+    bildirim oluşmaz.
+
+    Yeniden kurma da anlık görüntüdeki satıra göre değil SQL'de karar
+    verilir: alarm hâlâ bildirilmiş ve ürünün güncel en düşük fiyatı hedefin
+    üstündeyse (ya da fiyatı yoksa) kurulur. Okumadan sonra tetikleyicinin
+    işaretleyip bildirdiği bir alarm böylece yeniden kurulmaz ve ikinci kez
+    bildirilmez. last_checked dilimin id aralığı için tek UPDATE ile yazılır.
+    """
+    pending: Dict[int, Dict[str, Any]] = {}
+    rearmed: List[int] = []
+
+    for row in rows:
+        reached = row.min_price is not None and row.min_price <= row.target_price
+        if reached and not row.notified:
+            pending[row.id] = {
+                "user_id": row.user_id,
+                "title": ALERT_TITLE,
+                "message": alert_message(row.product_name, row.min_price, row.target_price),
+                "is_read": False,
+                "created_at": now,
+            }
+        elif not reached and row.notified:
+            rearmed.append(row.id)
+
+    triggered: List[int] = []
+    if pending:
+        triggered = list(db.execute(
+            update(PriceAlert)
+            .where(
+                PriceAlert.id.in_(list(pending)),
+                PriceAlert.is_active.is_(True),
+                PriceAlert.notified.isnot(True),
+            )
+            .values(notified=True, last_checked=now)
+            .returning(PriceAlert.id)
+            .execution_options(synchronize_session=False)
+        ).scalars())
+    if triggered:
+        db.execute(insert(Notification), [pending[alert_id] for alert_id in sorted(triggered)])
+
+    if rearmed:
+        reached_now = exists().where(
+            ProductPriceSummary.product_id == PriceAlert.product_id,
+            ProductPriceSummary.min_price <= PriceAlert.target_price,
+        )
+        rearmed = list(db.execute(
+            update(PriceAlert)
+            .where(
+                PriceAlert.id.in_(rearmed),
+                PriceAlert.is_active.is_(True),
+                PriceAlert.notified.is_(True),
+                ~reached_now,
+            )
+            .values(notified=False)
+            .returning(PriceAlert.id)
+            .execution_options(synchronize_session=False)
+        ).scalars())
+
+    db.execute(
+        update(PriceAlert)
+        .where(
+            PriceAlert.is_active.is_(True),
+            PriceAlert.id.between(rows[0].id, rows[-1].id),
+        )
+        .values(last_checked=now)
+        .execution_options(synchronize_session=False)
+    )
+    return {"triggered": len(triggered), "rearmed": len(rearmed), "notifications": len(triggered)}
+
+
+def evaluate_price_alerts(
+    db: Session,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    now: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Tüm aktif fiyat alarmlarını id sırasıyla dilim dilim değerlendir.
+
+    Her dilim kendi transaction'ında işlenir; uzun süren bir çalıştırma
+    tabloyu kilitli tutmaz.
+    """
+    now = now or datetime.utcnow()
+    start = time.perf_counter()
+    run = {
+        "batches": 0,
+        "alerts_scanned": 0,
+        "alerts_triggered": 0,
+        "alerts_rearmed": 0,
+        "notifications_created": 0,
+    }
+
+    last_id = 0
+    while True:
+        rows = db.execute(_batch_statement(last_id, batch_size)).all()
+        if not rows:
+            break
+        result = apply_alert_batch(db, rows, now)
+        db.commit()
+
+        run["batches"] += 1
+        run["alerts_scanned"] += len(rows)
+        run["alerts_triggered"] += result["triggered"]
+        run["alerts_rearmed"] += result["rearmed"]
+        run["notifications_created"] += result["notifications"]
+        last_id = rows[-1].id
+        if len(rows) < batch_size:
+            break
+
+    elapsed = time.perf_counter() - start
+    run["elapsed_seconds"] = round(elapsed, 3)
+    run["alerts_per_second"] = round(run["alerts_scanned"] / elapsed, 1) if elapsed else 0.0
+    alert_metrics.record(run)
+    logger.info(
+        "Price alert run: %d alerts in %d batches, %d triggered (%.1f alerts/s)",
+        run["alerts_scanned"], run["batches"], run["alerts_triggered"], run["alerts_per_second"]
+    )
+    return run
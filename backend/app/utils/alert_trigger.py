@@ -0,0 +1,276 @@
+import logging
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.notification import Notification
+from app.models.price_alert import PriceAlert
+from app.models.product import Product
+from app.utils.alert_evaluator import ALERT_TITLE, alert_message
+from app.utils.events import PRICE_CHANGED, PRICES_CHANGED, event_bus
+
+logger = logging.getLogger(__name__)
+
+
+class AlertTargetIndex:
+    """
+    Ürün başına hedef fiyata göre sıralı bekleyen alarm indeksi.
+
+    Her ürün için (target_price, alert_id, user_id) demetleri artan sırada
+    tutulur. Yeni bir fiyat p yazıldığında hedefi p'ye eşit veya büyük olan
+    alarmlar tek bir bisect ile listenin sonundan bulunur; ilgisiz ürünler
+    için veritabanına hiç gidilmez.
+
+    Yalnızca aktif ve henüz bildirilmemiş alarmlar indekstedir. Bu süreçteki
+    alarm oluşturma/güncelleme/silme işlemleri indekse anında yansıtılır;
+    başka süreçlerde (ör. evaluate-alerts işçisi) yapılan değişiklikler için
+    indeks ALERT_INDEX_TTL_SECONDS sonra arka planda yeniden yüklenir. Yalnızca
+    ilk yükleme isteği bekletir.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        self._lock = threading.RLock()
+        self._ttl = settings.ALERT_INDEX_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._generation = 0
+        self._reloading = False
+        # Arka plan yüklemesi sürerken gelen değişiklikler; yeni anlık
+        # görüntüye aynı sırayla yeniden uygulanır
+        self._pending: Optional[List[Tuple[str, tuple]]] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._generation += 1
+        self._loaded_at: Optional[float] = None
+        self._targets: Dict[int, List[Tuple[float, int, int]]] = {}
+        self._alert_keys: Dict[int, Tuple[int, Tuple[float, int, int]]] = {}
+
+    @staticmethod
+    def _fetch(db: Session):
+        return db.execute(
+            select(PriceAlert.id, PriceAlert.user_id, PriceAlert.product_id, PriceAlert.target_price)
+            .where(PriceAlert.is_active.is_(True), PriceAlert.notified.isnot(True))
+        ).all()
+
+    def load(self, db: Session) -> None:
+        rows = self._fetch(db)
+        with self._lock:
+            self._install(rows)
+
+    def _install(self, rows) -> None:
+        self._reset()
+        for alert_id, user_id, product_id, target_price in rows:
+            entry = (float(target_price), alert_id, user_id)
+            self._targets.setdefault(product_id, []).append(entry)
+            self._alert_keys[alert_id] = (product_id, entry)
+        for entries in self._targets.values():
+            entries.sort()
+        self._loaded_at = time.monotonic()
+
+    def ensure_loaded(self, db: Session) -> None:
+        """
+        İndeks hiç yüklenmemişse bu oturumla yükle; süresi dolmuşsa eski
+        indeksle devam edip yenisini arka planda yükle.
+        """
+        generation = self._generation
+        loaded_at = self._loaded_at
+        if loaded_at is None:
+            rows = self._fetch(db)
+            with self._lock:
+                # Bu arada başka bir çağrı yüklediyse onunkini koru
+                if self._generation == generation:
+                    self._install(rows)
+        elif self._ttl and time.monotonic() - loaded_at > self._ttl:
+            self._start_reload()
+
+    def _start_reload(self) -> None:
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+            self._pending = []
+        threading.Thread(target=self._reload, name="alert-index-reload", daemon=True).start()
+
+    def _reload(self) -> None:
+        from app.db.session import SessionLocal
+
+        generation = self._generation
+        rows = None
+        try:
+            db = SessionLocal()
+            try:
+                rows = self._fetch(db)
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning("Alert index reload failed, keeping the current index: %s", e)
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._reloading = False
+            if rows is None:
+                # Eski indeks geçerliliğini korur; sonraki yazma yeniden dener
+                self._loaded_at = time.monotonic()
+                return
+            if self._generation != generation:
+                # Yükleme sırasında indeks geçersiz kılındı
+                return
+            self._install(rows)
+            for operation, args in pending:
+                getattr(self, operation)(*args)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._reset()
+            if self._pending is not None:
+                self._pending.clear()
+
+    def add(self, alert_id: int, user_id: int, product_id: int, target_price: float) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(("_add", (alert_id, user_id, product_id, target_price)))
+            self._add(alert_id, user_id, product_id, target_price)
+
+    def _add(self, alert_id: int, user_id: int, product_id: int, target_price: float) -> None:
+        if self._loaded_at is None:
+            return
+        self._discard(alert_id)
+        entry = (float(target_price), alert_id, user_id)
+        insort(self._targets.setdefault(product_id, []), entry)
+        self._alert_keys[alert_id] = (product_id, entry)
+
+    def discard(self, *alert_ids: int) -> None:
+        with self._lock:
+            for alert_id in alert_ids:
+                if self._pending is not None:
+                    self._pending.append(("_discard", (alert_id,)))
+                self._discard(alert_id)
+
+    def _discard(self, alert_id: int) -> None:
+        key = self._alert_keys.pop(alert_id, None)
+        if key is None:
+            return
+        product_id, entry = key
+        entries = self._targets.get(product_id)
+        if not entries:
+            return
+        position = bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
+        if not entries:
+            del self._targets[product_id]
+
+    def sync_alert(self, alert: PriceAlert) -> None:
+        """Oluşturulan/güncellenen bir alarmı indekse yansıt."""
+        if alert.is_active is not False and not alert.notified:
+            self.add(alert.id, alert.user_id, alert.product_id, alert.target_price)
+        else:
+            self.discard(alert.id)
+
+    def reached(self, product_id: int, price: float) -> List[Tuple[float, int, int]]:
+        """
+        Hedefi `price` değerine ulaşan alarmlar. İndeksten çıkarılmazlar;
+        çağıran, bildirimi commit ettikten sonra discard() ile çıkarır.
+        """
+        with self._lock:
+            entries = self._targets.get(product_id)
+            if not entries or entries[-1][0] < price:
+                return []
+            return entries[bisect_left(entries, (price,)):]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "loaded": self._loaded_at is not None,
+                "generation": self._generation,
+                "reloading": self._reloading,
+                "products": len(self._targets),
+                "alerts": len(self._alert_keys),
+            }
+
+
+# Süreç genelinde paylaşılan indeks
+alert_target_index = AlertTargetIndex()
+
+
+def trigger_alerts_for_price(db: Session, product_id: int, price: Optional[float], **_) -> int:
+    """
+    Bir fiyat yazımından sonra yalnızca ilgili ürünün alarmlarını kontrol et.
+
+    Yeni fiyat hedefin altındaysa ürünün en düşük fiyatı da hedefin altındadır;
+    bu yüzden ek bir MIN sorgusu gerekmez. Fiyatın tekrar yükseldiği
+    (yeniden kurma) durumları periyodik değerlendiriciye bırakılır.
+    """
+    if price is None:
+        return 0
+    return trigger_alerts_for_prices(db, [(product_id, None, price)])
+
+
+def trigger_alerts_for_prices(db: Session, changes: Iterable[Tuple[int, Optional[int], Optional[float]]], **_) -> int:
+    """
+    trigger_alerts_for_price()'ın toplu hâli: bir dilimde yazılan
+    (product_id, market_id, price) değişiklikleri için tek UPDATE, tek ürün
+    adı sorgusu ve tek bildirim eklemesi yapılır. Bir ürünün dilimdeki en
+    düşük yeni fiyatı esas alınır.
+    """
+    lowest: Dict[int, float] = {}
+    for product_id, _, price in changes:
+        if price is not None and (product_id not in lowest or price < lowest[product_id]):
+            lowest[product_id] = float(price)
+    if not lowest:
+        return 0
+    alert_target_index.ensure_loaded(db)
+    reached = [
+        (product_id, entry)
+        for product_id, price in lowest.items()
+        for entry in alert_target_index.reached(product_id, price)
+    ]
+    if not reached:
+        return 0
+    reached_ids = [alert_id for _, (_, alert_id, _) in reached]
+
+    now = datetime.utcnow()
+    # Değerlendirici ile yarışmamak için yalnızca hâlâ bildirilmemiş olanları işaretle
+    flipped = set(db.execute(
+        update(PriceAlert)
+        .where(
+            PriceAlert.id.in_(reached_ids),
+            PriceAlert.is_active.is_(True),
+            PriceAlert.notified.isnot(True),
+        )
+        .values(notified=True, last_checked=now)
+        .returning(PriceAlert.id)
+        .execution_options(synchronize_session=False)
+    ).scalars())
+    if not flipped:
+        db.commit()
+        # Hepsi başka bir süreçte bildirilmiş; artık beklemiyorlar
+        alert_target_index.discard(*reached_ids)
+        return 0
+
+    product_ids = {product_id for product_id, (_, alert_id, _) in reached if alert_id in flipped}
+    names = dict(db.execute(select(Product.id, Product.name).where(Product.id.in_(product_ids))).all())
+    db.execute(insert(Notification), [
+        {
+            "user_id": user_id,
+            "title": ALERT_TITLE,
+            "message": alert_message(names.get(product_id), lowest[product_id], target_price),
+            "is_read": False,
+            "created_at": now,
+        }
+        for product_id, (target_price, alert_id, user_id) in reached
+        if alert_id in flipped
+    ])
+    db.commit()
+    # Yalnızca commit başarılıysa indeksten çıkar; aksi halde sonraki yazma yeniden dener
+    alert_target_index.discard(*reached_ids)
+    logger.info("Price writes on %d products triggered %d alerts", len(product_ids), len(flipped))
+    return len(flipped)
+
+
+event_bus.subscribe(PRICE_CHANGED, trigger_alerts_for_price)
+event_bus.subscribe(PRICES_CHANGED, trigger_alerts_for_prices)
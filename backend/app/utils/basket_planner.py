@@ -0,0 +1,319 @@
+import time
+from itertools import combinations
+from math import comb
+from typing import List, Dict, Any, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.utils.market_comparison import LIST_ITEMS_QUERY, market_names
+from app.utils.price_matrix import price_matrix
+
+INF = float("inf")
+
+# Kalem başına (kalem sayısı × kombinasyon sayısı) bu sınırın altındaysa
+# tüm market kombinasyonlarını deneyerek kesin çözüm üretiriz; bu arama da
+# süre bütçesine tabidir.
+EXACT_WORK_LIMIT = 200_000
+
+class BasketProblem:
+    """
+    Kalem × market maliyet matrisi.
+
+    costs[i][j], i. kalemin j. marketteki toplam tutarıdır (fiyat × adet);
+    ürün o markette yoksa INF.
+    """
+
+    def __init__(self, items: List[Dict[str, Any]], markets: List[Dict[str, Any]], costs: List[List[float]]):
+        self.items = items
+        self.markets = markets
+        self.costs = costs
+        # Market bazlı sütunlar; çözücüler kalem dizileri üzerinde çalışır
+        self.columns = [[row[j] for row in costs] for j in range(len(markets))]
+
+    @classmethod
+    def from_rows(cls, rows) -> "BasketProblem":
+        items: List[Dict[str, Any]] = []
+        item_index: Dict[int, int] = {}
+        markets: List[Dict[str, Any]] = []
+        market_index: Dict[int, int] = {}
+        prices: Dict[Tuple[int, int], float] = {}
+
+        for item_id, product_id, product_name, quantity, market_id, market_name, price in rows:
+            i = item_index.get(item_id)
+            if i is None:
+                i = item_index[item_id] = len(items)
+                items.append({
+                    "product_id": product_id,
+                    "product_name": product_name,
+                    "quantity": quantity or 0,
+                })
+            if market_id is None or price is None:
+                continue
+            j = market_index.get(market_id)
+            if j is None:
+                j = market_index[market_id] = len(markets)
+                markets.append({"market_id": market_id, "market_name": market_name})
+            price = float(price)
+            if price < prices.get((i, j), INF):
+                prices[(i, j)] = price
+
+        costs = [[INF] * len(markets) for _ in items]
+        for (i, j), price in prices.items():
+            costs[i][j] = price * items[i]["quantity"]
+            items[i].setdefault("prices", {})[j] = price
+
+        return cls(items, markets, costs)
+
+    def evaluate(self, selection) -> Tuple[int, float]:
+        """Seçili marketler için (eksik kalem, toplam tutar) döndür."""
+        current = [INF] * len(self.items)
+        for j in selection:
+            current = _merge(current, self.columns[j])
+        return _score(current)
+
+
+def _merge(current: List[float], column: List[float]) -> List[float]:
+    return [a if a < b else b for a, b in zip(current, column)]
+
+
+def _score(values: List[float]) -> Tuple[int, float]:
+    missing = 0
+    total = 0.0
+    for value in values:
+        if value == INF:
+            missing += 1
+        else:
+            total += value
+    return missing, total
+
+
+def _exhaustive(
+    problem: BasketProblem,
+    k: int,
+    deadline: float
+) -> Tuple[Tuple[Tuple[int, float], Tuple[int, ...]], bool]:
+    """
+    Tüm k'lı market kombinasyonlarını dene. Süre dolarsa o ana kadarki en
+    iyi çözüm ve False döner.
+    """
+    best_score = (len(problem.items) + 1, INF)
+    best_selection: Tuple[int, ...] = ()
+    for count, selection in enumerate(combinations(range(len(problem.markets)), k), start=1):
+        score = problem.evaluate(selection)
+        if score < best_score:
+            best_score, best_selection = score, selection
+        if count % 256 == 0 and time.perf_counter() > deadline:
+            return (best_score, best_selection), False
+    return (best_score, best_selection), True
+
+
+def _greedy(problem: BasketProblem, k: int) -> Tuple[Tuple[int, float], Tuple[int, ...]]:
+    selection: List[int] = []
+    current = [INF] * len(problem.items)
+    score = _score(current)
+    remaining = set(range(len(problem.markets)))
+    while len(selection) < k and remaining:
+        candidate, candidate_score, candidate_values = None, score, current
+        for j in remaining:
+            merged = _merge(current, problem.columns[j])
+            trial = _score(merged)
+            if trial < candidate_score:
+                candidate, candidate_score, candidate_values = j, trial, merged
+        if candidate is None:
+            break
+        selection.append(candidate)
+        remaining.discard(candidate)
+        score, current = candidate_score, candidate_values
+    return score, tuple(selection)
+
+
+def _branch_and_bound(
+    problem: BasketProblem,
+    k: int,
+    incumbent: Tuple[Tuple[int, float], Tuple[int, ...]],
+    deadline: float
+) -> Tuple[Tuple[Tuple[int, float], Tuple[int, ...]], bool]:
+    """
+    Greedy çözümden başlayarak dal-sınır araması yap.
+
+    Marketler tek başına maliyetlerine göre sıralanır; her düğümde kalan
+    marketlerle ulaşılabilecek en iyi tutar alt sınır olarak kullanılır.
+    Süre dolarsa o ana kadarki en iyi çözüm ve False döner.
+    """
+    n_markets = len(problem.markets)
+    order = sorted(range(n_markets), key=lambda j: _score(problem.columns[j]))
+    columns = [problem.columns[j] for j in order]
+
+    # suffix[d][i]: order[d:] marketleri içinde i. kalemin en düşük tutarı
+    suffix = [[INF] * len(problem.items) for _ in range(n_markets + 1)]
+    for d in range(n_markets - 1, -1, -1):
+        suffix[d] = _merge(suffix[d + 1], columns[d])
+
+    best_score, best_selection = incumbent
+    completed = True
+    nodes = 0
+
+    def bound(current: List[float], depth: int) -> Tuple[int, float]:
+        missing = 0
+        total = 0.0
+        for a, b in zip(current, suffix[depth]):
+            value = a if a < b else b
+            if value == INF:
+                missing += 1
+            else:
+                total += value
+        return missing, total
+
+    def search(depth: int, chosen: List[int], current: List[float]):
+        nonlocal best_score, best_selection, completed, nodes
+        if not completed:
+            return
+        nodes += 1
+        if nodes % 256 == 0 and time.perf_counter() > deadline:
+            completed = False
+            return
+
+        score = _score(current)
+        if chosen and score < best_score:
+            best_score, best_selection = score, tuple(order[d] for d in chosen)
+        if len(chosen) == k or depth == n_markets:
+            return
+        if bound(current, depth) >= best_score:
+            return
+
+        for d in range(depth, n_markets):
+            merged = _merge(current, columns[d])
+            if merged == current:
+                continue
+            chosen.append(d)
+            search(d + 1, chosen, merged)
+            chosen.pop()
+            if not completed:
+                return
+
+    search(0, [], [INF] * len(problem.items))
+    return (best_score, best_selection), completed
+
+
+def solve(
+    problem: BasketProblem,
+    max_markets: int,
+    time_budget_ms: float = 50.0
+) -> Dict[str, Any]:
+    """
+    En fazla `max_markets` market kullanarak sepeti en ucuza tamamla.
+
+    Önce olabildiğince çok kalem bulunur, sonra toplam tutar en aza indirilir.
+    Küçük problemler tüm kombinasyonlar denenerek kesin çözülür; büyük
+    problemlerde greedy çözüm, süre bütçesi içinde dal-sınır ile iyileştirilir.
+    Kesin arama bütçeyi aşarsa yarım kalan aramanın ve greedy'nin iyi olanı
+    optimal=False ile döner.
+    """
+    n_markets = len(problem.markets)
+    k = max(0, min(max_markets, n_markets))
+    if k == 0:
+        return {"selection": (), "score": (len(problem.items), 0.0), "solver": "none", "optimal": True}
+
+    deadline = time.perf_counter() + time_budget_ms / 1000.0
+    if comb(n_markets, k) * max(len(problem.items), 1) <= EXACT_WORK_LIMIT:
+        (score, selection), completed = _exhaustive(problem, k, deadline)
+        if completed:
+            return {"selection": selection, "score": score, "solver": "exact", "optimal": True}
+        greedy_score, greedy_selection = _greedy(problem, k)
+        if greedy_score < score:
+            return {"selection": greedy_selection, "score": greedy_score, "solver": "greedy", "optimal": False}
+        return {"selection": selection, "score": score, "solver": "exhaustive", "optimal": False}
+
+    incumbent = _greedy(problem, k)
+    (score, selection), completed = _branch_and_bound(problem, k, incumbent, deadline)
+    improved = score < incumbent[0]
+    return {
+        "selection": selection,
+        "score": score,
+        "solver": "branch_and_bound" if completed or improved else "greedy",
+        "optimal": completed,
+    }
+
+
+def build_plan(problem: BasketProblem, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Çözücü çıktısını market bazlı alışveriş planına dönüştür."""
+    selection = result["selection"]
+    plan_markets = {
+        j: {
+            "market_id": problem.markets[j]["market_id"],
+            "market_name": problem.markets[j]["market_name"],
+            "total_price": 0.0,
+            "items": [],
+        }
+        for j in selection
+    }
+    missing_product_ids = []
+
+    for i, item in enumerate(problem.items):
+        row = problem.costs[i]
+        best_j = min(selection, key=lambda j: row[j], default=None)
+        if best_j is None or row[best_j] == INF:
+            missing_product_ids.append(item["product_id"])
+            continue
+        plan_market = plan_markets[best_j]
+        plan_market["total_price"] += row[best_j]
+        plan_market["items"].append({
+            "product_id": item["product_id"],
+            "product_name": item["product_name"],
+            "price": item["prices"][best_j],
+            "quantity": item["quantity"],
+        })
+
+    missing, total = result["score"]
+    return {
+        "total_price": total,
+        "found_products": len(problem.items) - len(missing_product_ids),
+        "missing_products": len(missing_product_ids),
+        "total_products": len(problem.items),
+        "missing_product_ids": missing_product_ids,
+        "markets": [m for m in plan_markets.values() if m["items"]],
+        "solver": result["solver"],
+        "optimal": result["optimal"],
+    }
+
+
+def plan_rows(db: Session, shopping_list_id: int) -> List[Tuple]:
+    """
+    (item_id, product_id, product_name, quantity, market_id, market_name, price)
+    satırları; fiyatlar fiyat matrisinden okunur. Hiçbir markette fiyatı
+    olmayan kalemler market/fiyat alanları boş tek satırla döner.
+    """
+    items = db.execute(LIST_ITEMS_QUERY, {"list_id": shopping_list_id}).all()
+    prices = price_matrix.get_product_prices(db, {item.product_id for item in items})
+    names = market_names(db, (market_id for row in prices.values() for market_id in row))
+    rows = []
+    for item in items:
+        offers = [
+            (market_id, price) for market_id, price in sorted(prices.get(item.product_id, {}).items())
+            if market_id in names
+        ]
+        base = (item.item_id, item.product_id, item.product_name, item.quantity)
+        if not offers:
+            rows.append(base + (None, None, None))
+        for market_id, price in offers:
+            rows.append(base + (market_id, names[market_id], price))
+    return rows
+
+
+def plan_shopping_list(
+    db: Session,
+    shopping_list_id: int,
+    max_markets: int = 2,
+    time_budget_ms: float = 50.0
+) -> Dict[str, Any]:
+    """
+    Alışveriş listesi için en fazla K marketten oluşan en ucuz planı hesapla.
+    """
+    start = time.perf_counter()
+    problem = BasketProblem.from_rows(plan_rows(db, shopping_list_id))
+    result = solve(problem, max_markets, time_budget_ms)
+    plan = build_plan(problem, result)
+    plan["shopping_list_id"] = shopping_list_id
+    plan["max_markets"] = max_markets
+    plan["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return plan
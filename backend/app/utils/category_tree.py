@@ -0,0 +1,120 @@
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, insert, literal, select, text, true
+from sqlalchemy.orm import Session, aliased
+
+from app.models.category import Category
+from app.models.category_closure import CategoryClosure
+from app.models.product import product_category
+
+REBUILD_QUERY = text("""
+    WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+        SELECT id, id, 0 FROM categories
+        UNION ALL
+        SELECT tree.ancestor_id, c.id, tree.depth + 1
+        FROM tree JOIN categories c ON c.parent_id = tree.descendant_id
+    )
+    INSERT INTO category_closure (ancestor_id, descendant_id, depth)
+    SELECT ancestor_id, descendant_id, depth FROM tree
+""")
+
+
+class CategoryCycleError(ValueError):
+    """Bir kategori kendi alt ağacındaki bir kategorinin altına taşınamaz."""
+
+
+def add_category(db: Session, category_id: int, parent_id: Optional[int]) -> None:
+    """
+    Yeni kategoriyi kapanış tablosuna ekle: kendisi (depth=0) ve ebeveyninin
+    tüm ataları (depth+1). Commit çağıranındır.
+    """
+    db.execute(insert(CategoryClosure).values(ancestor_id=category_id, descendant_id=category_id, depth=0))
+    if parent_id is not None:
+        db.execute(
+            insert(CategoryClosure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(CategoryClosure.ancestor_id, literal(category_id), CategoryClosure.depth + 1)
+                .where(CategoryClosure.descendant_id == parent_id)
+            )
+        )
+
+
+def is_descendant(db: Session, category_id: int, ancestor_id: int) -> bool:
+    return db.query(CategoryClosure).filter(
+        CategoryClosure.ancestor_id == ancestor_id,
+        CategoryClosure.descendant_id == category_id
+    ).first() is not None
+
+
+def move_category(db: Session, category_id: int, new_parent_id: Optional[int]) -> None:
+    """
+    Kategoriyi alt ağacıyla birlikte yeni ebeveynin altına taşı.
+
+    Alt ağacın dışarıdaki atalarla bağları silinir, ardından yeni ebeveynin
+    ataları × alt ağaç çaprazı tek INSERT ... SELECT ile eklenir; alt ağacın
+    kendi içindeki satırlara dokunulmaz.
+    """
+    if new_parent_id is not None and is_descendant(db, new_parent_id, category_id):
+        raise CategoryCycleError(f"Category {new_parent_id} is inside the subtree of {category_id}")
+
+    subtree = select(CategoryClosure.descendant_id).where(CategoryClosure.ancestor_id == category_id)
+    db.execute(
+        delete(CategoryClosure)
+        .where(CategoryClosure.descendant_id.in_(subtree))
+        .where(CategoryClosure.ancestor_id.notin_(subtree))
+        .execution_options(synchronize_session=False)
+    )
+    if new_parent_id is not None:
+        above = aliased(CategoryClosure)
+        below = aliased(CategoryClosure)
+        db.execute(
+            insert(CategoryClosure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+                .select_from(above).join(below, true())
+                .where(above.descendant_id == new_parent_id, below.ancestor_id == category_id)
+            )
+        )
+
+
+def remove_category(db: Session, category_id: int) -> None:
+    """
+    Silinen kategorinin kapanış satırlarını kaldır. Alt kategoriler
+    categories.parent_id yabancı anahtarı nedeniyle önce taşınmış olmalıdır.
+    """
+    db.execute(
+        delete(CategoryClosure)
+        .where((CategoryClosure.ancestor_id == category_id) | (CategoryClosure.descendant_id == category_id))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebuild_category_tree(db: Session) -> Dict[str, Any]:
+    """
+    Kapanış tablosunu categories.parent_id'den baştan kur (tek özyinelemeli sorgu).
+    """
+    db.execute(delete(CategoryClosure).execution_options(synchronize_session=False))
+    db.execute(REBUILD_QUERY)
+    db.commit()
+    return {
+        "categories": db.query(Category).count(),
+        "closure_rows": db.query(CategoryClosure).count(),
+    }
+
+
+def subtree_product_ids(category_id: int):
+    """
+    Kategorinin ve tüm alt kategorilerinin ürün id'lerini veren alt sorgu;
+    Product.id.in_(...) içinde kullanılır. Kapanış tablosunun birincil
+    anahtarı ve product_category(category_id) indeksiyle tek sorguda çözülür.
+    """
+    return (
+        select(product_category.c.product_id)
+        .join(CategoryClosure, CategoryClosure.descendant_id == product_category.c.category_id)
+        .where(CategoryClosure.ancestor_id == category_id)
+    )
+
+
+def category_product_ids(category_id: int):
+    """Yalnızca bu kategoriye doğrudan bağlı ürünlerin id'leri (alt sorgu)."""
+    return select(product_category.c.product_id).where(product_category.c.category_id == category_id)
@@ -0,0 +1,465 @@
+import csv
+import io
+import logging
+import math
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.models.category import Category
+from app.models.market import Market
+from app.models.price_history import PriceHistory
+from app.models.product import Product, product_category
+from app.models.product_detail import ProductDetail
+
+logger = logging.getLogger(__name__)
+
+# Kategori ağacı: sözlükler alt kategorilerdir, listeler o yaprağın ürün
+# tipleridir. Ürün tipi: (ad, ambalajlar, taban fiyat aralığı TL, ortalama
+# fiyat değişim aralığı gün). Taze ürünlerde fiyat haftalık, paketli
+# ürünlerde aylar arayla değişir.
+CATALOG: Dict[str, Any] = {
+    "Meyve & Sebze": {
+        "Meyve": [
+            ("Elma", ("1 kg", "2 kg"), (25, 60), 7),
+            ("Muz", ("1 kg",), (45, 90), 7),
+            ("Portakal", ("1 kg", "3 kg file"), (20, 55), 7),
+            ("Çilek", ("250 g", "500 g"), (40, 120), 5),
+        ],
+        "Sebze": [
+            ("Domates", ("1 kg",), (20, 70), 5),
+            ("Salatalık", ("1 kg",), (18, 55), 5),
+            ("Patates", ("1 kg", "3 kg file"), (12, 40), 10),
+            ("Kuru Soğan", ("1 kg", "2 kg file"), (10, 35), 10),
+        ],
+        "Yeşillik": [
+            ("Maydanoz", ("1 demet",), (8, 20), 7),
+            ("Roka", ("1 demet",), (10, 25), 7),
+        ],
+    },
+    "Süt & Kahvaltılık": {
+        "Süt": [
+            ("Tam Yağlı Süt", ("1 L", "500 ml"), (25, 50), 45),
+            ("Laktozsuz Süt", ("1 L",), (35, 60), 45),
+            ("Ayran", ("200 ml", "1 L"), (8, 35), 45),
+        ],
+        "Peynir": {
+            "Beyaz Peynir": [("Tam Yağlı Beyaz Peynir", ("500 g", "1 kg"), (90, 280), 40)],
+            "Kaşar Peyniri": [("Taze Kaşar", ("400 g", "700 g"), (110, 300), 40)],
+            "Yöresel Peynirler": [
+                ("Tulum Peyniri", ("350 g",), (120, 260), 50),
+                ("Ezine Peyniri", ("600 g",), (180, 350), 50),
+            ],
+        },
+        "Yoğurt": [("Süzme Yoğurt", ("500 g", "1 kg"), (35, 90), 45)],
+        "Tereyağı & Margarin": [
+            ("Tereyağı", ("250 g", "500 g"), (90, 260), 45),
+            ("Margarin", ("250 g",), (30, 60), 60),
+        ],
+        "Zeytin": [
+            ("Siyah Zeytin", ("500 g", "1 kg"), (70, 200), 60),
+            ("Yeşil Zeytin", ("500 g",), (60, 150), 60),
+        ],
+        "Reçel & Bal": [
+            ("Çiçek Balı", ("460 g", "850 g"), (120, 350), 75),
+            ("Vişne Reçeli", ("380 g",), (40, 90), 75),
+        ],
+        "Yumurta": [("Yumurta", ("10'lu", "15'li", "30'lu"), (40, 150), 21)],
+    },
+    "Et, Tavuk & Balık": {
+        "Kırmızı Et": [
+            ("Dana Kıyma", ("500 g", "1 kg"), (220, 600), 21),
+            ("Kuzu Pirzola", ("500 g",), (350, 700), 21),
+        ],
+        "Beyaz Et": [
+            ("Bütün Piliç", ("1 kg",), (80, 160), 14),
+            ("Tavuk Göğüs", ("500 g", "1 kg"), (90, 220), 14),
+        ],
+        "Şarküteri": [
+            ("Dana Sucuk", ("250 g", "500 g"), (110, 320), 45),
+            ("Hindi Salam", ("200 g",), (50, 110), 45),
+        ],
+        "Balık": [
+            ("Levrek", ("1 kg",), (250, 450), 7),
+            ("Hamsi", ("1 kg",), (90, 250), 5),
+        ],
+    },
+    "Temel Gıda": {
+        "Bakliyat": [
+            ("Kırmızı Mercimek", ("1 kg", "2,5 kg"), (40, 120), 60),
+            ("Nohut", ("1 kg",), (45, 90), 60),
+            ("Baldo Pirinç", ("1 kg", "2,5 kg"), (50, 150), 60),
+        ],
+        "Makarna": [("Spagetti", ("500 g",), (12, 30), 60), ("Burgu Makarna", ("500 g",), (12, 30), 60)],
+        "Un & İrmik": [("Buğday Unu", ("1 kg", "5 kg"), (20, 110), 60)],
+        "Sıvı Yağ": [
+            ("Ayçiçek Yağı", ("1 L", "5 L"), (60, 300), 45),
+            ("Sızma Zeytinyağı", ("1 L", "2 L"), (250, 700), 45),
+        ],
+        "Şeker & Tuz": [("Toz Şeker", ("1 kg", "3 kg"), (30, 100), 60), ("Kaya Tuzu", ("750 g",), (10, 25), 90)],
+        "Konserve & Salça": [
+            ("Domates Salçası", ("830 g",), (45, 90), 60),
+            ("Biber Salçası", ("650 g",), (60, 110), 60),
+        ],
+    },
+    "Atıştırmalık": {
+        "Çikolata": [("Sütlü Çikolata", ("80 g",), (20, 50), 60), ("Fındıklı Çikolata", ("80 g",), (25, 55), 60)],
+        "Bisküvi & Kek": [("Kakaolu Kek", ("5'li",), (25, 50), 60), ("Petibör Bisküvi", ("450 g",), (20, 45), 60)],
+        "Cips": [("Patates Cipsi", ("Süper Boy", "Parti Boy"), (30, 75), 60)],
+        "Kuruyemiş": [
+            ("Kavrulmuş Fındık", ("200 g",), (70, 160), 45),
+            ("Antep Fıstığı", ("200 g",), (120, 280), 45),
+            ("Leblebi", ("300 g",), (30, 70), 45),
+        ],
+    },
+    "İçecek": {
+        "Su": [("Doğal Kaynak Suyu", ("0,5 L", "5 L", "19 L damacana"), (5, 90), 90)],
+        "Maden Suyu": [("Sade Maden Suyu", ("200 ml", "6'lı"), (6, 45), 90)],
+        "Gazlı İçecek": [("Kola", ("1 L", "2,5 L"), (25, 70), 60), ("Gazoz", ("1 L",), (20, 45), 60)],
+        "Meyve Suyu": [("Vişne Nektarı", ("1 L",), (30, 65), 60), ("Şeftali Nektarı", ("1 L",), (30, 65), 60)],
+        "Çay & Kahve": [
+            ("Siyah Çay", ("500 g", "1 kg"), (90, 320), 75),
+            ("Türk Kahvesi", ("100 g", "250 g"), (45, 160), 75),
+        ],
+    },
+    "Temizlik": {
+        "Çamaşır": [("Toz Deterjan", ("4 kg", "6 kg"), (150, 400), 75), ("Yumuşatıcı", ("1,44 L",), (60, 130), 75)],
+        "Bulaşık": [("Bulaşık Deterjanı", ("750 ml",), (40, 90), 75), ("Tablet Deterjan", ("40'lı",), (150, 350), 75)],
+        "Kağıt Ürünleri": [("Tuvalet Kağıdı", ("16'lı", "32'li"), (90, 300), 75), ("Kağıt Havlu", ("6'lı",), (60, 150), 75)],
+        "Yüzey Temizleyici": [("Çamaşır Suyu", ("1 L", "3,5 L"), (20, 80), 75)],
+    },
+    "Kişisel Bakım": {
+        "Saç Bakımı": [("Şampuan", ("400 ml", "700 ml"), (60, 180), 75)],
+        "Ağız Bakımı": [("Diş Macunu", ("75 ml",), (40, 110), 75)],
+        "Sabun & Duş": [("Sıvı Sabun", ("1,5 L",), (45, 110), 75), ("Duş Jeli", ("500 ml",), (50, 140), 75)],
+    },
+    "Bebek": {
+        "Bebek Bezi": [("Bebek Bezi", ("4 Numara", "5 Numara"), (250, 600), 60)],
+        "Islak Mendil": [("Islak Mendil", ("3'lü paket",), (50, 120), 60)],
+    },
+    "Dondurulmuş": {
+        "Dondurma": [("Kaymaklı Dondurma", ("500 ml", "1 L"), (45, 130), 60)],
+        "Dondurulmuş Hazır Gıda": [("Mantı", ("500 g",), (70, 150), 60), ("Sigara Böreği", ("500 g",), (70, 140), 60)],
+    },
+}
+
+BRANDS = (
+    "Anadolu", "Yayla", "Bereket", "Ege Çiftliği", "Karadeniz", "Toros", "Güneşli",
+    "Köy Sofrası", "Marmara", "Kapadokya", "Akdeniz", "Bağ Evi", "Tazeköy", "Uludağ",
+    "Fırat", "Altınbaşak", "Efe", "Pınarbaşı", "Gökçe", "Sarıkız", "Dere Boyu", "Çamlıca",
+)
+VARIANTS = ("", "", "", "Organik", "Ekonomik", "Klasik", "Doğal", "Gurme", "Yöresel", "Light")
+
+# (şehir, enlem, boylam, şube ağırlığı)
+CITIES = (
+    ("İstanbul", 41.0082, 28.9784, 12), ("Ankara", 39.9334, 32.8597, 5), ("İzmir", 38.4237, 27.1428, 4),
+    ("Bursa", 40.1885, 29.0610, 3), ("Antalya", 36.8969, 30.7133, 3), ("Adana", 37.0000, 35.3213, 2),
+    ("Konya", 37.8746, 32.4932, 2), ("Gaziantep", 37.0662, 37.3833, 2), ("Kayseri", 38.7312, 35.4787, 1),
+    ("Mersin", 36.8121, 34.6415, 1), ("Eskişehir", 39.7767, 30.5206, 1), ("Samsun", 41.2867, 36.3300, 1),
+    ("Trabzon", 41.0015, 39.7178, 1), ("Diyarbakır", 37.9144, 40.2306, 1),
+)
+
+# (zincir, fiyat seviyesi, ürün kapsamı, çalışma saatleri, şube ağırlığı)
+CHAINS = (
+    ("Ekonomi Depo", 0.88, 0.40, "09:00-21:00", 5),
+    ("Bereket Market", 0.93, 0.50, "08:30-22:00", 5),
+    ("Anadolu Süpermarket", 1.00, 0.75, "08:00-22:00", 3),
+    ("Marmara Hipermarket", 1.04, 0.95, "09:00-22:00", 1),
+    ("Şehir Gurme", 1.18, 0.60, "10:00-22:00", 1),
+    ("Mahalle Bakkalı", 1.12, 0.25, "07:00-23:30", 2),
+)
+
+# Fiyat değişimlerinin bu kadarı kısa süreli kampanyadır; kampanya bitince
+# fiyat normal seviyesine döner
+PROMOTION_SHARE = 0.15
+PROMOTION_DAYS = (5, 15)
+
+DEFAULT_PRODUCT_BATCH = 500
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Konumsal parametre stilleri; diğerlerinde Core insert kullanılır
+PLACEHOLDERS = {"qmark": "?", "format": "%s", "pyformat": "%s"}
+
+ProductType = Tuple[str, Tuple[str, ...], Tuple[float, float], int]
+HistoryRow = Tuple[int, int, float, datetime]
+
+
+def walk_catalog(tree: Dict[str, Any], parent: Optional[str] = None) -> Iterator[Tuple[str, Optional[str], List[ProductType]]]:
+    """Ağacı ebeveynler çocuklardan önce gelecek sırayla dolaş: (ad, ebeveyn adı, ürün tipleri)."""
+    for name, node in tree.items():
+        if isinstance(node, dict):
+            yield name, parent, []
+            yield from walk_catalog(node, name)
+        else:
+            yield name, parent, list(node)
+
+
+def ean13(prefix12: str) -> str:
+    """12 haneye EAN-13 kontrol hanesini ekle."""
+    total = sum(int(digit) * (3 if index % 2 else 1) for index, digit in enumerate(prefix12))
+    return prefix12 + str((10 - total % 10) % 10)
+
+
+def retail_price(price: float) -> float:
+    """Raf fiyatı: 10 TL üstü fiyatlar ,x9 ile biter (23,47 -> 23,49)."""
+    if price < 10:
+        return round(price, 2)
+    return round(round(price, 1) - 0.01, 2)
+
+
+def _next_id(db: Session, model) -> int:
+    return (db.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _write_rows(db: Session, table, columns: Sequence[str], rows: List[tuple]) -> None:
+    """
+    Satırları toplu yaz: PostgreSQL'de COPY, diğer veritabanlarında sürücü
+    düzeyinde tek executemany.
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect
+    if dialect.name == "postgresql":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        dbapi_connection = db.connection().connection.dbapi_connection
+        with dbapi_connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        return
+
+    placeholder = PLACEHOLDERS.get(dialect.paramstyle)
+    if placeholder is None:
+        db.execute(insert(table), [dict(zip(columns, row)) for row in rows])
+        return
+    # Core insert satır başına parametre sözlüğü kurar; burada yalnızca
+    # dönüştürücüsü olan sütunlar (ör. SQLite'ta DateTime) işlenir, saklanan
+    # biçim ORM'in yazdığıyla aynı kalır
+    processors = [
+        (position, processor)
+        for position, name in enumerate(columns)
+        if (processor := table.c[name].type.dialect_impl(dialect).bind_processor(dialect)) is not None
+    ]
+    if processors:
+        converted = []
+        for row in rows:
+            row = list(row)
+            for position, processor in processors:
+                row[position] = processor(row[position])
+            converted.append(tuple(row))
+        rows = converted
+    statement = f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join([placeholder] * len(columns))})"
+    db.connection().exec_driver_sql(statement, rows)
+
+
+def _sync_sequences(db: Session, tables: Sequence[str]) -> None:
+    """Açık id ile yazılan tabloların PostgreSQL dizilerini en büyük id'ye çek."""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for table in tables:
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT coalesce(max(id), 1) FROM {table}))"
+        ))
+
+
+def _generate_markets(rnd: random.Random, count: int) -> List[Dict[str, Any]]:
+    chain_weights = [chain[4] for chain in CHAINS]
+    city_weights = [city[3] for city in CITIES]
+    branches: Dict[Tuple[str, str], int] = {}
+    markets = []
+    for _ in range(count):
+        chain, level, coverage, hours, _ = rnd.choices(CHAINS, chain_weights)[0]
+        city, latitude, longitude, _ = rnd.choices(CITIES, city_weights)[0]
+        branch = branches[(chain, city)] = branches.get((chain, city), 0) + 1
+        markets.append({
+            "name": f"{chain} {city} {branch}. Şube",
+            "address": city,
+            "open_hours": hours,
+            "latitude": round(latitude + rnd.gauss(0, 0.06), 6),
+            "longitude": round(longitude + rnd.gauss(0, 0.08), 6),
+            # Şubeler zincir seviyesinin çevresinde ±%3 sapar
+            "price_level": level * rnd.uniform(0.97, 1.03),
+            "coverage": coverage,
+        })
+    return markets
+
+
+def _price_history(
+    rnd: random.Random,
+    product_id: int,
+    market_id: int,
+    current: float,
+    change_days: int,
+    start: datetime,
+    days: float,
+    daily_inflation: float,
+) -> Tuple[List[HistoryRow], float]:
+    """
+    Bir ürün-market çiftinin fiyat değişimleri; yalnızca fiyatın değiştiği
+    anlar yazılır (compact_price_history'nin bıraktığı biçim).
+
+    Değişimler ortalama `change_days` günde bir gelir (Poisson). Normal
+    değişimler enflasyonu izler; bir kısmı kısa kampanyadır ve bitince fiyat
+    normal seviyesine döner. Son fiyat product_details'e yazılacak fiyattır.
+    """
+    growth = math.log1p(daily_inflation)
+    regular = current / math.exp(growth * days)
+    day = rnd.uniform(0, min(change_days, days))
+    last_regular_day = day
+    price = retail_price(regular)
+    rows = [(product_id, market_id, price, start + timedelta(days=day))]
+    promotion_end = None
+    while True:
+        if promotion_end is not None:
+            day, promotion_end = promotion_end, None
+            candidate = regular
+        else:
+            day += rnd.expovariate(1 / change_days)
+            if rnd.random() < PROMOTION_SHARE:
+                promotion_end = day + rnd.uniform(*PROMOTION_DAYS)
+                candidate = regular * rnd.uniform(0.70, 0.90)
+            else:
+                regular *= math.exp(growth * (day - last_regular_day) + rnd.gauss(0, 0.03))
+                last_regular_day = day
+                candidate = regular
+        if day >= days:
+            break
+        candidate = retail_price(candidate)
+        if candidate != price:
+            price = candidate
+            rows.append((product_id, market_id, price, start + timedelta(days=day)))
+    return rows, price
+
+
+def generate_dataset(
+    db: Session,
+    products: int = 10_000,
+    markets: int = 40,
+    years: float = 3.0,
+    seed: int = 1,
+    annual_inflation: float = 0.35,
+    end: Optional[datetime] = None,
+    product_batch: int = DEFAULT_PRODUCT_BATCH,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Sentetik ama gerçekçi bir katalog üret ve toplu yazımla veritabanına akıt.
+
+    Aynı seed, boyutlar ve `end` her seferinde aynı veriyi verir (`end`
+    verilmezse fiyat geçmişi şu ana kadar uzanır): her ürün kendi seed'inden
+    üretildiği için sonuç dilim boyutlarından bağımsızdır. Mevcut
+    satırlara dokunulmaz; yeni kimlikler tablolardaki en büyük id'den
+    devam eder. Fiyat geçmişi `chunk_size` satırlık dilimlerle yazılır,
+    her ürün dilimi ayrı commit edilir. Türetilmiş tablolar (kategori
+    kapanışı, fiyat özeti, rollup'lar) burada kurulmaz; çağıran yeniden
+    oluşturur.
+    """
+    start_time = time.perf_counter()
+    rnd = random.Random(seed)
+    end = end or datetime.now(timezone.utc).replace(microsecond=0)
+    days = years * 365
+    start = end - timedelta(days=days)
+    daily_inflation = (1 + annual_inflation) ** (1 / 365) - 1
+
+    # Kategoriler
+    category_id = _next_id(db, Category)
+    category_ids: Dict[str, int] = {}
+    category_rows = []
+    leaves: List[Tuple[int, List[ProductType]]] = []
+    for name, parent, types in walk_catalog(CATALOG):
+        category_ids[name] = category_id
+        category_rows.append((category_id, name, category_ids.get(parent)))
+        if types:
+            leaves.append((category_id, types))
+        category_id += 1
+    _write_rows(db, Category.__table__, ("id", "name", "parent_id"), category_rows)
+
+    # Marketler
+    market_id = _next_id(db, Market)
+    market_specs = []
+    market_rows = []
+    for offset, market in enumerate(_generate_markets(rnd, markets)):
+        market_specs.append((market_id + offset, market["price_level"], market["coverage"]))
+        market_rows.append((
+            market_id + offset, market["name"], market["address"], market["open_hours"],
+            market["latitude"], market["longitude"]
+        ))
+    _write_rows(
+        db, Market.__table__, ("id", "name", "address", "open_hours", "latitude", "longitude"), market_rows
+    )
+    _sync_sequences(db, ("categories", "markets"))
+    db.commit()
+
+    first_product_id = _next_id(db, Product)
+    counts = {"products": 0, "product_details": 0, "price_history": 0}
+    history: List[HistoryRow] = []
+    for batch_start in range(0, products, product_batch):
+        batch = range(batch_start, min(products, batch_start + product_batch))
+        product_rows = []
+        link_rows = []
+        pending = []
+        for index in batch:
+            product_rnd = random.Random(seed * 1_000_003 + index)
+            leaf_id, types = product_rnd.choice(leaves)
+            type_name, sizes, (low, high), change_days = product_rnd.choice(types)
+            brand = product_rnd.choice(BRANDS)
+            variant = product_rnd.choice(VARIANTS)
+            size = product_rnd.choice(sizes)
+            product_id = first_product_id + index
+            product_rows.append((
+                product_id,
+                " ".join(part for part in (brand, variant, type_name, size) if part),
+                f"{type_name}, {size}",
+                brand,
+                ean13(f"869{product_id:09d}"),
+            ))
+            link_rows.append((product_id, leaf_id))
+            pending.append((product_id, product_rnd, product_rnd.uniform(low, high), change_days))
+        _write_rows(db, Product.__table__, ("id", "name", "description", "brand", "barcode"), product_rows)
+        _write_rows(db, product_category, ("product_id", "category_id"), link_rows)
+
+        detail_rows = []
+        for product_id, product_rnd, base, change_days in pending:
+            for market_id, price_level, coverage in market_specs:
+                if product_rnd.random() >= coverage:
+                    continue
+                current = base * price_level * product_rnd.lognormvariate(0, 0.05)
+                rows, price = _price_history(
+                    product_rnd, product_id, market_id, current, change_days, start, days, daily_inflation
+                )
+                history.extend(rows)
+                detail_rows.append((product_id, market_id, price, False))
+            if len(history) >= chunk_size:
+                _write_rows(db, PriceHistory.__table__, ("product_id", "market_id", "price", "created_at"), history)
+                counts["price_history"] += len(history)
+                history = []
+        _write_rows(db, ProductDetail.__table__, ("product_id", "market_id", "price", "is_favorite"), detail_rows)
+        _write_rows(db, PriceHistory.__table__, ("product_id", "market_id", "price", "created_at"), history)
+        counts["price_history"] += len(history)
+        history = []
+        counts["products"] += len(product_rows)
+        counts["product_details"] += len(detail_rows)
+        db.commit()
+        logger.info(
+            "Dataset: %d/%d products, %d price history rows", counts["products"], products, counts["price_history"]
+        )
+
+    _sync_sequences(db, ("products",))
+    db.commit()
+
+    elapsed = time.perf_counter() - start_time
+    report = {
+        "seed": seed,
+        "categories": len(category_rows),
+        "markets": len(market_rows),
+        **counts,
+        "history_from": start.isoformat(),
+        "elapsed_seconds": round(elapsed, 3),
+        "history_rows_per_second": round(counts["price_history"] / elapsed) if elapsed else None,
+    }
+    logger.info("Dataset generated: %s", report)
+    return report
@@ -0,0 +1,49 @@
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Olay adları
+PRICE_CHANGED = "price_changed"
+# Toplu yazmalar (ör. fiyat içe aktarma) dilim başına bir kez yayınlar;
+# yük: changes=[(product_id, market_id, price), ...]
+PRICES_CHANGED = "prices_changed"
+
+
+class EventBus:
+    """
+    Süreç içi, senkron olay yolu.
+
+    Yazma işlemleri commit'ten sonra olay yayınlar; abone olan işleyiciler
+    aynı istek içinde sırayla çağrılır. Bir işleyicinin hatası yazmayı geri
+    almaz, yalnızca loglanır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers: Dict[str, List[Callable[..., Any]]] = defaultdict(list)
+
+    def subscribe(self, event: str, handler: Callable[..., Any]) -> None:
+        with self._lock:
+            if handler not in self._handlers[event]:
+                self._handlers[event].append(handler)
+
+    def unsubscribe(self, event: str, handler: Callable[..., Any]) -> None:
+        with self._lock:
+            if handler in self._handlers[event]:
+                self._handlers[event].remove(handler)
+
+    def publish(self, event: str, **payload: Any) -> None:
+        with self._lock:
+            handlers = list(self._handlers.get(event, ()))
+        for handler in handlers:
+            try:
+                handler(**payload)
+            except Exception:
+                logger.exception("Event handler %r failed for %s", handler, event)
+
+
+# Süreç genelinde paylaşılan olay yolu
+event_bus = EventBus()
@@ -0,0 +1,146 @@
+from collections import namedtuple
+from typing import List, Dict, Any, Sequence
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.price_matrix import price_matrix
+
+# Liste kalemleri tek küçük sorguyla okunur; fiyatlar product_details yerine
+# süreç içi fiyat matrisinden gelir.
+LIST_ITEMS_QUERY = text("""
+    SELECT sli.id AS item_id,
+           sli.product_id AS product_id,
+           p.name AS product_name,
+           sli.quantity AS quantity
+    FROM shopping_list_items sli
+    JOIN products p ON sli.product_id = p.id
+    WHERE sli.shopping_list_id = :list_id
+    ORDER BY sli.id
+""")
+
+MARKET_NAMES_QUERY = text("SELECT id, name FROM markets WHERE id IN :ids").bindparams(
+    bindparam("ids", expanding=True)
+)
+
+ComparisonRow = namedtuple(
+    "ComparisonRow",
+    "market_id market_name product_id product_name price quantity total_products"
+)
+
+
+def market_names(db: Session, market_ids) -> Dict[int, str]:
+    """Marketlerin id -> ad eşlemesi; silinmiş marketler sonuçta yer almaz."""
+    market_ids = sorted(set(market_ids))
+    if not market_ids:
+        return {}
+    return dict(db.execute(MARKET_NAMES_QUERY, {"ids": market_ids}).all())
+
+
+def comparison_rows(db: Session, items: Sequence) -> List[ComparisonRow]:
+    """
+    Liste kalemlerini matristeki fiyatlarla eşleştir; satırlar market_id ve
+    kalem sırasına göre, eski tek sorgunun verdiği biçimde döner.
+    """
+    prices = price_matrix.get_product_prices(db, {item.product_id for item in items})
+    names = market_names(db, (market_id for row in prices.values() for market_id in row))
+    by_market: Dict[int, List[ComparisonRow]] = {market_id: [] for market_id in sorted(names)}
+    total_products = len(items)
+    for product_id, product_name, quantity in ((item.product_id, item.product_name, item.quantity) for item in items):
+        for market_id, price in prices.get(product_id, {}).items():
+            rows = by_market.get(market_id)
+            if rows is not None:
+                rows.append(ComparisonRow(
+                    market_id, names[market_id], product_id, product_name, price, quantity, total_products
+                ))
+    return [row for rows in by_market.values() for row in rows]
+
+
+def build_market_comparisons(rows) -> List[Dict[str, Any]]:
+    """
+    Karşılaştırma satırlarından market bazlı toplamları tek geçişte hesapla.
+
+    Satırlar market_id'ye göre sıralı gelir; her market için toplam fiyat,
+    bulunan/eksik ürün sayısı tutulur, sonuç toplam fiyata göre sıralanıp
+    sıra numarası (rank) verilir.
+    """
+    comparisons = []
+    current = None
+
+    for row in rows:
+        if current is None or current["market_id"] != row.market_id:
+            current = {
+                "market_id": row.market_id,
+                "market_name": row.market_name,
+                "total_price": 0.0,
+                "items": [],
+                "found_products": 0,
+                "missing_products": 0,
+                "total_products": row.total_products,
+            }
+            comparisons.append(current)
+
+        price = float(row.price)
+        quantity = row.quantity or 0
+        current["total_price"] += price * quantity
+        current["found_products"] += 1
+        current["items"].append({
+            "product_id": row.product_id,
+            "product_name": row.product_name,
+            "price": price,
+            "quantity": quantity
+        })
+
+    for comparison in comparisons:
+        comparison["missing_products"] = max(
+            comparison["total_products"] - comparison["found_products"], 0
+        )
+
+    # Eski davranışla uyumlu olarak toplam fiyata göre sırala,
+    # eşitlikte market_id sırayı sabitler.
+    comparisons.sort(key=lambda x: (x["total_price"], x["market_id"]))
+    for rank, comparison in enumerate(comparisons, start=1):
+        comparison["rank"] = rank
+
+    return comparisons
+
+
+def compare_markets(db: Session, shopping_list_id: int) -> List[Dict[str, Any]]:
+    """
+    Alışveriş listesi için market karşılaştırmasını hesapla: kalemler ve
+    market adları için iki küçük sorgu, fiyatlar fiyat matrisinden.
+    """
+    items = db.execute(LIST_ITEMS_QUERY, {"list_id": shopping_list_id}).all()
+    return build_market_comparisons(comparison_rows(db, items))
+
+
+async def compare_markets_async(db: AsyncSession, shopping_list_id: int) -> List[Dict[str, Any]]:
+    """compare_markets()'in AsyncSession karşılığı."""
+    return await db.run_sync(compare_markets, shopping_list_id)
+
+
+def list_items_with_unit_prices(
+    db: Session,
+    shopping_list_id: int,
+    comparisons: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Liste kalemlerini, birim fiyatı karşılaştırmadaki en düşük fiyat olacak
+    şekilde döndür; fiyatlar için ayrıca sorgu yapılmaz.
+    """
+    best_prices: Dict[int, float] = {}
+    for comparison in comparisons:
+        for item in comparison["items"]:
+            price = item["price"]
+            if price < best_prices.get(item["product_id"], float("inf")):
+                best_prices[item["product_id"]] = price
+
+    return [
+        {
+            "product_id": row.product_id,
+            "product_name": row.product_name,
+            "quantity": row.quantity or 0,
+            "unit_price": best_prices.get(row.product_id),
+        }
+        for row in db.execute(LIST_ITEMS_QUERY, {"list_id": shopping_list_id})
+    ]
@@ -0,0 +1,204 @@
+import base64
+import json
+from datetime import datetime, date
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """(sıralama anahtarı, id) değerlerini opak bir cursor'a çevir."""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+
+def _python_type(column) -> Optional[type]:
+    try:
+        return column.type.python_type
+    except (AttributeError, NotImplementedError):
+        return None
+
+
+def _nullable(column) -> bool:
+    return bool(getattr(column, "nullable", False))
+
+
+def _matches_column(value: Any, column) -> bool:
+    """Cursor'daki değer sütunun türüyle uyumlu mu (bool sayı sayılmaz)."""
+    if value is None:
+        return _nullable(column)
+    expected = _python_type(column)
+    if expected is None:
+        return True
+    if isinstance(value, bool):
+        return expected is bool
+    if expected is datetime:
+        return isinstance(value, datetime)
+    if expected is date:
+        return isinstance(value, date) and not isinstance(value, datetime)
+    if expected is float:
+        return isinstance(value, (int, float))
+    if expected is int:
+        return isinstance(value, int)
+    return isinstance(value, expected)
+
+
+def decode_cursor(cursor: str, sort_column=None, id_column=None) -> List[Any]:
+    """
+    Cursor'ı çöz; bozuksa 400 döndür. Sütunlar verilirse değer sayısı ve
+    türleri de doğrulanır: id bir tamsayı, sıralama değeri sütunun türünde
+    olmalıdır. Aksi halde veritabanı hatası (500) ya da sessizce yanlış
+    sayfa yerine 400 döner.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or not values:
+            raise ValueError("empty cursor")
+        values = [_decode_value(v) for v in values]
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+
+    if id_column is not None:
+        expected = 1 if sort_column is None or sort_column is id_column else 2
+        last_id = values[-1]
+        if len(values) != expected or isinstance(last_id, bool) or not isinstance(last_id, int):
+            raise _invalid_cursor()
+        if expected == 2 and not _matches_column(values[0], sort_column):
+            raise _invalid_cursor()
+    return values
+
+
+def _after(sort_column, id_column, last_key, last_id, descending):
+    """
+    (last_key, last_id) satırından sonra gelen satırların koşulu.
+
+    NULL sıralama değerleri en büyük değer sayılır (artan sırada NULLS LAST,
+    azalan sırada NULLS FIRST; PostgreSQL'in varsayılanı). `sütun < NULL`
+    hiçbir satırı seçmediği için NULL değerli cursor'lar IS NULL ile ayrıca
+    ele alınır.
+    """
+    if descending:
+        if last_key is None:
+            return or_(sort_column.isnot(None), and_(sort_column.is_(None), id_column < last_id))
+        return or_(sort_column < last_key, and_(sort_column == last_key, id_column < last_id))
+    if last_key is None:
+        return and_(sort_column.is_(None), id_column > last_id)
+    condition = or_(sort_column > last_key, and_(sort_column == last_key, id_column > last_id))
+    if _nullable(sort_column):
+        condition = or_(condition, sort_column.is_(None))
+    return condition
+
+
+def _keyset(query, sort_column, id_column, limit, cursor, skip, descending):
+    single_key = sort_column is id_column
+    if single_key:
+        order = [id_column.desc() if descending else id_column.asc()]
+    else:
+        key = sort_column.desc() if descending else sort_column.asc()
+        if _nullable(sort_column):
+            # SQLite NULL'ları en küçük sayar; sıra, cursor koşuluyla aynı olsun
+            key = key.nulls_first() if descending else key.nulls_last()
+        order = [key, id_column.desc() if descending else id_column.asc()]
+    query = query.order_by(*order)
+
+    if cursor:
+        values = decode_cursor(cursor, sort_column, id_column)
+        last_id = values[-1]
+        if single_key:
+            condition = id_column < last_id if descending else id_column > last_id
+        else:
+            condition = _after(sort_column, id_column, values[0], last_id, descending)
+        query = query.filter(condition)
+    elif skip:
+        query = query.offset(skip)
+
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def _next_cursor(items: List[Any], sort_column, id_column, limit: Optional[int]) -> Optional[str]:
+    if not limit or len(items) != limit:
+        return None
+    last = items[-1]
+    if sort_column is id_column:
+        return encode_cursor(getattr(last, id_column.key))
+    return encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+
+def paginate(
+    query,
+    *,
+    sort_column,
+    id_column,
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    descending: bool = False
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Sorguyu (sort_column, id_column) sırasına göre sayfala.
+
+    cursor verilirse keyset (seek) yöntemi kullanılır; böylece derin
+    sayfalar OFFSET gibi yavaşlamaz. cursor yoksa eski skip/limit davranışı
+    aynı sıralamayla korunur. Sayfa doluysa bir sonraki sayfanın cursor'ı da
+    döner; limit None ise tüm sonuçlar döner.
+    """
+    items = _keyset(query, sort_column, id_column, limit, cursor, skip, descending).all()
+    return items, _next_cursor(items, sort_column, id_column, limit)
+
+
+async def paginate_async(
+    db,
+    statement,
+    *,
+    sort_column,
+    id_column,
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    descending: bool = False,
+    scalars: bool = True
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    paginate() ile aynı; `select()` ifadesini AsyncSession üzerinde çalıştırır.
+    scalars=False ise sütun seçen ifadelerin satırları (Row) döner.
+    """
+    statement = _keyset(statement, sort_column, id_column, limit, cursor, skip, descending)
+    result = await db.execute(statement)
+    items = result.scalars().unique().all() if scalars else result.all()
+    return items, _next_cursor(items, sort_column, id_column, limit)
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """Bir sonraki sayfanın cursor'ını yanıt başlığına yaz."""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
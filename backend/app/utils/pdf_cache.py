@@ -0,0 +1,210 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, IO, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Şablon değişirse eski PDF'lerin kullanılmaması için anahtara katılır
+RENDER_VERSION = "1"
+
+
+def export_cache_key(title: str, items: List[Dict[str, Any]], market_comparisons: List[Dict[str, Any]]) -> str:
+    """
+    PDF'in içeriğini belirleyen her şeyin özeti: liste adı, kalemler ve
+    adetleri, marketlerdeki product_details fiyatları.
+
+    Kalem veya fiyat değiştiğinde anahtar da değişir; bu yüzden önbellek
+    ayrıca geçersiz kılınmak zorunda değildir.
+    """
+    payload = {
+        "v": RENDER_VERSION,
+        "title": title,
+        "items": [[i["product_id"], i["product_name"], i["quantity"], i["unit_price"]] for i in items],
+        "markets": [
+            [
+                c["market_id"],
+                c["market_name"],
+                [[i["product_id"], i["price"], i["quantity"]] for i in c["items"]],
+            ]
+            for c in market_comparisons
+        ],
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class PdfCache:
+    """
+    Üretilmiş PDF'ler için disk üzerinde, toplam boyutu sınırlı LRU önbellek.
+
+    Dosyalar listeye ait olarak `<liste id>-<anahtar>.pdf` (liste verilmezse
+    `<anahtar>.pdf`) adıyla saklanır. İçerik özeti farklı listelerde aynı
+    çıkabilir; liste id'si dosya adında olduğundan bir listenin eski PDF'ini
+    silmek başka bir listenin dosyasına dokunmaz. Süreç yeniden başladığında
+    dizin taranır: erişim sırası dosya zamanlarından, liste -> dosya eşlemesi
+    dosya adlarından kurulur. Bir liste için yeni bir anahtar üretildiğinde
+    aynı listenin eski PDF'i hemen silinir.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self._lock = threading.Lock()
+        self._directory = directory or settings.PDF_CACHE_DIR or os.path.join(
+            tempfile.gettempdir(), "market-pdf-cache"
+        )
+        self._max_bytes = settings.PDF_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._list_keys: Dict[int, str] = {}
+        self._total_bytes = 0
+        self._scanned = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}.pdf")
+
+    @staticmethod
+    def _entry_key(key: str, shopping_list_id: Optional[int]) -> str:
+        return key if shopping_list_id is None else f"{shopping_list_id}-{key}"
+
+    @staticmethod
+    def _owner(entry: str) -> Optional[int]:
+        owner, separator, _ = entry.partition("-")
+        return int(owner) if separator and owner.isdigit() else None
+
+    def _scan(self) -> None:
+        if self._scanned:
+            return
+        os.makedirs(self._directory, exist_ok=True)
+        found = []
+        for name in os.listdir(self._directory):
+            if not name.endswith(".pdf"):
+                continue
+            path = os.path.join(self._directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            found.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+            owner = self._owner(key)
+            if owner is not None:
+                # Dosyalar eskiden yeniye gezilir; listenin son PDF'i kalır
+                previous = self._list_keys.get(owner)
+                if previous is not None:
+                    self._remove(previous)
+                self._list_keys[owner] = key
+        self._scanned = True
+        self._evict()
+
+    def _remove(self, key: str) -> None:
+        size = self._entries.pop(key, None)
+        if size is None:
+            return
+        self._total_bytes -= size
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        while self._total_bytes > self._max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def open(self, key: str, shopping_list_id: Optional[int] = None) -> Optional[IO[bytes]]:
+        """Önbellekteki PDF'i okumak için aç; yoksa None."""
+        key = self._entry_key(key, shopping_list_id)
+        with self._lock:
+            self._scan()
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            try:
+                # Açık dosya, sonradan silinse de okunabilir
+                handle = open(self._path(key), "rb")
+            except OSError:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if shopping_list_id is not None:
+                self._list_keys[shopping_list_id] = key
+            self.hits += 1
+            return handle
+
+    def store(self, key: str, source: IO[bytes], shopping_list_id: Optional[int] = None) -> None:
+        """Üretilmiş PDF'i önbelleğe kopyala; kaynak dosyanın konumu korunur."""
+        key = self._entry_key(key, shopping_list_id)
+        with self._lock:
+            self._scan()
+            if key in self._entries:
+                return
+            position = source.tell()
+            source.seek(0)
+            fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as target:
+                    shutil.copyfileobj(source, target)
+                size = os.path.getsize(tmp_path)
+                if size > self._max_bytes:
+                    os.remove(tmp_path)
+                    return
+                os.replace(tmp_path, self._path(key))
+            except OSError:
+                logger.warning("Could not write PDF cache entry %s", key, exc_info=True)
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+            finally:
+                source.seek(position)
+
+            self._entries[key] = size
+            self._total_bytes += size
+            if shopping_list_id is not None:
+                previous = self._list_keys.get(shopping_list_id)
+                if previous and previous != key:
+                    self._remove(previous)
+                self._list_keys[shopping_list_id] = key
+            self._evict()
+
+    def invalidate_list(self, shopping_list_id: int) -> None:
+        """Bir listenin son PDF'ini sil (ör. liste silindiğinde)."""
+        with self._lock:
+            self._scan()
+            key = self._list_keys.pop(shopping_list_id, None)
+            if key:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scan()
+            for key in list(self._entries):
+                self._remove(key)
+            self._list_keys.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Süreç genelinde paylaşılan önbellek
+pdf_cache = PdfCache()
@@ -3,125 +3,161 @@ from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from io import BytesIO
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+from typing import List, Dict, Any, Iterator, IO
 
-def generate_shopping_list_pdf(shopping_list: Any, market_comparisons: List[Dict[str, Any]]) -> bytes:
-    """
-    Alışveriş listesini PDF formatında oluştur.
-    """
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    elements = []
+from app.core.config import settings
 
-    # Başlık
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30
-    )
-    elements.append(Paragraph(shopping_list.name, title_style))
-    elements.append(Spacer(1, 20))
+# Bir sayfaya sığan tablo satırı sayısı. Uzun tablolar bu boyda parçalara
+# bölünür; ReportLab'ın büyük tabloları sayfa sayfa bölmesi satır sayısıyla
+# karesel yavaşlar ve tüm tabloyu bellekte tutar.
+ROWS_PER_TABLE = 40
 
-    # Ürün Listesi
-    elements.append(Paragraph("Ürün Listesi", styles['Heading2']))
-    elements.append(Spacer(1, 10))
+STREAM_CHUNK_SIZE = 64 * 1024
 
-    # Ürün tablosu
-    product_data = [['Ürün', 'Adet', 'Birim Fiyat', 'Toplam']]
-    for item in shopping_list.items:
-        product_data.append([
-            item.product.name,
-            str(item.quantity),
-            f"{item.product.details[0].price:.2f} TL",
-            f"{(item.product.details[0].price * item.quantity):.2f} TL"
-        ])
-
-    product_table = Table(product_data, colWidths=[3*inch, 1*inch, 1.5*inch, 1.5*inch])
-    product_table.setStyle(TableStyle([
+# Stil nesneleri modül yüklenirken bir kez oluşturulur ve tüm tablolarda
+# paylaşılır.
+_styles = getSampleStyleSheet()
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_styles['Heading1'],
+    fontSize=24,
+    spaceAfter=30
+)
+HEADING2_STYLE = _styles['Heading2']
+HEADING3_STYLE = _styles['Heading3']
+
+
+def _table_style(header_font_size: int, body_font_size: int) -> TableStyle:
+    return TableStyle([
         ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
         ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
         ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
         ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('FONTSIZE', (0, 0), (-1, 0), header_font_size),
         ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
         ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
         ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
         ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 12),
+        ('FONTSIZE', (0, 1), (-1, -1), body_font_size),
         ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    elements.append(product_table)
+    ])
+
+
+SUMMARY_TABLE_STYLE = _table_style(14, 12)
+MARKET_ITEMS_TABLE_STYLE = _table_style(12, 10)
+
+ITEM_HEADER = ['Ürün', 'Adet', 'Birim Fiyat', 'Toplam']
+ITEM_COL_WIDTHS = [3*inch, 1*inch, 1.5*inch, 1.5*inch]
+MARKET_HEADER = ['Market', 'Toplam Fiyat', 'Tasarruf']
+MARKET_COL_WIDTHS = [3*inch, 1.5*inch, 1.5*inch]
+
+# PDF üretimi CPU yoğun; eşzamanlı üretim sayısını sınırlayan ayrı havuz
+pdf_executor = ThreadPoolExecutor(
+    max_workers=settings.PDF_EXPORT_WORKERS,
+    thread_name_prefix="pdf-export"
+)
+
+
+def _chunked_tables(header, rows, col_widths, style) -> Iterator[Table]:
+    """Satırları sayfa boyunda, başlığı tekrarlanan tablolara böl."""
+    for start in range(0, max(len(rows), 1), ROWS_PER_TABLE):
+        table = Table([header] + rows[start:start + ROWS_PER_TABLE], colWidths=col_widths)
+        table.setStyle(style)
+        yield table
+
+
+def _item_row(name: str, quantity: int, price: float) -> List[str]:
+    return [name, str(quantity), f"{price:.2f} TL", f"{(price * quantity):.2f} TL"]
+
+
+def render_shopping_list_pdf(
+    output: IO[bytes],
+    title: str,
+    items: List[Dict[str, Any]],
+    market_comparisons: List[Dict[str, Any]]
+) -> None:
+    """
+    Alışveriş listesi PDF'ini verilen dosya nesnesine yaz.
+
+    items, (product_name, quantity, unit_price) anahtarlı sözlüklerdir;
+    market tabloları önceden hesaplanmış tek bir karşılaştırma sonucundan
+    üretilir, veritabanına erişilmez.
+    """
+    doc = SimpleDocTemplate(output, pagesize=letter)
+    elements = []
+
+    # Başlık
+    elements.append(Paragraph(title, TITLE_STYLE))
+    elements.append(Spacer(1, 20))
+
+    # Ürün Listesi
+    elements.append(Paragraph("Ürün Listesi", HEADING2_STYLE))
+    elements.append(Spacer(1, 10))
+    product_rows = [
+        _item_row(item['product_name'], item['quantity'], item['unit_price'] or 0.0)
+        for item in items
+    ]
+    elements.extend(_chunked_tables(ITEM_HEADER, product_rows, ITEM_COL_WIDTHS, SUMMARY_TABLE_STYLE))
     elements.append(Spacer(1, 30))
 
     # Market Karşılaştırması
-    elements.append(Paragraph("Market Karşılaştırması", styles['Heading2']))
+    elements.append(Paragraph("Market Karşılaştırması", HEADING2_STYLE))
     elements.append(Spacer(1, 10))
-
-    # Market karşılaştırma tablosu
-    market_data = [['Market', 'Toplam Fiyat', 'Tasarruf']]
     base_price = market_comparisons[0]['total_price'] if market_comparisons else 0
-    
-    for comparison in market_comparisons:
-        savings = base_price - comparison['total_price']
-        market_data.append([
+    market_rows = [
+        [
             comparison['market_name'],
             f"{comparison['total_price']:.2f} TL",
-            f"{savings:.2f} TL"
-        ])
-
-    market_table = Table(market_data, colWidths=[3*inch, 1.5*inch, 1.5*inch])
-    market_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 14),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    elements.append(market_table)
+            f"{(base_price - comparison['total_price']):.2f} TL"
+        ]
+        for comparison in market_comparisons
+    ]
+    elements.extend(_chunked_tables(MARKET_HEADER, market_rows, MARKET_COL_WIDTHS, SUMMARY_TABLE_STYLE))
     elements.append(Spacer(1, 30))
 
     # Her market için detaylı ürün listesi
     for comparison in market_comparisons:
-        elements.append(Paragraph(f"{comparison['market_name']} - Ürün Listesi", styles['Heading3']))
+        elements.append(Paragraph(f"{comparison['market_name']} - Ürün Listesi", HEADING3_STYLE))
         elements.append(Spacer(1, 10))
-
-        market_items_data = [['Ürün', 'Adet', 'Birim Fiyat', 'Toplam']]
-        for item in comparison['items']:
-            market_items_data.append([
-                item['product_name'],
-                str(item['quantity']),
-                f"{item['price']:.2f} TL",
-                f"{(item['price'] * item['quantity']):.2f} TL"
-            ])
-
-        market_items_table = Table(market_items_data, colWidths=[3*inch, 1*inch, 1.5*inch, 1.5*inch])
-        market_items_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        elements.append(market_items_table)
+        rows = [
+            _item_row(item['product_name'], item['quantity'], item['price'])
+            for item in comparison['items']
+        ]
+        elements.extend(_chunked_tables(ITEM_HEADER, rows, ITEM_COL_WIDTHS, MARKET_ITEMS_TABLE_STYLE))
         elements.append(Spacer(1, 20))
 
-    # PDF oluştur
     doc.build(elements)
-    pdf = buffer.getvalue()
-    buffer.close()
-    return pdf 
\ No newline at end of file
+
+
+def render_to_spool(
+    title: str,
+    items: List[Dict[str, Any]],
+    market_comparisons: List[Dict[str, Any]]
+) -> SpooledTemporaryFile:
+    """
+    PDF'i bellek eşiğini aşınca diske taşan geçici bir dosyaya üret.
+
+    Dönen dosya başa sarılmıştır; kapatmak çağırana aittir.
+    """
+    spool = SpooledTemporaryFile(max_size=settings.PDF_SPOOL_MAX_MEMORY)
+    try:
+        render_shopping_list_pdf(spool, title, items, market_comparisons)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def iter_file(spool: IO[bytes], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Üretilmiş PDF'i parça parça oku ve iş bitince dosyayı kapat."""
+    try:
+        while True:
+            chunk = spool.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        spool.close()
@@ -0,0 +1,113 @@
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Float, Integer, func, insert, literal, select, text, true
+from sqlalchemy.orm import Session
+
+from app.models.price_history import PriceHistory
+from app.utils.price_rollups import apply_samples, rebuild_product_rollups
+
+logger = logging.getLogger(__name__)
+
+# Bir ürün aralığında, önceki kayıtla aynı fiyatı taşıyan satırlar
+REDUNDANT_ROWS = """
+    SELECT id FROM (
+        SELECT id,
+               price,
+               LAG(price) OVER (
+                   PARTITION BY product_id, market_id
+                   ORDER BY created_at, id
+               ) AS previous_price
+        FROM price_history
+        WHERE product_id BETWEEN :first_id AND :last_id
+    ) ordered
+    WHERE previous_price = price
+"""
+
+def _latest_price(product_id: int, market_id: int):
+    """(ürün, market) çiftinin son fiyatı; indeksli tek satırlık alt sorgu."""
+    return (
+        select(PriceHistory.price)
+        .where(PriceHistory.product_id == product_id, PriceHistory.market_id == market_id)
+        .order_by(PriceHistory.created_at.desc(), PriceHistory.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def record_price(
+    db: Session,
+    product_id: int,
+    market_id: int,
+    price: float,
+    created_at: Optional[datetime] = None
+) -> Optional[PriceHistory]:
+    """
+    Fiyat son kayıtlı fiyattan farklıysa price_history'ye satır ekle.
+
+    Karşılaştırma ve ekleme tek bir koşullu INSERT ... SELECT'tir; karar
+    veritabanındaki son satıra göre verilir. Böylece başka bir işçinin,
+    CLI yüklemesinin veya aynı transaction'ın daha önce yazdığı fiyatlar da
+    görülür. Satır commit edilmez; fiyat değişmemişse None döner. Gün/hafta/ay
+    rollup'ları yalnızca satır eklendiyse aynı transaction içinde güncellenir.
+    """
+    latest = _latest_price(product_id, market_id)
+    statement = (
+        insert(PriceHistory)
+        .from_select(
+            ["product_id", "market_id", "price", "created_at"],
+            select(
+                literal(product_id, Integer),
+                literal(market_id, Integer),
+                literal(price, Float),
+                literal(created_at, PriceHistory.created_at.type) if created_at is not None else func.now(),
+            ).where(func.coalesce(latest != price, true()))
+        )
+        .returning(PriceHistory.id)
+    )
+    inserted_id = db.execute(statement).scalar()
+    if inserted_id is None:
+        return None
+
+    apply_samples(db, [(product_id, market_id, price, created_at or datetime.utcnow())])
+    return db.get(PriceHistory, inserted_id)
+
+
+def compact_price_history(db: Session, products_per_batch: int = 1000, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Mevcut price_history'de aynı fiyatın ardışık tekrarlarını tek satıra indir.
+
+    Her (ürün, market) için fiyatın değiştiği ilk satır korunur; ürün id
+    aralıkları halinde ilerlenir ve her aralık ayrı commit edilir. Satır
+    silinen aralığın rollup kovaları aynı transaction'da yeniden hesaplanır;
+    sample_count/sum_price silinen satırları saymaya devam etmez.
+    """
+    start = time.perf_counter()
+    bounds = db.execute(text("SELECT MIN(product_id), MAX(product_id) FROM price_history")).one()
+    report = {"batches": 0, "rows_deleted": 0, "rollup_buckets": 0, "dry_run": dry_run}
+
+    if bounds[0] is not None:
+        for first_id in range(bounds[0], bounds[1] + 1, products_per_batch):
+            params = {"first_id": first_id, "last_id": first_id + products_per_batch - 1}
+            if dry_run:
+                deleted = db.execute(text(f"SELECT COUNT(*) FROM ({REDUNDANT_ROWS}) redundant"), params).scalar()
+            else:
+                deleted = db.execute(
+                    text(f"DELETE FROM price_history WHERE id IN ({REDUNDANT_ROWS})"), params
+                ).rowcount
+                if deleted:
+                    report["rollup_buckets"] += rebuild_product_rollups(
+                        db, params["first_id"], params["last_id"]
+                    )
+                db.commit()
+            report["batches"] += 1
+            report["rows_deleted"] += deleted
+
+    report["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+    logger.info(
+        "Price history compaction: %d redundant rows in %d batches%s",
+        report["rows_deleted"], report["batches"], " (dry run)" if dry_run else ""
+    )
+    return report
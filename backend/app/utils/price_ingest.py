@@ -0,0 +1,299 @@
+import csv
+import io
+import json
+import logging
+import math
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.utils.events import event_bus, PRICES_CHANGED
+from app.utils.price_matrix import price_matrix
+from app.utils.price_rollups import apply_samples
+from app.utils.price_summary import refresh_price_summaries
+from app.utils.product_similarity import queue_similarity_refresh_many
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10_000
+MAX_REPORTED_ERRORS = 50
+FORMATS = ("csv", "ndjson")
+
+# (seq, product_id, market_id, price); seq aynı anahtarın son satırını seçmek için
+Row = Tuple[int, int, int, float]
+
+# --- PostgreSQL: COPY + INSERT ... ON CONFLICT ------------------------------
+
+PG_STAGING_DDL = text("""
+    CREATE TEMP TABLE IF NOT EXISTS price_ingest_staging (
+        seq BIGINT,
+        product_id INTEGER,
+        market_id INTEGER,
+        price DOUBLE PRECISION
+    ) ON COMMIT DELETE ROWS
+""")
+
+PG_UPSERT = text("""
+    WITH latest AS (
+        SELECT DISTINCT ON (s.product_id, s.market_id) s.product_id, s.market_id, s.price
+        FROM price_ingest_staging s
+        JOIN products p ON p.id = s.product_id
+        JOIN markets m ON m.id = s.market_id
+        ORDER BY s.product_id, s.market_id, s.seq DESC
+    ),
+    upserted AS (
+        INSERT INTO product_details (product_id, market_id, price, created_at)
+        SELECT product_id, market_id, price, now() FROM latest
+        ON CONFLICT (product_id, market_id) DO UPDATE
+            SET price = EXCLUDED.price, updated_at = now()
+            WHERE product_details.price IS DISTINCT FROM EXCLUDED.price
+        RETURNING product_id, market_id, price, (xmax = 0) AS inserted
+    ),
+    history AS (
+        INSERT INTO price_history (product_id, market_id, price, created_at)
+        SELECT product_id, market_id, price, now() FROM upserted
+    )
+    SELECT product_id, market_id, price, inserted,
+           (SELECT count(*) FROM latest) AS matched
+    FROM upserted
+""")
+
+# --- Diğer veritabanları: executemany --------------------------------------
+
+UPSERT_STATEMENT = text("""
+    INSERT INTO product_details (product_id, market_id, price, created_at)
+    VALUES (:product_id, :market_id, :price, CURRENT_TIMESTAMP)
+    ON CONFLICT (product_id, market_id) DO UPDATE
+        SET price = excluded.price, updated_at = CURRENT_TIMESTAMP
+""")
+
+HISTORY_STATEMENT = text("""
+    INSERT INTO price_history (product_id, market_id, price, created_at)
+    VALUES (:product_id, :market_id, :price, CURRENT_TIMESTAMP)
+""")
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    """Dosya adı veya içerik tipinden csv/ndjson biçimini tahmin et."""
+    name = (filename or "").lower()
+    content_type = (content_type or "").lower()
+    if name.endswith((".ndjson", ".jsonl", ".json")) or "json" in content_type:
+        return "ndjson"
+    return "csv"
+
+
+def iter_records(stream: Iterable[str], fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Satırları (satır numarası, kayıt) olarak akış halinde oku.
+
+    CSV'de başlık satırı zorunludur (product_id, market_id, price); NDJSON'da
+    her satır bir JSON nesnesidir. Çözümlenemeyen satırlar kayıt yerine
+    ValueError olarak döner ve doğrulamada reddedilir.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == "ndjson":
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except ValueError as exc:
+                yield line_no, exc
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def validate_chunk(records: List[Tuple[int, Any]]) -> Tuple[List[Row], List[Dict[str, Any]]]:
+    """Bir dilimi doğrula; geçerli satırlar ve hatalar ayrı döner."""
+    rows: List[Row] = []
+    errors: List[Dict[str, Any]] = []
+    for line_no, record in records:
+        if isinstance(record, Exception):
+            errors.append({"line": line_no, "error": f"invalid JSON: {record}"})
+            continue
+        if not isinstance(record, dict):
+            errors.append({"line": line_no, "error": "record must be an object"})
+            continue
+        try:
+            product_id = int(record["product_id"])
+            market_id = int(record["market_id"])
+            price = float(record["price"])
+        except KeyError as exc:
+            errors.append({"line": line_no, "error": f"missing field {exc.args[0]}"})
+            continue
+        except (TypeError, ValueError) as exc:
+            errors.append({"line": line_no, "error": str(exc)})
+            continue
+        if product_id <= 0 or market_id <= 0:
+            errors.append({"line": line_no, "error": "ids must be positive"})
+            continue
+        if not math.isfinite(price) or price < 0:
+            errors.append({"line": line_no, "error": "price must be a non-negative number"})
+            continue
+        rows.append((line_no, product_id, market_id, price))
+    return rows, errors
+
+
+def _upsert_postgres(db: Session, rows: List[Row]) -> Tuple[List[Tuple[int, int, float, bool]], int]:
+    db.execute(PG_STAGING_DDL)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(rows)
+    buffer.seek(0)
+
+    dbapi_connection = db.connection().connection.dbapi_connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(
+            "COPY price_ingest_staging (seq, product_id, market_id, price) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+    result = db.execute(PG_UPSERT).all()
+    changes = [(r.product_id, r.market_id, r.price, r.inserted) for r in result]
+    if result:
+        matched = result[0].matched
+    else:
+        matched = db.execute(text("""
+            SELECT count(DISTINCT (s.product_id, s.market_id))
+            FROM price_ingest_staging s
+            JOIN products p ON p.id = s.product_id
+            JOIN markets m ON m.id = s.market_id
+        """)).scalar()
+    return changes, matched
+
+
+def _existing_ids(db: Session, table: str, ids) -> set:
+    if not ids:
+        return set()
+    statement = text(f"SELECT id FROM {table} WHERE id IN ({', '.join(str(int(i)) for i in ids)})")
+    return {row[0] for row in db.execute(statement)}
+
+
+def _upsert_generic(db: Session, rows: List[Row]) -> Tuple[List[Tuple[int, int, float, bool]], int]:
+    # Aynı dilimde tekrarlanan anahtarlar için son satır geçerlidir
+    latest: Dict[Tuple[int, int], float] = {}
+    for _, product_id, market_id, price in rows:
+        latest[(product_id, market_id)] = price
+
+    products = _existing_ids(db, "products", {key[0] for key in latest})
+    markets = _existing_ids(db, "markets", {key[1] for key in latest})
+    latest = {key: price for key, price in latest.items() if key[0] in products and key[1] in markets}
+    if not latest:
+        return [], 0
+
+    current: Dict[Tuple[int, int], float] = {}
+    product_ids = sorted({key[0] for key in latest})
+    for start in range(0, len(product_ids), 500):
+        ids = ", ".join(str(i) for i in product_ids[start:start + 500])
+        for product_id, market_id, price in db.execute(text(
+            f"SELECT product_id, market_id, price FROM product_details WHERE product_id IN ({ids})"
+        )):
+            current[(product_id, market_id)] = price
+
+    changes = [
+        (product_id, market_id, price, (product_id, market_id) not in current)
+        for (product_id, market_id), price in latest.items()
+        if current.get((product_id, market_id)) != price
+    ]
+    if changes:
+        params = [
+            {"product_id": product_id, "market_id": market_id, "price": price}
+            for product_id, market_id, price, _ in changes
+        ]
+        db.execute(UPSERT_STATEMENT, params)
+        db.execute(HISTORY_STATEMENT, params)
+    return changes, len(latest)
+
+
+def ingest_chunk(db: Session, rows: List[Row]) -> Dict[str, int]:
+    """
+    Doğrulanmış bir dilimi product_details'e yaz, değişen fiyatları
+    price_history'ye, rollup'lara ve ürün fiyat özetine işle; hepsi aynı
+    transaction'da commit edilir.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        changes, matched = _upsert_postgres(db, rows)
+    else:
+        changes, matched = _upsert_generic(db, rows)
+    now = datetime.utcnow()
+    apply_samples(db, [(product_id, market_id, price, now) for product_id, market_id, price, _ in changes])
+    refresh_price_summaries(db, {product_id for product_id, _, _, _ in changes})
+    queue_similarity_refresh_many(db, (product_id for product_id, _, _, _ in changes))
+    db.commit()
+    price_matrix.set_prices((product_id, market_id, price) for product_id, market_id, price, _ in changes)
+
+    if changes:
+        # Dilim başına tek olay: önbellek tek seferde düşürülür, alarmlar tek sorguyla kontrol edilir
+        event_bus.publish(
+            PRICES_CHANGED, db=db,
+            changes=[(product_id, market_id, price) for product_id, market_id, price, _ in changes]
+        )
+
+    inserted = sum(1 for change in changes if change[3])
+    return {
+        "inserted": inserted,
+        "updated": len(changes) - inserted,
+        "unchanged": matched - len(changes),
+        "unknown_keys": len({(r[1], r[2]) for r in rows}) - matched,
+        "history_rows": len(changes),
+    }
+
+
+def ingest_prices(
+    db: Session,
+    stream: Iterable[str],
+    fmt: str = "csv",
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    CSV/NDJSON fiyat akışını dilim dilim doğrulayıp toplu olarak yükle.
+
+    Her dilim kendi transaction'ında işlenir; hatalı satırlar reddedilir ve
+    raporlanır, yüklemenin geri kalanını durdurmaz.
+    """
+    start = time.perf_counter()
+    report: Dict[str, Any] = {
+        "format": fmt,
+        "chunks": 0,
+        "rows_read": 0,
+        "rows_rejected": 0,
+        "inserted": 0,
+        "updated": 0,
+        "unchanged": 0,
+        "unknown_keys": 0,
+        "history_rows": 0,
+        "errors": [],
+    }
+
+    records = iter_records(stream, fmt)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        rows, errors = validate_chunk(chunk)
+        report["chunks"] += 1
+        report["rows_read"] += len(chunk)
+        report["rows_rejected"] += len(errors)
+        room = MAX_REPORTED_ERRORS - len(report["errors"])
+        if room > 0:
+            report["errors"].extend(errors[:room])
+        if rows:
+            for key, value in ingest_chunk(db, rows).items():
+                report[key] += value
+
+    elapsed = time.perf_counter() - start
+    report["elapsed_seconds"] = round(elapsed, 3)
+    report["rows_per_second"] = round(report["rows_read"] / elapsed, 1) if elapsed else 0.0
+    logger.info(
+        "Price ingest: %d rows, %d inserted, %d updated, %d rejected (%.1f rows/s)",
+        report["rows_read"], report["inserted"], report["updated"],
+        report["rows_rejected"], report["rows_per_second"]
+    )
+    return report
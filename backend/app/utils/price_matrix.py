@@ -0,0 +1,321 @@
+import logging
+import math
+import sys
+import threading
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MISSING = float("nan")
+
+LOAD_QUERY = text("SELECT product_id, market_id, price FROM product_details")
+# Başka süreçlerin yazmalarını fark etmek için ucuz bir tablo imzası; ham SQL
+# ile updated_at'e dokunmadan yapılan fiyat güncellemeleri SUM(price)'a yansır
+SIGNATURE_QUERY = text("SELECT COUNT(*), MAX(id), MAX(updated_at), SUM(price) FROM product_details")
+
+
+class PriceMatrix:
+    """
+    Süreç içi (process-local) ürün × market fiyat matrisi.
+
+    Ürün ve market id'leri sıkı (dense) satır/sütun indekslerine eşlenir,
+    fiyatlar tek bir `array('d')` içinde satır satır tutulur; fiyatı olmayan
+    hücreler NaN'dır. Matris ilk kullanımda tek sorguyla yüklenir.
+
+    Bu süreçteki yazmalar commit'ten sonra hücre hücre uygulanır. Başka
+    süreçlerin yazmaları için product_details imzası en fazla
+    PRICE_MATRIX_CHECK_SECONDS'ta bir okunur; imza değişmişse matris arka
+    planda yeniden yüklenir. Yükleme sürerken gelen yazmalar kaydedilip yeni
+    matrise uygulanır, böylece takas bunları geri almaz.
+    """
+
+    def __init__(self, column_headroom: int = 8):
+        self._lock = threading.RLock()
+        self._column_headroom = column_headroom
+        self._signature = None
+        self._checked_at: Optional[float] = None
+        self._pending: Optional[List[Tuple]] = None
+        self._reset()
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.updates = 0
+
+    def _reset(self) -> None:
+        self._loaded = False
+        self._product_index: Dict[int, int] = {}
+        self._market_index: Dict[int, int] = {}
+        self._market_ids: List[int] = []
+        self._stride = 0
+        self._prices = array("d")
+
+    # --- Yükleme ------------------------------------------------------------
+
+    def _fill(self, rows: Iterable[Tuple[int, int, float]]) -> None:
+        rows = [row for row in rows if row[0] is not None and row[1] is not None and row[2] is not None]
+        self._reset()
+        self._market_ids = sorted({market_id for _, market_id, _ in rows})
+        self._market_index = {market_id: col for col, market_id in enumerate(self._market_ids)}
+        self._stride = len(self._market_ids) + self._column_headroom
+        for product_id, market_id, price in rows:
+            offset = self._offset(product_id, market_id, create=True)
+            self._prices[offset] = float(price)
+        self._loaded = True
+
+    def _swap(self, fresh: "PriceMatrix", signature) -> None:
+        # Kilit çağıranda; yükleme sırasında gelen yazmalar yeni matrise uygulanır
+        for operation, *args in self._pending or ():
+            getattr(fresh, operation)(*args)
+        self._pending = None
+        self._product_index = fresh._product_index
+        self._market_index = fresh._market_index
+        self._market_ids = fresh._market_ids
+        self._stride = fresh._stride
+        self._prices = fresh._prices
+        self._loaded = True
+        self._signature = signature
+        self.loads += 1
+
+    def load(self, db: Session) -> None:
+        """Tüm product_details fiyatlarını tek sorguyla yükle."""
+        with self._lock:
+            self._pending = []
+        try:
+            signature = tuple(db.execute(SIGNATURE_QUERY).one())
+            fresh = PriceMatrix(self._column_headroom)
+            fresh._fill(db.execute(LOAD_QUERY).fetchall())
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            self._swap(fresh, signature)
+            self._checked_at = time.monotonic()
+
+    def ensure_loaded(self, db: Session) -> None:
+        """
+        İlk kullanımda yükle; sonrasında imzayı aralıklı kontrol edip
+        değişmişse arka planda yeniden yükle.
+        """
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self.load(db)
+            return
+        interval = settings.PRICE_MATRIX_CHECK_SECONDS
+        if not interval or time.monotonic() - (self._checked_at or 0.0) < interval:
+            return
+        with self._lock:
+            if self._pending is not None or time.monotonic() - (self._checked_at or 0.0) < interval:
+                return
+            self._checked_at = time.monotonic()
+        signature = tuple(db.execute(SIGNATURE_QUERY).one())
+        if signature == self._signature:
+            return
+        with self._lock:
+            if self._pending is not None:
+                return
+            self._pending = []
+        threading.Thread(
+            target=self._reload, args=(db.get_bind(),), name="price-matrix-reload", daemon=True
+        ).start()
+
+    def _reload(self, bind) -> None:
+        try:
+            with Session(bind=bind) as db:
+                signature = tuple(db.execute(SIGNATURE_QUERY).one())
+                fresh = PriceMatrix(self._column_headroom)
+                fresh._fill(db.execute(LOAD_QUERY).fetchall())
+        except Exception as e:
+            logger.warning("Price matrix reload failed, keeping the current matrix: %s", e)
+            with self._lock:
+                self._pending = None
+            return
+        with self._lock:
+            if self._loaded:
+                self._swap(fresh, signature)
+            else:
+                self._pending = None
+
+    def invalidate(self) -> None:
+        """Matrisin tamamını boşalt; bir sonraki okumada yeniden yüklenir."""
+        with self._lock:
+            self._reset()
+
+    # --- Hücre işlemleri (commit'ten sonra çağrılır) ------------------------
+
+    def _grow_columns(self) -> None:
+        old_stride = self._stride
+        new_stride = len(self._market_ids) + self._column_headroom
+        old_prices = self._prices
+        rows = len(self._product_index)
+        new_prices = array("d", [MISSING]) * (rows * new_stride)
+        for row in range(rows):
+            start = row * old_stride
+            new_prices[row * new_stride:row * new_stride + old_stride] = old_prices[start:start + old_stride]
+        self._prices = new_prices
+        self._stride = new_stride
+
+    def _offset(self, product_id: int, market_id: int, create: bool = False) -> Optional[int]:
+        row = self._product_index.get(product_id)
+        col = self._market_index.get(market_id)
+        if row is None or col is None:
+            if not create:
+                return None
+            if col is None:
+                col = self._market_index[market_id] = len(self._market_ids)
+                self._market_ids.append(market_id)
+                if col >= self._stride:
+                    self._grow_columns()
+            if row is None:
+                row = self._product_index[product_id] = len(self._product_index)
+                self._prices.extend(array("d", [MISSING]) * self._stride)
+        return row * self._stride + col
+
+    def _record(self, operation: str, *args) -> bool:
+        # Kilit çağıranda. Yeniden yükleme sürüyorsa işlemi yeni matris için
+        # sakla; matris hiç yüklenmediyse ilk yükleme zaten güncel veriyi okur.
+        if self._pending is not None:
+            self._pending.append((operation, *args))
+        return self._loaded
+
+    def set_prices(self, changes: Iterable[Tuple[int, int, float]]) -> None:
+        """Commit edilen (product_id, market_id, price) fiyatlarını matrise yaz."""
+        with self._lock:
+            changes = list(changes)
+            if not self._record("set_prices", changes):
+                return
+            for product_id, market_id, price in changes:
+                # Yeni bir market sütunu diziyi yeniden oluşturabilir; önce ofseti hesapla
+                offset = self._offset(product_id, market_id, create=True)
+                self._prices[offset] = float(price)
+                self.updates += 1
+
+    def set_price(self, product_id: int, market_id: int, price: float) -> None:
+        self.set_prices([(product_id, market_id, price)])
+
+    def remove_price(self, product_id: int, market_id: int) -> None:
+        """Silinen bir product_details satırının hücresini boşalt."""
+        with self._lock:
+            if not self._record("remove_price", product_id, market_id):
+                return
+            offset = self._offset(product_id, market_id)
+            if offset is not None:
+                self._prices[offset] = MISSING
+                self.updates += 1
+
+    def remove_product(self, product_id: int) -> None:
+        """Silinen ürünün tüm fiyatlarını boşalt."""
+        with self._lock:
+            if not self._record("remove_product", product_id):
+                return
+            row = self._product_index.get(product_id)
+            if row is not None:
+                start = row * self._stride
+                self._prices[start:start + self._stride] = array("d", [MISSING]) * self._stride
+                self.updates += 1
+
+    def remove_market(self, market_id: int) -> None:
+        """Silinen marketin sütununu boşalt."""
+        with self._lock:
+            if not self._record("remove_market", market_id):
+                return
+            col = self._market_index.get(market_id)
+            if col is not None:
+                for offset in range(col, len(self._prices), self._stride):
+                    self._prices[offset] = MISSING
+                self.updates += 1
+
+    # --- Okuma --------------------------------------------------------------
+
+    def _row_prices(self, product_id: int) -> Dict[int, float]:
+        row = self._product_index.get(product_id)
+        if row is None:
+            return {}
+        start = row * self._stride
+        cells = self._prices[start:start + len(self._market_ids)]
+        return {
+            market_id: price
+            for market_id, price in zip(self._market_ids, cells)
+            if not math.isnan(price)
+        }
+
+    def get_price(self, db: Session, product_id: int, market_id: int) -> Optional[float]:
+        """Tek bir (ürün, market) fiyatı; yoksa None."""
+        self.ensure_loaded(db)
+        with self._lock:
+            offset = self._offset(product_id, market_id)
+            price = self._prices[offset] if offset is not None else MISSING
+            if math.isnan(price):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return price
+
+    def get_product_prices(self, db: Session, product_ids: Iterable[int]) -> Dict[int, Dict[int, float]]:
+        """
+        Ürünlerin product_id -> {market_id: fiyat} eşlemesi; tek kilitle okunur.
+        Hiç fiyatı olmayan ürünler ıska sayılır ve sonuçta yer almaz.
+        """
+        self.ensure_loaded(db)
+        result: Dict[int, Dict[int, float]] = {}
+        with self._lock:
+            for product_id in product_ids:
+                prices = self._row_prices(product_id)
+                if prices:
+                    result[product_id] = prices
+                    self.hits += 1
+                else:
+                    self.misses += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """İsabet/ıska sayaçları ve yaklaşık bellek kullanımı."""
+        with self._lock:
+            array_bytes = self._prices.buffer_info()[1] * self._prices.itemsize
+            index_bytes = (
+                sys.getsizeof(self._product_index)
+                + sys.getsizeof(self._market_index)
+                + sys.getsizeof(self._market_ids)
+            )
+            return {
+                "loaded": self._loaded,
+                "products": len(self._product_index),
+                "markets": len(self._market_ids),
+                "hits": self.hits,
+                "misses": self.misses,
+                "loads": self.loads,
+                "updates": self.updates,
+                "array_bytes": array_bytes,
+                "index_bytes": index_bytes,
+                "memory_bytes": array_bytes + index_bytes,
+            }
+
+
+# Süreç genelinde paylaşılan örnek
+price_matrix = PriceMatrix()
+
+
+def render_price_matrix_metrics() -> str:
+    """Fiyat matrisi sayaçları ve bellek kullanımı (Prometheus metin biçimi)."""
+    stats = price_matrix.stats()
+    metrics = (
+        ("price_matrix_hits_total", "counter", "Product price lookups served from the matrix.", stats["hits"]),
+        ("price_matrix_misses_total", "counter", "Product price lookups with no price in the matrix.", stats["misses"]),
+        ("price_matrix_loads_total", "counter", "Full loads of the matrix from product_details.", stats["loads"]),
+        ("price_matrix_updates_total", "counter", "Committed price writes applied to the matrix.", stats["updates"]),
+        ("price_matrix_products", "gauge", "Product rows in the matrix.", stats["products"]),
+        ("price_matrix_markets", "gauge", "Market columns in the matrix.", stats["markets"]),
+        ("price_matrix_memory_bytes", "gauge", "Approximate memory used by the matrix.", stats["memory_bytes"]),
+    )
+    lines = []
+    for name, kind, documentation, value in metrics:
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}", f"{name} {value}"]
+    return "\n".join(lines) + "\n"
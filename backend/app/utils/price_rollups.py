@@ -0,0 +1,269 @@
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import DateTime, and_, bindparam, delete, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.models.price_history import PriceHistory
+from app.models.price_history_rollup import PriceHistoryRollup
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ("day", "week", "month")
+
+# (product_id, market_id, price, zaman)
+Sample = Tuple[int, int, float, datetime]
+
+# Mevcut kovayla birleştirme; MIN/MAX SQLite'ta skaler, PostgreSQL'de
+# LEAST/GREATEST karşılığıdır.
+_UPSERT_TEMPLATE = """
+    INSERT INTO price_history_rollups (
+        product_id, market_id, granularity, bucket_start,
+        min_price, max_price, sum_price, sample_count, last_price, last_at
+    )
+    VALUES (
+        :product_id, :market_id, :granularity, :bucket_start,
+        :min_price, :max_price, :sum_price, :sample_count, :last_price, :last_at
+    )
+    ON CONFLICT (product_id, market_id, granularity, bucket_start) DO UPDATE SET
+        min_price = {least}(price_history_rollups.min_price, excluded.min_price),
+        max_price = {greatest}(price_history_rollups.max_price, excluded.max_price),
+        sum_price = price_history_rollups.sum_price + excluded.sum_price,
+        sample_count = price_history_rollups.sample_count + excluded.sample_count,
+        last_price = CASE WHEN excluded.last_at >= price_history_rollups.last_at
+                          THEN excluded.last_price ELSE price_history_rollups.last_price END,
+        last_at = {greatest}(price_history_rollups.last_at, excluded.last_at)
+"""
+
+# Zaman parametreleri ORM ile aynı biçimde yazılsın (SQLite'ta metin olarak
+# saklanır; biçim farkı ORM'in eşitlik/aralık filtrelerini şaşırtır)
+_UPSERT_TYPES = (bindparam("bucket_start", type_=DateTime), bindparam("last_at", type_=DateTime))
+PG_UPSERT = text(_UPSERT_TEMPLATE.format(least="LEAST", greatest="GREATEST")).bindparams(*_UPSERT_TYPES)
+GENERIC_UPSERT = text(_UPSERT_TEMPLATE.format(least="MIN", greatest="MAX")).bindparams(*_UPSERT_TYPES)
+
+
+def _as_utc(moment: datetime) -> datetime:
+    # Kovalar UTC ve timezone'suz tutulur
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    """Zamanı ait olduğu gün/hafta (pazartesi)/ay başlangıcına indir."""
+    day = _as_utc(moment).replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unsupported granularity: {granularity}")
+
+
+def bucket_end(start: datetime, granularity: str) -> datetime:
+    """bucket_start() ile başlayan kovanın bittiği (hariç) an."""
+    if granularity == "day":
+        return start + timedelta(days=1)
+    if granularity == "week":
+        return start + timedelta(days=7)
+    if granularity == "month":
+        return (start + timedelta(days=32)).replace(day=1)
+    raise ValueError(f"Unsupported granularity: {granularity}")
+
+
+def apply_samples(db: Session, samples: Iterable[Sample], granularities: Iterable[str] = GRANULARITIES) -> int:
+    """
+    Yeni fiyat örneklerini kova boylarına (varsayılan: hepsi) işle.
+
+    Örnekler önce bellekte kova başına toplanır, sonra her kova tek bir
+    upsert ile mevcut satırla birleştirilir. Commit çağırana aittir; böylece
+    rollup, fiyat yazımıyla aynı transaction'da kalır.
+    """
+    granularities = tuple(granularities)
+    buckets: Dict[Tuple[int, int, str, datetime], Dict[str, Any]] = {}
+    for product_id, market_id, price, moment in samples:
+        moment = _as_utc(moment)
+        price = float(price)
+        for granularity in granularities:
+            key = (product_id, market_id, granularity, bucket_start(moment, granularity))
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = {
+                    "product_id": product_id,
+                    "market_id": market_id,
+                    "granularity": granularity,
+                    "bucket_start": key[3],
+                    "min_price": price,
+                    "max_price": price,
+                    "sum_price": price,
+                    "sample_count": 1,
+                    "last_price": price,
+                    "last_at": moment,
+                }
+                continue
+            bucket["min_price"] = min(bucket["min_price"], price)
+            bucket["max_price"] = max(bucket["max_price"], price)
+            bucket["sum_price"] += price
+            bucket["sample_count"] += 1
+            if moment >= bucket["last_at"]:
+                bucket["last_price"] = price
+                bucket["last_at"] = moment
+
+    if buckets:
+        statement = PG_UPSERT if db.get_bind().dialect.name == "postgresql" else GENERIC_UPSERT
+        db.execute(statement, list(buckets.values()))
+    return len(buckets)
+
+
+def read_rollups(
+    db: Session,
+    product_id: int,
+    granularity: str,
+    since: datetime,
+    market_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Bir ürünün `since` tarihinden itibaren kovalarını (yeniden eskiye) döndür.
+
+    price_history yalnızca fiyatın değiştiği anları tutar; bu yüzden
+    avg_price kovadaki değişim noktalarının basit ortalamasıdır, fiyatın
+    geçerli kaldığı süreyle ağırlıklı bir ortalama değildir. Fiyatın hiç
+    değişmediği günler/haftalar için kova yoktur; o aralıktaki fiyat bir
+    önceki kovanın last_price'ıdır.
+    """
+    query = select(PriceHistoryRollup).where(
+        PriceHistoryRollup.product_id == product_id,
+        PriceHistoryRollup.granularity == granularity,
+        PriceHistoryRollup.bucket_start >= bucket_start(since, granularity),
+    )
+    if market_id is not None:
+        query = query.where(PriceHistoryRollup.market_id == market_id)
+    query = query.order_by(PriceHistoryRollup.bucket_start.desc(), PriceHistoryRollup.market_id)
+    return [
+        {
+            "product_id": rollup.product_id,
+            "market_id": rollup.market_id,
+            "granularity": rollup.granularity,
+            "bucket_start": rollup.bucket_start,
+            "min_price": rollup.min_price,
+            "max_price": rollup.max_price,
+            "avg_price": rollup.sum_price / rollup.sample_count,
+            "last_price": rollup.last_price,
+            "sample_count": rollup.sample_count,
+        }
+        for rollup in db.execute(query).scalars()
+    ]
+
+
+def rebuild_product_rollups(db: Session, first_id: int, last_id: int, batch_size: int = 50_000) -> int:
+    """
+    Ürün id aralığının [first_id, last_id] kovalarını price_history'den
+    yeniden hesapla. Satırlar dilim dilim okunur ama commit çağırana aittir;
+    böylece geçmişi değiştiren işlemle (ör. sıkıştırma) aynı transaction'da
+    kalır. Yazılan kova upsert sayısını döndürür.
+    """
+    db.execute(
+        delete(PriceHistoryRollup).where(PriceHistoryRollup.product_id.between(first_id, last_id))
+    )
+    buckets_written = 0
+    after_id = 0
+    while True:
+        rows = db.execute(
+            select(PriceHistory.id, PriceHistory.product_id, PriceHistory.market_id,
+                   PriceHistory.price, PriceHistory.created_at)
+            .where(PriceHistory.product_id.between(first_id, last_id), PriceHistory.id > after_id)
+            .order_by(PriceHistory.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        buckets_written += apply_samples(
+            db, ((r.product_id, r.market_id, r.price, r.created_at) for r in rows if r.created_at is not None)
+        )
+        after_id = rows[-1].id
+    return buckets_written
+
+
+def rebuild_bucket_rollups(db: Session, product_id: int, market_id: int, moment: datetime) -> int:
+    """
+    (ürün, market) çiftinin `moment` anını içeren gün/hafta/ay kovalarını
+    price_history'den yeniden hesapla; tek bir geçmiş satırı silindiğinde
+    kullanılır. Commit çağırana aittir. Yazılan kova upsert sayısını döndürür.
+    """
+    starts = {granularity: bucket_start(moment, granularity) for granularity in GRANULARITIES}
+    db.execute(
+        delete(PriceHistoryRollup).where(
+            PriceHistoryRollup.product_id == product_id,
+            PriceHistoryRollup.market_id == market_id,
+            or_(*(
+                and_(PriceHistoryRollup.granularity == granularity, PriceHistoryRollup.bucket_start == start)
+                for granularity, start in starts.items()
+            )),
+        )
+    )
+    # Kovalar UTC'dir; oturum saat dilimi farkı için aralık birer gün geniş
+    # okunur, satırlar kovalarına Python'da ayrılır
+    low = min(starts.values()) - timedelta(days=1)
+    high = max(bucket_end(start, granularity) for granularity, start in starts.items()) + timedelta(days=1)
+    rows = db.execute(
+        select(PriceHistory.price, PriceHistory.created_at).where(
+            PriceHistory.product_id == product_id,
+            PriceHistory.market_id == market_id,
+            PriceHistory.created_at >= low,
+            PriceHistory.created_at < high,
+        )
+    ).all()
+    buckets_written = 0
+    for granularity, start in starts.items():
+        buckets_written += apply_samples(
+            db,
+            (
+                (product_id, market_id, r.price, r.created_at)
+                for r in rows
+                if bucket_start(r.created_at, granularity) == start
+            ),
+            granularities=(granularity,),
+        )
+    return buckets_written
+
+
+def rebuild_rollups(db: Session, batch_size: int = 50_000) -> Dict[str, Any]:
+    """
+    Rollup tablosunu mevcut price_history satırlarından yeniden oluştur.
+
+    Satırlar id sırasıyla dilim dilim okunur; her dilim ayrı commit edilir.
+    """
+    start = time.perf_counter()
+    db.execute(delete(PriceHistoryRollup))
+    db.commit()
+
+    rows_read = 0
+    buckets_written = 0
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(PriceHistory.id, PriceHistory.product_id, PriceHistory.market_id,
+                   PriceHistory.price, PriceHistory.created_at)
+            .where(PriceHistory.id > last_id)
+            .order_by(PriceHistory.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        buckets_written += apply_samples(
+            db, ((r.product_id, r.market_id, r.price, r.created_at) for r in rows if r.created_at is not None)
+        )
+        db.commit()
+        rows_read += len(rows)
+        last_id = rows[-1].id
+
+    report = {
+        "rows_read": rows_read,
+        "bucket_upserts": buckets_written,
+        "elapsed_seconds": round(time.perf_counter() - start, 3),
+    }
+    logger.info("Price rollup rebuild: %d history rows, %d bucket upserts", rows_read, buckets_written)
+    return report
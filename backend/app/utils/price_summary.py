@@ -0,0 +1,153 @@
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+from app.models.product_detail import ProductDetail
+from app.models.product_price_summary import ProductPriceSummary
+
+logger = logging.getLogger(__name__)
+
+# IN listelerinin boyu; product_details'i okuma ve silme bu dilimlerle yapılır
+ID_CHUNK = 500
+
+UPSERT_STATEMENT = text("""
+    INSERT INTO product_price_summary (
+        product_id, min_price, min_market_id, max_price, avg_price, market_count, updated_at
+    )
+    VALUES (
+        :product_id, :min_price, :min_market_id, :max_price, :avg_price, :market_count, :updated_at
+    )
+    ON CONFLICT (product_id) DO UPDATE SET
+        min_price = excluded.min_price,
+        min_market_id = excluded.min_market_id,
+        max_price = excluded.max_price,
+        avg_price = excluded.avg_price,
+        market_count = excluded.market_count,
+        updated_at = excluded.updated_at
+""")
+
+
+def summarize(rows, updated_at: datetime) -> Dict[int, Dict[str, Any]]:
+    """
+    (product_id, market_id, price) satırlarını ürün başına özetle.
+
+    En ucuz market eşit fiyatlarda en küçük market_id'dir; böylece sonuç
+    satırların geliş sırasından bağımsızdır.
+    """
+    summaries: Dict[int, Dict[str, Any]] = {}
+    for product_id, market_id, price in rows:
+        price = float(price)
+        summary = summaries.get(product_id)
+        if summary is None:
+            summaries[product_id] = {
+                "product_id": product_id,
+                "min_price": price,
+                "min_market_id": market_id,
+                "max_price": price,
+                "avg_price": price,
+                "market_count": 1,
+                "updated_at": updated_at,
+            }
+            continue
+        if (price, market_id or 0) < (summary["min_price"], summary["min_market_id"] or 0):
+            summary["min_price"] = price
+            summary["min_market_id"] = market_id
+        summary["max_price"] = max(summary["max_price"], price)
+        summary["avg_price"] += price  # toplam; aşağıda ortalamaya çevrilir
+        summary["market_count"] += 1
+    for summary in summaries.values():
+        summary["avg_price"] /= summary["market_count"]
+    return summaries
+
+
+def refresh_price_summaries(db: Session, product_ids: Iterable[Optional[int]]) -> int:
+    """
+    Verilen ürünlerin özet satırlarını product_details'ten yeniden hesapla.
+
+    Hiç fiyatı kalmayan ürünlerin özeti silinir. Commit çağırana aittir;
+    özet, fiyat yazımıyla aynı transaction'da kalır. Çağıran değişikliklerini
+    önceden flush etmiş olmalıdır.
+
+    Okumadan önce ürün satırları id sırasıyla kilitlenir (PostgreSQL'de
+    FOR NO KEY UPDATE). Aynı ürünün farklı marketlerine yazan iki işlem
+    böylece sırayla özetler; ikincisi birincinin commit ettiği fiyatı görür
+    ve özeti onu atlayarak ezemez. FOR UPDATE yerine NO KEY UPDATE,
+    product_details eklerken yabancı anahtarın aldığı KEY SHARE kilidiyle
+    çakışıp kilitlenmeye (deadlock) yol açmasın diye kullanılır.
+    """
+    ids = sorted({product_id for product_id in product_ids if product_id is not None})
+    if not ids:
+        return 0
+    now = datetime.now(timezone.utc)
+    written = 0
+    for start in range(0, len(ids), ID_CHUNK):
+        chunk = ids[start:start + ID_CHUNK]
+        db.execute(
+            select(Product.id).where(Product.id.in_(chunk)).order_by(Product.id)
+            .with_for_update(key_share=True)
+        ).all()
+        rows = db.execute(
+            select(ProductDetail.product_id, ProductDetail.market_id, ProductDetail.price)
+            .where(ProductDetail.product_id.in_(chunk))
+        ).all()
+        summaries = summarize(rows, now)
+        if summaries:
+            db.execute(UPSERT_STATEMENT, list(summaries.values()))
+            written += len(summaries)
+        gone = [product_id for product_id in chunk if product_id not in summaries]
+        if gone:
+            db.execute(delete(ProductPriceSummary).where(ProductPriceSummary.product_id.in_(gone)))
+    return written
+
+
+def market_product_ids(db: Session, market_id: int) -> List[int]:
+    """Bir markette fiyatı olan ürünler; market silinmeden önce okunur."""
+    return list(db.execute(
+        select(ProductDetail.product_id).where(ProductDetail.market_id == market_id)
+    ).scalars())
+
+
+def rebuild_price_summaries(db: Session, batch_size: int = 5_000) -> Dict[str, Any]:
+    """
+    Özet tablosunu product_details'ten baştan oluştur.
+
+    Tablo önceden boşaltılmaz: ürünler id sırasıyla dilim dilim yeniden
+    hesaplanıp upsert edilir ve her dilim ayrı commit edilir; yeniden kurulum
+    sürerken de fiyat filtreleri eski ya da yeni özeti görür, boş tablo
+    görmez. Dilimler yazma yollarıyla aynı ürün kilitlerini alır. Sonda
+    artık var olmayan ürünlerin özetleri silinir.
+    """
+    start = time.perf_counter()
+
+    products = 0
+    summaries = 0
+    last_id = 0
+    while True:
+        ids = list(db.execute(
+            select(Product.id).where(Product.id > last_id).order_by(Product.id).limit(batch_size)
+        ).scalars())
+        if not ids:
+            break
+        summaries += refresh_price_summaries(db, ids)
+        db.commit()
+        products += len(ids)
+        last_id = ids[-1]
+
+    orphans = db.execute(
+        delete(ProductPriceSummary).where(ProductPriceSummary.product_id.not_in(select(Product.id)))
+    ).rowcount
+    db.commit()
+
+    report = {
+        "products": products,
+        "summaries": summaries,
+        "orphans_deleted": orphans,
+        "elapsed_seconds": round(time.perf_counter() - start, 3),
+    }
+    logger.info("Price summary rebuild: %d products, %d summaries", products, summaries)
+    return report
@@ -0,0 +1,82 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import select
+
+from app.models.product import Product, product_category
+from app.models.product_price_summary import ProductPriceSummary
+
+# Liste yalnızca bu sütunları okur; fiyat özeti product_price_summary'den
+# aynı sorguda gelir, ilişkiler hiç yüklenmez
+LIST_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.brand,
+    Product.image_url,
+    ProductPriceSummary.min_price,
+    ProductPriceSummary.min_market_id,
+    ProductPriceSummary.max_price,
+    ProductPriceSummary.avg_price,
+    ProductPriceSummary.market_count,
+)
+
+# Fiyatı olmayan ürünler de listelenir
+SUMMARY_JOIN = (ProductPriceSummary, ProductPriceSummary.product_id == Product.id)
+
+
+def listing_query():
+    return select(*LIST_COLUMNS).outerjoin(*SUMMARY_JOIN)
+
+
+def price_range_filters(min_price: Optional[float], max_price: Optional[float]) -> list:
+    """
+    En düşük fiyatı [min_price, max_price] aralığında olan ürünler için
+    koşullar; özet tablosunun min_price indeksini kullanır.
+    """
+    filters = []
+    if min_price is not None:
+        filters.append(ProductPriceSummary.min_price >= min_price)
+    if max_price is not None:
+        filters.append(ProductPriceSummary.min_price <= max_price)
+    return filters
+
+
+def category_ids_query(product_ids: Sequence[int]):
+    return (
+        select(product_category.c.product_id, product_category.c.category_id)
+        .where(product_category.c.product_id.in_(product_ids))
+    )
+
+
+def build_list_items(rows, category_rows) -> List[Dict[str, Any]]:
+    """
+    Sayfa satırlarını kategori id'leriyle ProductListItem sözlüklerine çevir;
+    sayfanın sırası korunur.
+    """
+    categories: Dict[int, List[int]] = defaultdict(list)
+    for product_id, category_id in category_rows:
+        categories[product_id].append(category_id)
+
+    items = []
+    for row in rows:
+        items.append({
+            "id": row.id,
+            "name": row.name,
+            "brand": row.brand,
+            "image_url": row.image_url,
+            "min_price": row.min_price,
+            "min_market_id": row.min_market_id,
+            "max_price": row.max_price,
+            "avg_price": row.avg_price,
+            "market_count": row.market_count or 0,
+            "category_ids": sorted(categories.get(row.id, ())),
+        })
+    return items
+
+
+async def load_list_items(db, rows) -> List[Dict[str, Any]]:
+    """Sayfa satırları için kategori id'lerini tek indeksli sorguyla yükle (AsyncSession)."""
+    if not rows:
+        return []
+    category_rows = (await db.execute(category_ids_query([row.id for row in rows]))).all()
+    return build_list_items(rows, category_rows)
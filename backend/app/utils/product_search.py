@@ -0,0 +1,432 @@
+import heapq
+import logging
+import math
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple, Iterable
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Türkçe karakterleri ASCII karşılıklarına katla. Büyük harfler lower()'dan
+# önce çevrilir; böylece "İ" -> "i̇" gibi birleşik karakterler oluşmaz.
+TURKISH_FROM = "İIıŞşĞğÜüÖöÇç"
+TURKISH_TO = "iiissgguuoocc"
+_TURKISH_FOLD = str.maketrans(TURKISH_FROM, TURKISH_TO)
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+# Alan ağırlıkları: isim eşleşmesi markadan, barkod tam eşleşmesi her şeyden önemli
+FIELD_WEIGHTS = {"name": 3.0, "brand": 2.0, "barcode": 5.0}
+PREFIX_FACTOR = 0.7
+MAX_PREFIX_EXPANSIONS = 64
+# Bu uzunluktaki rakam dizileri barkodun herhangi bir yerinde de aranır
+BARCODE_FRAGMENT_MIN_LENGTH = 4
+BARCODE_FRAGMENT_FACTOR = 0.2
+_DIGITS = re.compile(r"\d+")
+
+# Sonuçlar SEARCH_MAX_RESULTS'ta kesildiyse yanıta eklenir
+SEARCH_TRUNCATED_HEADER = "X-Search-Truncated"
+
+LOAD_QUERY = text("SELECT id, name, brand, barcode FROM products")
+# Başka süreçlerin yazmalarını fark etmek için ucuz bir tablo imzası
+SIGNATURE_QUERY = text("SELECT COUNT(*), MAX(id), MAX(updated_at) FROM products")
+
+# PostgreSQL tarafında aynı katlamayı yapan ifade; alembic'teki GIN
+# indeksleriyle birebir aynı olmalıdır.
+PG_SEARCH_EXPR = (
+    "lower(translate(coalesce(name, '') || ' ' || coalesce(brand, ''), "
+    f"'{TURKISH_FROM}', '{TURKISH_TO}'))"
+)
+
+# Süreç içi indeksle aynı anlam: sorgudaki her token ad/markada tam ya da
+# önek olarak geçmeli (AND); ayrıca barkod tam eşleşmesi veya barkod parçası
+# eşleşmesi yeterlidir. PostgreSQL buna ek olarak yazım hatalı sorguları da
+# bulur: `:q <% ifade` (word_similarity, pg_trgm.word_similarity_threshold)
+# ix_products_search_trgm indeksiyle filtrelenir. Bu eşleşmeler ts_rank
+# almadığı için tam/önek eşleşmelerinin arkasında sıralanır. Barkod parçası
+# LIKE'ı ix_products_barcode_trgm indeksini kullanır.
+PG_SEARCH_QUERY = text(f"""
+    SELECT id
+    FROM products
+    WHERE (:tsquery <> '' AND to_tsvector('simple', {PG_SEARCH_EXPR}) @@ to_tsquery('simple', :tsquery))
+       OR (:q <> '' AND :q <% {PG_SEARCH_EXPR})
+       OR barcode = :raw
+       OR (:fragment AND barcode LIKE :barcode_pattern)
+    ORDER BY (barcode = :raw) DESC,
+             ts_rank(to_tsvector('simple', {PG_SEARCH_EXPR}), to_tsquery('simple', :tsquery))
+               + word_similarity(:q, {PG_SEARCH_EXPR}) DESC,
+             id
+    LIMIT :limit
+""")
+
+
+def normalize(value: Optional[str]) -> str:
+    """
+    Arama için metni normalize et: Türkçe katlama (ı/İ, ş, ğ, ü, ö, ç),
+    küçük harf, aksan temizleme ve noktalama yerine boşluk.
+    """
+    if not value:
+        return ""
+    folded = value.translate(_TURKISH_FOLD).lower()
+    folded = "".join(
+        ch for ch in unicodedata.normalize("NFKD", folded)
+        if not unicodedata.combining(ch)
+    )
+    return _NON_ALNUM.sub(" ", folded).strip()
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    return normalize(value).split()
+
+
+def barcode_fragment(query: str) -> Optional[str]:
+    """Sorgu yalnızca rakamlardan oluşuyorsa barkod parçası olarak aranacak değer."""
+    raw = query.strip()
+    if len(raw) >= BARCODE_FRAGMENT_MIN_LENGTH and _DIGITS.fullmatch(raw):
+        return raw
+    return None
+
+
+class ProductSearchIndex:
+    """
+    Ürün adı/markası/barkodu üzerinde süreç içi ters indeks.
+
+    SQLite ve testlerde pg_trgm/tsvector yerine kullanılır. Her alan için
+    token -> `array('i')` ürün id listesi tutulur. Barkod parçası araması
+    için her barkodun BARCODE_FRAGMENT_MIN_LENGTH uzunluğundaki alt dizileri
+    de barkodlara eşlenir (pg_trgm'nin barkod indeksinin karşılığı). Güncellenen veya silinen
+    ürünler `_overrides` içinde izlenir ve sorgu anında doğrulanır; böylece
+    büyük posting dizilerinden eleman silmek gerekmez.
+
+    Bu süreçteki yazmalar indekse anında yansır. Başka süreçlerin yazmaları
+    için products tablosunun imzası (satır sayısı, en büyük id, en son
+    updated_at) en fazla SEARCH_INDEX_CHECK_SECONDS'ta bir okunur; imza
+    değişmişse indeks arka planda yeniden kurulur.
+    """
+
+    def __init__(self, compact_threshold: int = 10_000):
+        self._lock = threading.RLock()
+        self._compact_threshold = compact_threshold
+        self._signature = None
+        self._checked_at: Optional[float] = None
+        self._rebuilding = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self._built = False
+        self._postings: Dict[str, Dict[str, array]] = {field: {} for field in FIELD_WEIGHTS}
+        self._vocabulary: Dict[str, List[str]] = {}
+        self._name_lengths: Dict[int, int] = {}
+        self._barcode_grams: Dict[str, List[str]] = {}
+        self._overrides: Dict[int, Optional[Dict[str, frozenset]]] = {}
+        self._doc_count = 0
+
+    # --- Kurulum ------------------------------------------------------------
+
+    @staticmethod
+    def _fields(name: Optional[str], brand: Optional[str], barcode: Optional[str]) -> Dict[str, List[str]]:
+        return {
+            "name": tokenize(name),
+            "brand": tokenize(brand),
+            "barcode": [barcode.strip()] if barcode and barcode.strip() else [],
+        }
+
+    def _add(self, product_id: int, fields: Dict[str, List[str]]) -> None:
+        for field, tokens in fields.items():
+            postings = self._postings[field]
+            for token in set(tokens):
+                bucket = postings.get(token)
+                if bucket is None:
+                    bucket = postings[token] = array("i")
+                    self._vocabulary.pop(field, None)
+                    if field == "barcode":
+                        self._add_barcode_grams(token)
+                bucket.append(product_id)
+        self._name_lengths[product_id] = len(fields["name"])
+
+    def _add_barcode_grams(self, barcode: str) -> None:
+        size = BARCODE_FRAGMENT_MIN_LENGTH
+        for gram in {barcode[i:i + size] for i in range(len(barcode) - size + 1)}:
+            self._barcode_grams.setdefault(gram, []).append(barcode)
+
+    def _fragment_candidates(self, fragment: str) -> List[str]:
+        """
+        Parçayı içerebilecek barkodlar: parçanın alt dizilerinden en seyrek
+        olanının barkod listesi. Sonuç çağıranda `in` ile doğrulanır.
+        """
+        size = BARCODE_FRAGMENT_MIN_LENGTH
+        grams = {fragment[i:i + size] for i in range(len(fragment) - size + 1)}
+        return min((self._barcode_grams.get(gram, []) for gram in grams), key=len)
+
+    def build(self, rows: Iterable[Tuple[int, Optional[str], Optional[str], Optional[str]]]) -> None:
+        """(id, name, brand, barcode) satırlarından indeksi sıfırdan kur."""
+        with self._lock:
+            self._reset()
+            for product_id, name, brand, barcode in rows:
+                self._add(product_id, self._fields(name, brand, barcode))
+                self._doc_count += 1
+            self._built = True
+
+    def ensure_built(self, db: Session) -> None:
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    signature = tuple(db.execute(SIGNATURE_QUERY).one())
+                    self.build(db.execute(LOAD_QUERY))
+                    self._signature = signature
+                    self._checked_at = time.monotonic()
+            return
+        interval = settings.SEARCH_INDEX_CHECK_SECONDS
+        if not interval or time.monotonic() - (self._checked_at or 0.0) < interval:
+            return
+        with self._lock:
+            if self._rebuilding or time.monotonic() - (self._checked_at or 0.0) < interval:
+                return
+            self._checked_at = time.monotonic()
+        signature = tuple(db.execute(SIGNATURE_QUERY).one())
+        if signature == self._signature:
+            return
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild, args=(signature,), name="search-index-rebuild", daemon=True).start()
+
+    def _rebuild(self, signature) -> None:
+        from app.db.session import SessionLocal
+
+        fresh = ProductSearchIndex(self._compact_threshold)
+        try:
+            db = SessionLocal()
+            try:
+                fresh.build(db.execute(LOAD_QUERY))
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning("Search index rebuild failed, keeping the current index: %s", e)
+            fresh = None
+        with self._lock:
+            self._rebuilding = False
+            if fresh is None or not self._built:
+                return
+            # Yeni kurulum sorgu sırasında okunan durumu yansıtır; yerinde takas
+            self._postings = fresh._postings
+            self._vocabulary = fresh._vocabulary
+            self._name_lengths = fresh._name_lengths
+            self._barcode_grams = fresh._barcode_grams
+            self._overrides = fresh._overrides
+            self._doc_count = fresh._doc_count
+            self._signature = signature
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._reset()
+
+    # --- Artımlı güncelleme -------------------------------------------------
+
+    def update_product(self, product_id: int, name: Optional[str], brand: Optional[str], barcode: Optional[str]) -> None:
+        """Oluşturulan veya güncellenen ürünü indekse yansıt."""
+        with self._lock:
+            if not self._built:
+                return
+            if product_id not in self._name_lengths:
+                self._doc_count += 1
+            fields = self._fields(name, brand, barcode)
+            self._add(product_id, fields)
+            self._overrides[product_id] = {field: frozenset(tokens) for field, tokens in fields.items()}
+            self._maybe_compact()
+
+    def remove_product(self, product_id: int) -> None:
+        with self._lock:
+            if not self._built:
+                return
+            if self._name_lengths.pop(product_id, None) is not None:
+                self._doc_count -= 1
+            self._overrides[product_id] = None
+            self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        # Çok sayıda güncellemeden sonra bir sonraki sorguda temiz kurulum yap
+        if len(self._overrides) > self._compact_threshold:
+            self._reset()
+
+    # --- Sorgu --------------------------------------------------------------
+
+    def _expand(self, field: str, token: str) -> List[Tuple[str, float]]:
+        postings = self._postings[field]
+        matches = [(token, 1.0)] if token in postings else []
+        if field == "barcode" or len(token) < 2:
+            return matches
+        vocabulary = self._vocabulary.get(field)
+        if vocabulary is None:
+            vocabulary = self._vocabulary[field] = sorted(postings)
+        start = bisect_left(vocabulary, token)
+        for term in vocabulary[start:start + MAX_PREFIX_EXPANSIONS + 1]:
+            if not term.startswith(token):
+                break
+            if term != token:
+                matches.append((term, PREFIX_FACTOR))
+        return matches
+
+    def _idf(self, df: int) -> float:
+        return math.log(1.0 + (self._doc_count + 1) / (df + 1))
+
+    def search(self, query: str, limit: int = 100) -> List[Tuple[int, float]]:
+        """
+        Sorgudaki tüm token'ları (tam veya önek olarak) içeren, ya da barkodu
+        sorguya eşit olan veya (rakam sorgularında) sorguyu içeren ürünleri
+        skora göre sıralı (id, skor) listesi olarak döndür.
+        """
+        tokens = tokenize(query)
+        raw = query.strip()
+        with self._lock:
+            overrides = self._overrides
+            scores: Optional[Dict[int, float]] = None
+            for token in tokens:
+                token_scores: Dict[int, float] = {}
+                override_gains: List[Tuple[str, str, float]] = []
+                for field, weight in FIELD_WEIGHTS.items():
+                    if field == "barcode":
+                        continue
+                    for term, factor in self._expand(field, token):
+                        bucket = self._postings[field][term]
+                        gain = weight * factor * self._idf(len(bucket))
+                        override_gains.append((field, term, gain))
+                        get = token_scores.get
+                        for product_id in bucket:
+                            if gain > get(product_id, 0.0):
+                                token_scores[product_id] = gain
+
+                # Güncellenmiş/silinmiş ürünleri güncel token'larına göre yeniden puanla
+                for product_id in overrides.keys() & token_scores.keys():
+                    current = overrides[product_id]
+                    gains = [
+                        gain for field, term, gain in override_gains
+                        if current is not None and term in current[field]
+                    ]
+                    if gains:
+                        token_scores[product_id] = max(gains)
+                    else:
+                        del token_scores[product_id]
+
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {
+                        product_id: score + token_scores[product_id]
+                        for product_id, score in scores.items()
+                        if product_id in token_scores
+                    }
+                if not scores:
+                    break
+            scores = scores or {}
+
+            for product_id in self._postings["barcode"].get(raw, ()):
+                if product_id in overrides:
+                    current = overrides[product_id]
+                    if current is None or raw not in current["barcode"]:
+                        continue
+                scores[product_id] = scores.get(product_id, 0.0) + FIELD_WEIGHTS["barcode"] * 10
+
+            fragment = barcode_fragment(query)
+            if fragment is not None:
+                # Barkod parçası: alt dizi indeksinden gelen adaylar doğrulanır
+                gain = FIELD_WEIGHTS["barcode"] * BARCODE_FRAGMENT_FACTOR
+                barcode_postings = self._postings["barcode"]
+                for barcode in self._fragment_candidates(fragment):
+                    if barcode == raw or fragment not in barcode:
+                        continue
+                    for product_id in barcode_postings[barcode]:
+                        if product_id in overrides:
+                            current = overrides[product_id]
+                            if current is None or barcode not in current["barcode"]:
+                                continue
+                        scores[product_id] = scores.get(product_id, 0.0) + gain
+
+            name_lengths = self._name_lengths
+            return heapq.nsmallest(
+                limit,
+                scores.items(),
+                key=lambda item: (-item[1], name_lengths.get(item[0], 0), item[0])
+            )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "documents": self._doc_count,
+                "terms": sum(len(postings) for postings in self._postings.values()),
+                "barcode_fragments": len(self._barcode_grams),
+                "overrides": len(self._overrides),
+            }
+
+
+# Süreç genelinde paylaşılan indeks
+product_search_index = ProductSearchIndex()
+
+
+def use_postgres_search(db: Session) -> bool:
+    backend = settings.SEARCH_BACKEND
+    if backend == "memory":
+        return False
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def search_product_ids(db: Session, query: str, limit: Optional[int] = None) -> List[int]:
+    """
+    Sorguya uyan ürün id'lerini alaka sırasıyla döndür.
+
+    PostgreSQL'de pg_trgm/tsvector indeksleri, diğer veritabanlarında süreç
+    içi ters indeks kullanılır.
+    """
+    limit = limit or settings.SEARCH_MAX_RESULTS
+    normalized = normalize(query)
+    if not normalized and not query.strip():
+        return []
+
+    if use_postgres_search(db):
+        fragment = barcode_fragment(query)
+        rows = db.execute(PG_SEARCH_QUERY, {
+            "q": normalized,
+            # normalize() yalnızca [0-9a-z] ve boşluk bırakır; tsquery sözdizimi güvenli
+            "tsquery": " & ".join(f"{token}:*" for token in normalized.split()),
+            "raw": query.strip(),
+            "fragment": fragment is not None,
+            "barcode_pattern": f"%{fragment}%" if fragment else "",
+            "limit": limit,
+        })
+        return [row.id for row in rows]
+
+    product_search_index.ensure_built(db)
+    return [product_id for product_id, _ in product_search_index.search(query, limit)]
+
+
+async def search_product_ids_async(db, query: str, limit: Optional[int] = None) -> List[int]:
+    """search_product_ids()'in AsyncSession karşılığı."""
+    return await db.run_sync(search_product_ids, query, limit)
+
+
+def check_search_offset(skip: int) -> None:
+    """
+    Arama en fazla SEARCH_MAX_RESULTS sonuç sıralar; bunun ötesindeki bir
+    sayfa sessizce boş dönmek yerine 400 ile reddedilir.
+    """
+    if skip >= settings.SEARCH_MAX_RESULTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Search results are limited to the first {settings.SEARCH_MAX_RESULTS} matches; refine the query"
+        )
+
+
+def set_search_truncated(response: Response, ranked_ids: List[int]) -> None:
+    """Sonuçlar sınırda kesildiyse istemciye bildir."""
+    if len(ranked_ids) >= settings.SEARCH_MAX_RESULTS:
+        response.headers[SEARCH_TRUNCATED_HEADER] = "true"
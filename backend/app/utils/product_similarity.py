@@ -0,0 +1,311 @@
+import logging
+import math
+import time
+import zlib
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.product_similarity import ProductSimilarity, ProductSimilarityQueue
+from app.utils.product_search import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Alan ağırlıkları (terim frekansına çarpan)
+TEXT_FIELD_WEIGHTS = {"name": 1.0, "brand": 1.0, "description": 0.5}
+# Fiyat bantları log ölçekte bu oranla büyür (%25)
+PRICE_BAND_RATIO = 1.25
+PRICE_DIM = 32
+
+PRODUCTS_QUERY = text("SELECT id, name, brand, description FROM products ORDER BY id")
+PRICES_QUERY = text("SELECT product_id, AVG(price) FROM product_details GROUP BY product_id")
+# Ürünün kategorileri ve bunların ataları (kapanış tablosu); ata uzaklaştıkça ağırlık azalır
+CATEGORIES_QUERY = text("""
+    SELECT pc.product_id, cc.ancestor_id, cc.depth
+    FROM product_category pc
+    JOIN category_closure cc ON cc.descendant_id = pc.category_id
+""")
+
+ENQUEUE_QUERY = text(
+    "INSERT INTO product_similarity_queue (product_id) VALUES (:product_id) "
+    "ON CONFLICT (product_id) DO NOTHING"
+)
+# Silinen ürünü listesinde tutan ürünler de yeniden hesaplanmalı
+ENQUEUE_HOLDERS_QUERY = text("""
+    INSERT INTO product_similarity_queue (product_id)
+    SELECT DISTINCT product_id FROM product_similarity WHERE neighbor_id = :product_id
+    ON CONFLICT (product_id) DO NOTHING
+""")
+
+
+def _bucket(token: str, dim: int) -> Tuple[int, float]:
+    """Özellik karma (hashing trick): sabit boyutlu indeks ve ±1 işaret."""
+    h = zlib.crc32(token.encode("utf-8"))
+    return h % dim, (1.0 if h & 0x80000000 else -1.0)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+class FeatureMatrix:
+    """
+    Tüm ürünlerin birleştirilmiş özellik vektörleri.
+
+    Metin (TF-IDF), kategori ve fiyat bandı blokları ayrı ayrı birim
+    uzunluğa getirilip ağırlığın kareköküyle çarpılır; böylece iki ürünün iç
+    çarpımı blok kosinüslerinin ağırlıklı toplamıdır.
+    """
+
+    def __init__(self, product_ids: np.ndarray, vectors: np.ndarray):
+        self.product_ids = product_ids
+        self.vectors = vectors
+        self.index = {int(pid): i for i, pid in enumerate(product_ids)}
+
+    @classmethod
+    def load(cls, db: Session) -> "FeatureMatrix":
+        products = db.execute(PRODUCTS_QUERY).all()
+        prices = {pid: avg for pid, avg in db.execute(PRICES_QUERY) if avg is not None}
+        categories: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        for product_id, ancestor_id, depth in db.execute(CATEGORIES_QUERY):
+            categories[product_id].append((ancestor_id, depth))
+        return cls.build(products, prices, categories)
+
+    @classmethod
+    def build(
+        cls,
+        products: List[Tuple[int, Optional[str], Optional[str], Optional[str]]],
+        prices: Dict[int, float],
+        categories: Dict[int, List[Tuple[int, int]]],
+    ) -> "FeatureMatrix":
+        n = len(products)
+        text_dim = settings.SIMILARITY_TEXT_DIM
+        category_dim = settings.SIMILARITY_CATEGORY_DIM
+        product_ids = np.fromiter((p[0] for p in products), dtype=np.int64, count=n)
+
+        # Metin: alan ağırlıklı terim frekansları, ardından IDF
+        term_counts: List[Counter] = []
+        document_frequency: Counter = Counter()
+        for _, name, brand, description in products:
+            counts: Counter = Counter()
+            for token in tokenize(name):
+                counts[token] += TEXT_FIELD_WEIGHTS["name"]
+            for token in tokenize(brand):
+                counts["b:" + token] += TEXT_FIELD_WEIGHTS["brand"]
+            for token in tokenize(description):
+                counts[token] += TEXT_FIELD_WEIGHTS["description"]
+            term_counts.append(counts)
+            document_frequency.update(counts.keys())
+
+        text_block = np.zeros((n, text_dim), dtype=np.float32)
+        buckets = {term: _bucket(term, text_dim) for term in document_frequency}
+        for row, counts in enumerate(term_counts):
+            for term, tf in counts.items():
+                column, sign = buckets[term]
+                idf = math.log((1 + n) / (1 + document_frequency[term])) + 1.0
+                # Alt-doğrusal tf; tek açıklama geçişi (0.5) olduğu gibi kalır
+                weight = 1.0 + math.log(tf) if tf >= 1 else tf
+                text_block[row, column] += sign * weight * idf
+
+        category_block = np.zeros((n, category_dim), dtype=np.float32)
+        price_block = np.zeros((n, PRICE_DIM), dtype=np.float32)
+        band_offsets = np.arange(-2, 3)
+        band_weights = np.exp(-(band_offsets ** 2) / 2.0).astype(np.float32)
+        for row, product in enumerate(products):
+            product_id = product[0]
+            for ancestor_id, depth in categories.get(product_id, ()):
+                column, _ = _bucket(f"c:{ancestor_id}", category_dim)
+                category_block[row, column] += 0.5 ** depth
+            price = prices.get(product_id)
+            if price and price > 0:
+                # Komşu bantlara da yumuşak (Gauss) ağırlık verilir
+                band = int(math.floor(math.log(price) / math.log(PRICE_BAND_RATIO)))
+                np.add.at(price_block[row], (band + band_offsets) % PRICE_DIM, band_weights)
+
+        blocks = [
+            (text_block, settings.SIMILARITY_TEXT_WEIGHT),
+            (category_block, settings.SIMILARITY_CATEGORY_WEIGHT),
+            (price_block, settings.SIMILARITY_PRICE_WEIGHT),
+        ]
+        total = sum(weight for _, weight in blocks) or 1.0
+        vectors = np.hstack([
+            _normalize_rows(block) * np.float32(math.sqrt(weight / total))
+            for block, weight in blocks
+        ])
+        return cls(product_ids, vectors)
+
+    def top_k(self, rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Verilen satırlar için en benzer k satırın indeksleri ve skorları.
+        Skor sıfır ya da altındaysa indeks -1'dir.
+        """
+        scores = self.vectors[rows] @ self.vectors.T
+        scores[np.arange(len(rows)), rows] = -np.inf
+        k = min(k, max(self.vectors.shape[0] - 1, 0))
+        if k == 0:
+            empty = np.empty((len(rows), 0))
+            return empty.astype(np.int64), empty
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        part_scores = np.take_along_axis(scores, part, axis=1)
+        # Eşit skorlarda küçük ürün id'si önce gelir
+        order = np.lexsort((self.product_ids[part], -part_scores), axis=1)
+        best = np.take_along_axis(part, order, axis=1)
+        best_scores = np.take_along_axis(part_scores, order, axis=1)
+        best[best_scores <= 0] = -1
+        return best, best_scores
+
+    def block_size(self) -> int:
+        """Bir seferde skorlanacak satır sayısı; skor matrisi SIMILARITY_BLOCK_ELEMENTS ile sınırlı."""
+        return max(1, settings.SIMILARITY_BLOCK_ELEMENTS // max(len(self.product_ids), 1))
+
+
+def _write_neighbors(db: Session, features: FeatureMatrix, rows: np.ndarray) -> int:
+    """
+    Verilen satırların komşu listelerini hesapla ve eskilerinin yerine yaz.
+    """
+    written = 0
+    k = settings.SIMILARITY_TOP_K
+    step = features.block_size()
+    for start in range(0, len(rows), step):
+        block = rows[start:start + step]
+        best, best_scores = features.top_k(block, k)
+        product_ids = [int(features.product_ids[row]) for row in block]
+        db.execute(
+            delete(ProductSimilarity)
+            .where(ProductSimilarity.product_id.in_(product_ids))
+            .execution_options(synchronize_session=False)
+        )
+        mappings = []
+        for product_id, neighbors, scores in zip(product_ids, best, best_scores):
+            rank = 0
+            for neighbor, score in zip(neighbors, scores):
+                if neighbor < 0:
+                    continue
+                mappings.append({
+                    "product_id": product_id,
+                    "rank": rank,
+                    "neighbor_id": int(features.product_ids[neighbor]),
+                    "score": float(score),
+                })
+                rank += 1
+        if mappings:
+            db.bulk_insert_mappings(ProductSimilarity, mappings)
+        written += len(mappings)
+    return written
+
+
+def rebuild_similarity(db: Session) -> Dict[str, Any]:
+    """
+    Tüm ürünlerin komşu listelerini baştan hesapla (çevrimdışı iş).
+    """
+    started = time.perf_counter()
+    queued = set(db.execute(select(ProductSimilarityQueue.product_id)).scalars())
+    features = FeatureMatrix.load(db)
+    db.execute(delete(ProductSimilarity).execution_options(synchronize_session=False))
+    written = _write_neighbors(db, features, np.arange(len(features.product_ids)))
+    _dequeue(db, queued)
+    db.commit()
+    return {
+        "products": len(features.product_ids),
+        "rows_written": written,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def _dequeue(db: Session, product_ids: Set[int]) -> None:
+    if product_ids:
+        db.execute(
+            delete(ProductSimilarityQueue)
+            .where(ProductSimilarityQueue.product_id.in_(product_ids))
+            .execution_options(synchronize_session=False)
+        )
+
+
+def refresh_similarity(db: Session) -> Dict[str, Any]:
+    """
+    Yalnızca kuyruktaki ürünleri ve onlardan etkilenen ürünleri yeniden hesapla.
+
+    Değişen ürünlerin vektörleri herkesle tek matris çarpımında skorlanır.
+    Bir ürünün listesi yalnızca değişen bir ürünü zaten içeriyorsa ya da
+    değişen bir ürün listesindeki en zayıf komşudan daha benzerse (veya liste
+    henüz dolmamışsa) yeniden hesaplanır.
+    """
+    started = time.perf_counter()
+    queued = set(db.execute(select(ProductSimilarityQueue.product_id)).scalars())
+    if not queued:
+        return {"queued": 0, "products_refreshed": 0, "rows_written": 0, "elapsed_seconds": 0.0}
+
+    features = FeatureMatrix.load(db)
+    changed_rows = np.array(sorted(features.index[pid] for pid in queued if pid in features.index), dtype=np.int64)
+
+    affected: Set[int] = set(changed_rows.tolist())
+    holders = db.execute(
+        select(ProductSimilarity.product_id).where(ProductSimilarity.neighbor_id.in_(queued)).distinct()
+    ).scalars()
+    affected.update(features.index[pid] for pid in holders if pid in features.index)
+
+    if len(changed_rows):
+        k = settings.SIMILARITY_TOP_K
+        weakest = np.zeros(len(features.product_ids), dtype=np.float32)
+        filled = np.zeros(len(features.product_ids), dtype=np.int64)
+        for product_id, min_score, count in db.execute(text(
+            "SELECT product_id, MIN(score), COUNT(*) FROM product_similarity GROUP BY product_id"
+        )):
+            row = features.index.get(product_id)
+            if row is not None:
+                weakest[row] = min_score
+                filled[row] = count
+        threshold = np.where(filled < k, 0.0, weakest)
+        changed_vectors = features.vectors[changed_rows]
+        step = features.block_size()
+        for start in range(0, len(features.product_ids), step):
+            block = features.vectors[start:start + step]
+            best_changed = (block @ changed_vectors.T).max(axis=1)
+            hits = np.nonzero(best_changed > threshold[start:start + step])[0]
+            affected.update((hits + start).tolist())
+
+    rows = np.array(sorted(affected), dtype=np.int64)
+    written = _write_neighbors(db, features, rows) if len(rows) else 0
+    # Silinmiş ürünlerin kendi listeleri (FK cascade olmayan veritabanlarında)
+    removed = [pid for pid in queued if pid not in features.index]
+    if removed:
+        db.execute(
+            delete(ProductSimilarity)
+            .where(ProductSimilarity.product_id.in_(removed))
+            .execution_options(synchronize_session=False)
+        )
+    _dequeue(db, queued)
+    db.commit()
+    return {
+        "queued": len(queued),
+        "products_refreshed": len(rows),
+        "rows_written": written,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def queue_similarity_refresh(db: Session, product_id: int, deleted: bool = False) -> None:
+    """
+    Ürünü komşu listesi yeniden hesaplanacaklar kuyruğuna ekle; commit
+    çağıranındır. Silinen ürünler için onu listesinde tutan ürünler de eklenir.
+    """
+    if deleted:
+        db.execute(ENQUEUE_HOLDERS_QUERY, {"product_id": product_id})
+    db.execute(ENQUEUE_QUERY, {"product_id": product_id})
+
+
+def queue_similarity_refresh_many(db: Session, product_ids: Iterable[int]) -> None:
+    """
+    Birden fazla ürünü kuyruğa ekle (fiyat yazımları, kategori taşıma); commit
+    çağıranındır. Ortalama fiyat ve kategori ataları benzerlik özelliklerinin
+    parçasıdır, bu yüzden ikisi değişince de komşu listesi eskir.
+    """
+    params = [{"product_id": product_id} for product_id in sorted(set(product_ids))]
+    if params:
+        db.execute(ENQUEUE_QUERY, params)
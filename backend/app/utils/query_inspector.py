@@ -0,0 +1,190 @@
+import logging
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# İstek başına sorgu bütçeleri (rota şablonu -> en fazla sorgu). Bu uç
+# noktalar sayfa boyundan bağımsız, sabit sayıda sorgu yapar; bütçelerde
+# istek içinde yapılabilen kopya gecikme ölçümü için bir sorgu pay vardır.
+# Bütçe aşımı çoğunlukla tembel yüklenen bir ilişkinin (N+1) geri geldiği
+# anlamına gelir. Bütçeler yalnızca okuma (GET/HEAD) isteklerine uygulanır;
+# aynı rotadaki PUT/DELETE işleyicileri yazma yan işleri için daha çok sorgu yapar.
+DEFAULT_BUDGETS: Dict[str, int] = {
+    "/api/v1/products": 5,
+    "/api/v1/products/{product_id}": 5,
+    "/api/v1/products/{product_id}/similar": 6,
+    "/api/v1/markets/": 2,
+    "/api/v1/markets/{market_id}": 2,
+    "/api/v1/markets/{market_id}/products": 6,
+    "/api/v1/categories": 2,
+    "/api/v1/comments/": 2,
+    "/api/v1/price-history/product/{product_id}": 3,
+}
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|:\w+|\?")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    "raise" modunda bir istek sorgu bütçesini aştığında ya da N+1 deseni
+    gösterdiğinde fırlatılır.
+    """
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    İfadenin biçimi: sabitler ve parametreler ?, IN listeleri tek ? olur.
+
+    Yalnızca parametresi değişen ifadeler (ör. satır başına aynı SELECT)
+    aynı parmak izini verir.
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+BUDGETED_METHODS = frozenset({"GET", "HEAD"})
+
+
+def budget_for(route: Optional[str], method: Optional[str] = "GET") -> Optional[int]:
+    if route is None or method not in BUDGETED_METHODS:
+        return None
+    return settings.QUERY_BUDGETS.get(route, DEFAULT_BUDGETS.get(route))
+
+
+class StatementStats:
+    __slots__ = ("count", "seconds", "statement")
+
+    def __init__(self, statement: str):
+        self.count = 0
+        self.seconds = 0.0
+        self.statement = statement
+
+
+class _ExplainedSet:
+    """
+    Süreç boyunca EXPLAIN'i loglanmış parmak izleri; aynı plan tekrar
+    tekrar loglanmaz. Boyut sınırına ulaşınca sıfırlanır.
+    """
+
+    def __init__(self, limit: int = 1000):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._seen: set = set()
+
+    def claim(self, key: str) -> bool:
+        with self._lock:
+            if key in self._seen:
+                return False
+            if len(self._seen) >= self.limit:
+                self._seen.clear()
+            self._seen.add(key)
+            return True
+
+
+_explained = _ExplainedSet()
+
+
+def _explain(conn, statement: str, parameters: Any) -> Optional[str]:
+    """
+    İfadenin planını aynı bağlantıda, olay dinleyicilerini tetiklemeden al.
+
+    Yalnızca SELECT/WITH açıklanır; ANALYZE kullanılmaz, ifade yeniden
+    çalıştırılmaz.
+    """
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        prefix = "EXPLAIN "
+    elif dialect == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    else:
+        return None
+    if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
+    except Exception as e:
+        logger.debug("EXPLAIN failed: %s", e)
+        return None
+    finally:
+        cursor.close()
+
+
+def _route(scope) -> Optional[str]:
+    route = scope.get("route") if scope is not None else None
+    return getattr(route, "path", None)
+
+
+def inspect_statement(stats, conn, statement: str, parameters: Any, executemany: bool, seconds: float) -> None:
+    """
+    Tamamlanan bir ifadeyi isteğin parmak izi tablosuna işle; yavaş
+    ifadeleri planıyla logla, "raise" modunda bütçe ve N+1 ihlallerinde fırlat.
+    """
+    key = fingerprint(statement)
+    entry = stats.statements.get(key)
+    if entry is None:
+        entry = stats.statements[key] = StatementStats(statement)
+    entry.count += 1
+    entry.seconds += seconds
+
+    explain = settings.QUERY_INSPECTOR_EXPLAIN and not executemany
+    if seconds * 1000 >= settings.SLOW_QUERY_MS:
+        plan = _explain(conn, statement, parameters) if explain and _explained.claim("slow:" + key) else None
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s%s",
+            seconds * 1000, _route(stats.scope) or "-", key, f"\n{plan}" if plan else ""
+        )
+
+    if entry.count == settings.N_PLUS_ONE_THRESHOLD:
+        # Plan bir kez, eşik aşıldığı anda alınır; bağlantı hâlâ elimizde
+        if explain and _explained.claim("n+1:" + key):
+            plan = _explain(conn, statement, parameters)
+            if plan:
+                logger.warning("N+1 candidate plan for %s:\n%s", key, plan)
+        if settings.QUERY_INSPECTOR_MODE == "raise":
+            raise QueryBudgetExceeded(
+                f"N+1: statement repeated {entry.count} times on {_route(stats.scope) or '-'}: {key}"
+            )
+
+    if settings.QUERY_INSPECTOR_MODE == "raise":
+        budget = budget_for(_route(stats.scope), (stats.scope or {}).get("method"))
+        if budget is not None and stats.queries > budget:
+            raise QueryBudgetExceeded(
+                f"{_route(stats.scope)} exceeded its query budget of {budget}: {stats.queries} queries"
+            )
+
+
+def report_request(stats, route: str) -> List[Dict[str, Any]]:
+    """
+    İstek bitince N+1 adaylarını ve bütçe aşımını logla ("log" modu).
+
+    "raise" modunda bu ihlaller zaten istek sırasında fırlatılmıştır.
+    """
+    repeated = [
+        {"fingerprint": key, "count": entry.count, "ms": round(entry.seconds * 1000, 3)}
+        for key, entry in stats.statements.items()
+        if entry.count >= settings.N_PLUS_ONE_THRESHOLD
+    ]
+    for offender in repeated:
+        logger.warning(
+            "N+1 on %s: %d x %s (%.1f ms total)",
+            route, offender["count"], offender["fingerprint"], offender["ms"]
+        )
+    budget = budget_for(route, (stats.scope or {}).get("method"))
+    if budget is not None and stats.queries > budget:
+        logger.warning("%s exceeded its query budget of %d: %d queries", route, budget, stats.queries)
+    return repeated
@@ -0,0 +1,248 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from starlette.routing import Match
+
+from app.core.config import settings
+from app.utils.query_inspector import inspect_statement, report_request
+
+# Gecikme kovaları (saniye); DB süresi de aynı kovalarla ölçülür
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000)
+ROW_BUCKETS = (0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Yönlendiriciyle eşleşmeyen istekler (404) tek etikette toplanır;
+# ham yol etiket olursa seri sayısı sınırsız büyürdü
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestStats:
+    """
+    Tek bir isteğin veritabanı sayaçları; sorgu olayları bunu günceller.
+
+    `statements` yalnızca sorgu denetçisi açıkken tutulur (parmak izi ->
+    StatementStats).
+    """
+
+    __slots__ = ("queries", "db_seconds", "rows", "statements", "scope")
+
+    def __init__(self, scope=None, inspect: bool = False):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.statements = {} if inspect else None
+        self.scope = scope
+
+
+# Senkron uç noktalar thread havuzunda çalışır; Starlette bağlamı kopyaladığı
+# için aynı nesne orada da görünür ve yerinde güncellenir
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("request_metrics_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    starts = conn.info.get("request_metrics_start")
+    if stats is None or not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats.db_seconds += elapsed
+    stats.queries += 1
+    # SELECT için psycopg2 ve asyncpg satır sayısını bildirir; bildirmeyen
+    # sürücülerde (SQLite) -1 döner ve sayılmaz
+    rowcount = getattr(cursor, "rowcount", -1)
+    if rowcount and rowcount > 0:
+        stats.rows += rowcount
+    if stats.statements is not None:
+        inspect_statement(stats, conn, statement, parameters, executemany, elapsed)
+
+
+def _handle_error(context):
+    # Hata veren ifadede after_cursor_execute çağrılmaz; başlangıç zamanı
+    # burada atılmazsa havuzdaki bağlantının listesi sürekli büyürdü
+    connection = context.connection
+    starts = connection.info.get("request_metrics_start") if connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine) -> None:
+    """Motorun sorgularını o anki isteğin sayaçlarına işle (senkron motor)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_bound(bound: float) -> str:
+    return str(int(bound)) if float(bound).is_integer() else repr(float(bound))
+
+
+class Histogram:
+    """
+    Prometheus histogramı; seriler etiket değerlerine göre tutulur.
+    """
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        # etiketler -> [kova sayaçları (birikimsiz), toplam, adet]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _format_labels(self.labelnames, labels, f'le="{_format_bound(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _format_labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {count}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {total}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+class RequestMetrics:
+    """
+    Rota başına istek gecikmesi, sorgu sayısı, DB süresi, dönen satır ve
+    yanıt boyutu histogramları.
+
+    Sorgu sayısı histogramı N+1 gerilemelerini görünür kılar: sayfa başına
+    sabit sorgu yapan bir uç noktada yüksek kovalara düşen istekler belirir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        labels = ("method", "route")
+        self.duration = Histogram(
+            "http_request_duration_seconds", "Request latency in seconds.", LATENCY_BUCKETS, labels
+        )
+        self.queries = Histogram(
+            "http_request_db_queries", "Database queries executed per request.", QUERY_BUCKETS, labels
+        )
+        self.db_time = Histogram(
+            "http_request_db_seconds", "Time spent in database queries per request.", LATENCY_BUCKETS, labels
+        )
+        self.rows = Histogram(
+            "http_request_db_rows", "Rows returned by database queries per request.", ROW_BUCKETS, labels
+        )
+        self.size = Histogram(
+            "http_response_size_bytes", "Response body size in bytes.", SIZE_BUCKETS, labels
+        )
+        self._requests: Dict[Tuple[str, str, str], int] = {}
+
+    def record(self, method: str, route: str, status: int, duration: float, stats: RequestStats, size: int) -> None:
+        labels = (method, route)
+        with self._lock:
+            key = (method, route, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            self.duration.observe(labels, duration)
+            self.queries.observe(labels, stats.queries)
+            self.db_time.observe(labels, stats.db_seconds)
+            self.rows.observe(labels, stats.rows)
+            self.size.observe(labels, size)
+
+    def render(self) -> str:
+        """Prometheus metin biçimi (0.0.4)."""
+        with self._lock:
+            lines = ["# HELP http_requests_total Requests handled.", "# TYPE http_requests_total counter"]
+            for labels, count in sorted(self._requests.items()):
+                label_text = _format_labels(("method", "route", "status"), labels)
+                lines.append(f"http_requests_total{label_text} {count}")
+            for histogram in (self.duration, self.queries, self.db_time, self.rows, self.size):
+                lines.extend(histogram.render())
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+def _route_template(scope) -> str:
+    """
+    İsteğin rota şablonu (/api/v1/products/{product_id}).
+
+    Uç noktaya ulaşan isteklerde FastAPI rotayı scope'a yazar; önbellekten
+    dönen yanıtlarda rota burada yönlendiricinin tablosundan bulunur.
+    """
+    route = scope.get("route")
+    if route is None:
+        app = scope.get("app")
+        for candidate in getattr(getattr(app, "router", None), "routes", ()):
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """
+    Her HTTP isteğini ölçen ASGI ara katmanı; en dışta olmalıdır ki önbellek
+    isabetleri de ölçülsün.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.REQUEST_METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope, inspect=settings.QUERY_INSPECTOR_MODE != "off")
+        token = _current.set(stats)
+        response = {"status": 500, "size": 0}
+
+        async def measure(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, measure)
+        finally:
+            duration = time.perf_counter() - start
+            _current.reset(token)
+            route = _route_template(scope)
+            request_metrics.record(scope["method"], route, response["status"], duration, stats, response["size"])
+            if stats.statements is not None:
+                report_request(stats, route)
@@ -0,0 +1,520 @@
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.utils.events import event_bus, PRICE_CHANGED, PRICES_CHANGED
+from app.utils.http_cache import make_etag, etag_matches
+
+logger = logging.getLogger(__name__)
+
+# Uç noktanın koyduğu başlıklar yanıtla birlikte saklanır (ör. X-Next-Cursor,
+# X-Search-Truncated); isabette aynı URL aynı başlıkları döndürür. Bağlantıya
+# özgü (hop-by-hop) başlıklar, bu katmanın yeniden ürettikleri, çerezler ve
+# isteğin Origin'ine bağlı CORS başlıkları saklanmaz.
+UNSTORED_HEADERS = frozenset({
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade",
+    "content-length", "etag", "x-cache", "set-cookie", "vary",
+})
+UNSTORED_HEADER_PREFIXES = ("access-control-",)
+
+
+def _stored_header(name: str) -> bool:
+    name = name.lower()
+    return name not in UNSTORED_HEADERS and not name.startswith(UNSTORED_HEADER_PREFIXES)
+
+
+class CachedResponse:
+    __slots__ = ("body", "etag", "headers")
+
+    def __init__(self, body: bytes, etag: str, headers: List[Tuple[str, str]]):
+        self.body = body
+        self.etag = etag
+        self.headers = headers
+
+
+class MemoryBackend:
+    """
+    Süreç içi LRU arka ucu; her girdi etiketleriyle birlikte tutulur.
+
+    Etiket → anahtar dizini sayesinde bir etiketin geçersiz kılınması yalnızca
+    o etiketi taşıyan girdilere dokunur. Her işçi sürecinin kendi kopyası
+    vardır; birden çok süreçte tutarlı geçersiz kılma için redis kullanılmalı.
+    """
+
+    # Çağrılar bellek içidir; event loop'ta doğrudan yapılabilir
+    blocking = False
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._generation = 0
+
+    def _drop(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def set(self, key: str, response: CachedResponse, tags: Iterable[str], generation: Optional[int] = None) -> bool:
+        tags = tuple(tags)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self._ttl, response, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self._max_entries:
+                self._drop(next(iter(self._entries)))
+        return True
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    if key in self._entries:
+                        self._drop(key)
+                        removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Redis uyumlu bir sunucuda (Redis, Valkey, KeyDB...) paylaşılan arka uç.
+
+    Her yanıt bir hash olarak TTL ile saklanır; her etiket, kendisini taşıyan
+    anahtarların kümesidir. Nesil sayacı da sunucudadır: bir işçinin yaptığı
+    geçersiz kılma, diğer işçilerin o sırada ürettiği yanıtların saklanmasını
+    engeller. Böylece tüm işçi süreçleri aynı önbelleği ve aynı geçersiz
+    kılmaları görür.
+
+    İstemci senkrondur; ara katman bu arka ucun çağrılarını thread havuzunda
+    yapar, yazma işleyicileri zaten thread havuzunda çalışır.
+    """
+
+    PREFIX = "respcache:"
+    GENERATION_KEY = PREFIX + "generation"
+    blocking = True
+
+    def __init__(self, url: str, ttl: float):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the 'redis' package") from e
+        self._client = redis.Redis.from_url(url)
+        self._watch_error = redis.WatchError
+        self._ttl = max(1, int(ttl))
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        data = self._client.hgetall(self.PREFIX + key)
+        if not data:
+            return None
+        headers = [tuple(h) for h in json.loads(data[b"headers"])]
+        return CachedResponse(data[b"body"], data[b"etag"].decode(), headers)
+
+    def generation(self) -> int:
+        return int(self._client.get(self.GENERATION_KEY) or 0)
+
+    def set(self, key: str, response: CachedResponse, tags: Iterable[str], generation: Optional[int] = None) -> bool:
+        name = self.PREFIX + key
+        with self._client.pipeline() as pipe:
+            try:
+                # Nesil sayacı izlenir; kontrol ile yazma arasında başka bir
+                # işçi geçersiz kılarsa transaction düşer ve yanıt saklanmaz
+                pipe.watch(self.GENERATION_KEY)
+                if generation is not None and int(pipe.get(self.GENERATION_KEY) or 0) != generation:
+                    return False
+                pipe.multi()
+                pipe.hset(name, mapping={
+                    "body": response.body,
+                    "etag": response.etag,
+                    "headers": json.dumps(response.headers),
+                })
+                pipe.expire(name, self._ttl)
+                for tag in tags:
+                    pipe.sadd(self.PREFIX + "tag:" + tag, name)
+                    pipe.expire(self.PREFIX + "tag:" + tag, self._ttl)
+                pipe.execute()
+                return True
+            except self._watch_error:
+                return False
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        removed = 0
+        self._client.incr(self.GENERATION_KEY)
+        for tag in tags:
+            tag_key = self.PREFIX + "tag:" + tag
+            keys = self._client.smembers(tag_key)
+            if keys:
+                removed += self._client.delete(*keys)
+            self._client.delete(tag_key)
+        return removed
+
+    def clear(self) -> None:
+        keys = [key for key in self._client.scan_iter(match=self.PREFIX + "*") if key != self.GENERATION_KEY.encode()]
+        if keys:
+            self._client.delete(*keys)
+
+    def size(self) -> int:
+        return sum(
+            1 for key in self._client.scan_iter(match=self.PREFIX + "*")
+            if b":tag:" not in key and key != self.GENERATION_KEY.encode()
+        )
+
+
+def _entity_tags(item: Any) -> Set[str]:
+    """
+    Yanıttaki bir ürün/market/kategori sözlüğünün taşıdığı etiketler.
+
+    Ürünler, detaylarındaki marketler ve kategorileriyle de etiketlenir;
+    böylece market adı değiştiğinde o marketi gösteren ürün yanıtları da düşer.
+    """
+    tags: Set[str] = set()
+    if not isinstance(item, dict):
+        return tags
+    for detail in item.get("details") or ():
+        if isinstance(detail, dict) and detail.get("market_id") is not None:
+            tags.add(f"market:{detail['market_id']}")
+    for category in item.get("categories") or ():
+        if isinstance(category, dict) and category.get("id") is not None:
+            tags.add(f"category:{category['id']}")
+    for category_id in item.get("category_ids") or ():
+        tags.add(f"category:{category_id}")
+    if item.get("category_id") is not None:
+        tags.add(f"category:{item['category_id']}")
+    return tags
+
+
+def _collection_tags(entity: str, collection: str) -> Callable[[Dict[str, str], Any], Set[str]]:
+    def tags(params: Dict[str, str], body: Any) -> Set[str]:
+        result = {collection}
+        for item in body if isinstance(body, list) else ():
+            if isinstance(item, dict) and item.get("id") is not None:
+                result.add(f"{entity}:{item['id']}")
+            result |= _entity_tags(item)
+        return result
+    return tags
+
+
+def _item_tags(entity: str, param: str) -> Callable[[Dict[str, str], Any], Set[str]]:
+    def tags(params: Dict[str, str], body: Any) -> Set[str]:
+        return {f"{entity}:{params[param]}"} | _entity_tags(body)
+    return tags
+
+
+def _market_products_tags(params: Dict[str, str], body: Any) -> Set[str]:
+    return {f"market:{params['market_id']}", f"market-products:{params['market_id']}"} | _collection_tags("product", "products")(params, body)
+
+
+# API önekinden sonraki yol → etiket üreticisi
+CACHED_ROUTES: List[Tuple["re.Pattern[str]", Callable[[Dict[str, str], Any], Set[str]]]] = [
+    (re.compile(r"^/categories/?$"), _collection_tags("category", "categories")),
+    (re.compile(r"^/categories/(?P<category_id>\d+)$"), _item_tags("category", "category_id")),
+    (re.compile(r"^/markets/?$"), _collection_tags("market", "markets")),
+    (re.compile(r"^/markets/(?P<market_id>\d+)$"), _item_tags("market", "market_id")),
+    (re.compile(r"^/markets/(?P<market_id>\d+)/products$"), _market_products_tags),
+    (re.compile(r"^/products/?$"), _collection_tags("product", "products")),
+    (re.compile(r"^/products/(?P<product_id>\d+)$"), _item_tags("product", "product_id")),
+]
+
+
+class ResponseCache:
+    """
+    Katalog GET yanıtları için etiketli yanıt önbelleği.
+
+    Anahtar, yol ve sıralanmış sorgu parametrelerinden üretilir. Yazma
+    işleyicileri invalidate("product:123", "products") gibi etiketlerle ilgili
+    girdileri düşürür; TTL, bu uç noktaların dışından yapılan yazmalar için
+    güvenlik ağıdır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._backend = None
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    if settings.RESPONSE_CACHE_BACKEND == "redis":
+                        self._backend = RedisBackend(settings.RESPONSE_CACHE_REDIS_URL, settings.RESPONSE_CACHE_TTL_SECONDS)
+                    else:
+                        self._backend = MemoryBackend(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS)
+        return self._backend
+
+    @property
+    def enabled(self) -> bool:
+        return settings.RESPONSE_CACHE_BACKEND != "off"
+
+    @staticmethod
+    def make_key(path: str, query_string: str) -> str:
+        query = urlencode(sorted(parse_qsl(query_string, keep_blank_values=True)))
+        return f"{path.rstrip('/')}?{query}"
+
+    async def run(self, fn: Callable, *args):
+        """Arka uç çağrısını event loop'u bloklamadan yap (redis: thread havuzu)."""
+        if self.backend.blocking:
+            return await run_in_threadpool(fn, *args)
+        return fn(*args)
+
+    def generation(self) -> Optional[int]:
+        """
+        Geçersiz kılma sayacı; yanıt üretilirken değiştiyse o yanıt eski veri
+        içerebileceği için saklanmaz. Okunamazsa None döner ve yanıt saklanmaz.
+        """
+        try:
+            return self.backend.generation()
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Response cache generation read failed: %s", e)
+            return None
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            response = self.backend.get(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Response cache read failed: %s", e)
+            return None
+        with self._lock:
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return response
+
+    def set(self, key: str, response: CachedResponse, tags: Iterable[str], generation: Optional[int] = None) -> bool:
+        try:
+            return self.backend.set(key, response, tags, generation)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Response cache write failed: %s", e)
+            return False
+
+    def invalidate(self, *tags: str) -> None:
+        if not self.enabled:
+            return
+        try:
+            removed = self.backend.invalidate(tags)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Response cache invalidation failed for %s: %s", tags, e)
+            return
+        with self._lock:
+            self.invalidations += removed
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "backend": settings.RESPONSE_CACHE_BACKEND,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "not_modified": self.not_modified,
+                "invalidations": self.invalidations,
+                "errors": self.errors,
+            }
+        if self.enabled:
+            try:
+                stats["entries"] = self.backend.size()
+            except Exception:
+                stats["entries"] = None
+        return stats
+
+
+# Süreç genelinde paylaşılan yanıt önbelleği
+response_cache = ResponseCache()
+
+
+def render_response_cache_metrics() -> str:
+    """Yanıt önbelleği sayaçları (Prometheus metin biçimi)."""
+    stats = response_cache.stats()
+    metrics = [
+        ("response_cache_hits_total", "counter", "Responses served from the cache.", stats["hits"]),
+        ("response_cache_misses_total", "counter", "Cacheable requests that ran the endpoint.", stats["misses"]),
+        ("response_cache_not_modified_total", "counter", "304 responses for a matching If-None-Match.", stats["not_modified"]),
+        ("response_cache_invalidations_total", "counter", "Tag invalidations.", stats["invalidations"]),
+        ("response_cache_errors_total", "counter", "Cache backend errors.", stats["errors"]),
+    ]
+    if stats.get("entries") is not None:
+        metrics.append(("response_cache_entries", "gauge", "Entries in the cache.", stats["entries"]))
+    lines = []
+    for name, kind, documentation, value in metrics:
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}", f"{name} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+def _match(path: str) -> Optional[Tuple[Dict[str, str], Callable[[Dict[str, str], Any], Set[str]]]]:
+    prefix = settings.API_V1_STR
+    if not path.startswith(prefix):
+        return None
+    path = path[len(prefix):]
+    for pattern, tags in CACHED_ROUTES:
+        match = pattern.match(path)
+        if match:
+            return match.groupdict(), tags
+    return None
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class ResponseCacheMiddleware:
+    """
+    CACHED_ROUTES'taki GET istekleri için ASGI ara katmanı.
+
+    İsabet durumunda uç nokta ve veritabanı hiç çalışmaz. Her yanıt gövde
+    özetinden üretilen bir ETag taşır; If-None-Match eşleşirse 304 döner.
+
+    Uç noktanın başlıkları _stored_header() süzgeciyle saklanır; CORS gibi
+    isteğe bağlı başlıkları eklemesi için CORSMiddleware'in bu katmanın
+    dışında olması gerekir.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD") or not response_cache.enabled:
+            await self.app(scope, receive, send)
+            return
+        matched = _match(scope["path"])
+        if matched is None:
+            await self.app(scope, receive, send)
+            return
+        params, tag_fn = matched
+        key = response_cache.make_key(scope["path"], scope.get("query_string", b"").decode("latin-1"))
+        if_none_match = _header(scope, b"if-none-match")
+
+        cached = await response_cache.run(response_cache.get, key)
+        if cached is not None:
+            await self._send(send, scope, cached, if_none_match, "HIT")
+            return
+
+        generation = await response_cache.run(response_cache.generation)
+        start: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+        body = b"".join(chunks)
+        status_code = start.get("status", 500)
+        if status_code != 200:
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        headers = [
+            (name.decode("latin-1"), value.decode("latin-1"))
+            for name, value in start.get("headers", [])
+            if _stored_header(name.decode("latin-1"))
+        ]
+        response = CachedResponse(body, make_etag(hashlib.sha256(body).hexdigest()[:32]), headers)
+        try:
+            tags = tag_fn(params, json.loads(body))
+        except ValueError:
+            tags = set()
+        if generation is not None:
+            await response_cache.run(response_cache.set, key, response, tags, generation)
+        await self._send(send, scope, response, if_none_match, "MISS")
+
+    async def _send(self, send, scope, response: CachedResponse, if_none_match: Optional[str], state: str):
+        headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in response.headers]
+        headers.append((b"etag", response.etag.encode("latin-1")))
+        headers.append((b"x-cache", state.encode("latin-1")))
+        if etag_matches(if_none_match, response.etag):
+            with response_cache._lock:
+                response_cache.not_modified += 1
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        headers.append((b"content-length", str(len(response.body)).encode("latin-1")))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else response.body})
+
+
+def invalidate_on_price_change(db=None, product_id: int = None, market_id: int = None, **_) -> None:
+    """
+    Fiyat yazıldığında ürünün, o marketin ürün listesinin ve ürün
+    listelerinin yanıtlarını düşür. min_price/max_price filtreli bir listeye
+    yeni giren ürün o listenin etiketlerinde yoktur; bu yüzden "products"
+    koleksiyon etiketi de düşürülür.
+    """
+    response_cache.invalidate("products", f"product:{product_id}", f"market-products:{market_id}")
+
+
+def invalidate_on_prices_change(db=None, changes=(), **_) -> None:
+    """
+    Toplu fiyat yazımında etkilenen tüm etiketleri tek seferde düşür.
+    """
+    changes = list(changes)
+    tags = {f"product:{product_id}" for product_id, _, _ in changes}
+    tags.update(f"market-products:{market_id}" for _, market_id, _ in changes)
+    if tags:
+        response_cache.invalidate("products", *sorted(tags))
+
+
+event_bus.subscribe(PRICE_CHANGED, invalidate_on_price_change)
+event_bus.subscribe(PRICES_CHANGED, invalidate_on_prices_change)
@@ -0,0 +1,83 @@
+"""
+Toplu fiyat alarmı değerlendirme benchmark'ı.
+
+Çalıştırmak için (backend dizininde):
+    python -m benchmarks.bench_alert_evaluator --alerts 1000000 --products 20000
+"""
+import argparse
+import json
+import random
+import time
+
+from sqlalchemy import insert, func
+
+from benchmarks.common import make_session
+from app.models import Market, Notification, PriceAlert, Product, ProductDetail, User
+from app.utils.alert_evaluator import evaluate_price_alerts
+from app.utils.price_summary import rebuild_price_summaries
+
+
+def seed(db, alerts: int, products: int, markets: int, users: int, seed_value: int = 11):
+    rnd = random.Random(seed_value)
+    db.execute(insert(User), [
+        {"id": u, "name": f"user{u}", "email": f"user{u}@example.com", "password": "x"}
+        for u in range(1, users + 1)
+    ])
+    db.execute(insert(Market), [{"id": m, "name": f"Market {m}"} for m in range(1, markets + 1)])
+    db.execute(insert(Product), [{"id": p, "name": f"Ürün {p}"} for p in range(1, products + 1)])
+
+    base_prices = {p: rnd.uniform(5, 500) for p in range(1, products + 1)}
+    db.execute(insert(ProductDetail), [
+        {"product_id": p, "market_id": m, "price": round(base_prices[p] * rnd.uniform(0.8, 1.2), 2)}
+        for p in range(1, products + 1)
+        for m in rnd.sample(range(1, markets + 1), k=min(3, markets))
+    ])
+
+    chunk = 50_000
+    for start in range(1, alerts + 1, chunk):
+        rows = []
+        for alert_id in range(start, min(start + chunk, alerts + 1)):
+            product_id = rnd.randint(1, products)
+            rows.append({
+                "id": alert_id,
+                "user_id": rnd.randint(1, users),
+                "product_id": product_id,
+                "target_price": round(base_prices[product_id] * rnd.uniform(0.7, 1.1), 2),
+                "is_active": True,
+                "notified": False,
+            })
+        db.execute(insert(PriceAlert), rows)
+    db.commit()
+    rebuild_price_summaries(db)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--alerts", type=int, default=1_000_000)
+    parser.add_argument("--products", type=int, default=20_000)
+    parser.add_argument("--markets", type=int, default=20)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    db = make_session()
+    start = time.perf_counter()
+    seed(db, args.alerts, args.products, args.markets, args.users)
+    seed_seconds = time.perf_counter() - start
+
+    first = evaluate_price_alerts(db, batch_size=args.batch_size)
+    second = evaluate_price_alerts(db, batch_size=args.batch_size)
+
+    report = {
+        "alerts": args.alerts,
+        "batch_size": args.batch_size,
+        "seed_seconds": round(seed_seconds, 3),
+        "first_run": first,
+        "second_run": second,
+        "notifications": db.query(func.count(Notification.id)).scalar(),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Bölünmüş sepet planlayıcı benchmark'ı.
+
+Çalıştırmak için (backend dizininde):
+    python -m benchmarks.bench_basket_planner --markets 40 --items 300 --max-markets 3
+"""
+import argparse
+import json
+
+from benchmarks.common import make_session, measure
+from benchmarks.bench_market_comparison import seed
+from app.utils.basket_planner import plan_shopping_list
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--markets", type=int, default=40)
+    parser.add_argument("--items", type=int, default=300)
+    parser.add_argument("--max-markets", type=int, default=3)
+    parser.add_argument("--time-budget-ms", type=float, default=50.0)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    db = make_session()
+    seed(db, args.markets, args.items)
+
+    plan = plan_shopping_list(db, 1, args.max_markets, args.time_budget_ms)
+    report = {
+        "markets": args.markets,
+        "items": args.items,
+        "max_markets": args.max_markets,
+        "solver": plan["solver"],
+        "optimal": plan["optimal"],
+        "total_price": round(plan["total_price"], 2),
+        "missing_products": plan["missing_products"],
+        "timing": measure(
+            lambda: plan_shopping_list(db, 1, args.max_markets, args.time_budget_ms),
+            args.repeat
+        ),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Market karşılaştırma benchmark'ı (50 market × 200 liste kalemi).
+
+Çalıştırmak için (backend dizininde):
+    python -m benchmarks.bench_market_comparison --markets 50 --items 200
+"""
+import argparse
+import json
+import random
+
+from sqlalchemy import text
+
+from benchmarks.common import make_session, measure, QueryCounter
+from app.models import Market, Product, ProductDetail, ShoppingList, ShoppingListItem, User
+from app.utils.market_comparison import compare_markets
+
+
+def seed(db, markets: int, items: int, coverage: float = 0.8, seed_value: int = 42):
+    rnd = random.Random(seed_value)
+    db.add(User(id=1, name="bench", email="bench@example.com", password="x"))
+    db.add_all([Market(id=m, name=f"Market {m}") for m in range(1, markets + 1)])
+    db.add_all([Product(id=p, name=f"Ürün {p}") for p in range(1, items + 1)])
+    db.add(ShoppingList(id=1, user_id=1, name="bench"))
+    db.flush()
+
+    details = []
+    for product_id in range(1, items + 1):
+        base = rnd.uniform(5, 200)
+        for market_id in range(1, markets + 1):
+            if rnd.random() < coverage:
+                details.append({
+                    "product_id": product_id,
+                    "market_id": market_id,
+                    "price": round(base * rnd.uniform(0.85, 1.15), 2),
+                })
+    db.bulk_insert_mappings(ProductDetail, details)
+    db.bulk_insert_mappings(ShoppingListItem, [
+        {"shopping_list_id": 1, "product_id": p, "quantity": rnd.randint(1, 5)}
+        for p in range(1, items + 1)
+    ])
+    db.commit()
+
+
+def legacy_compare(db, shopping_list_id: int):
+    """
+    Eski N+1 uygulaması; karşılaştırma amaçlı. Adil bir ölçüm için
+    build_market_comparisons() ile aynı sözlükleri (kalemler, bulunan/eksik
+    sayıları, sıra) üretir.
+    """
+    total_products = db.execute(text("""
+        SELECT COUNT(*) FROM shopping_list_items WHERE shopping_list_id = :list_id
+    """), {"list_id": shopping_list_id}).scalar()
+    markets = db.execute(text("""
+        SELECT DISTINCT m.id, m.name
+        FROM shopping_list_items sli
+        JOIN product_details pd ON sli.product_id = pd.product_id
+        JOIN markets m ON pd.market_id = m.id
+        WHERE sli.shopping_list_id = :list_id
+    """), {"list_id": shopping_list_id}).fetchall()
+    comparisons = []
+    for market in markets:
+        rows = db.execute(text("""
+            SELECT p.id, p.name, sli.quantity, pd.price
+            FROM shopping_list_items sli
+            JOIN product_details pd ON sli.product_id = pd.product_id
+            JOIN products p ON sli.product_id = p.id
+            WHERE sli.shopping_list_id = :list_id AND pd.market_id = :market_id
+            ORDER BY sli.id
+        """), {"list_id": shopping_list_id, "market_id": market.id})
+        items = []
+        total_price = 0.0
+        for row in rows:
+            price = float(row.price)
+            quantity = row.quantity or 0
+            total_price += price * quantity
+            items.append({
+                "product_id": row.id,
+                "product_name": row.name,
+                "price": price,
+                "quantity": quantity
+            })
+        comparisons.append({
+            "market_id": market.id,
+            "market_name": market.name,
+            "total_price": total_price,
+            "items": items,
+            "found_products": len(items),
+            "missing_products": max(total_products - len(items), 0),
+            "total_products": total_products,
+        })
+    comparisons.sort(key=lambda x: (x["total_price"], x["market_id"]))
+    for rank, comparison in enumerate(comparisons, start=1):
+        comparison["rank"] = rank
+    return comparisons
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--markets", type=int, default=50)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    db = make_session()
+    seed(db, args.markets, args.items)
+    engine = db.get_bind()
+
+    # İlk çağrı fiyat matrisini yükler; sorgu sayısı ısınmış çağrıda ölçülür
+    compare_markets(db, 1)
+    with QueryCounter(engine) as engine_queries:
+        engine_result = compare_markets(db, 1)
+    with QueryCounter(engine) as legacy_queries:
+        legacy_result = legacy_compare(db, 1)
+    # İki uygulama aynı çıktıyı üretmiyorsa süreler karşılaştırılamaz
+    assert engine_result == legacy_result, "engine and legacy results differ"
+
+    report = {
+        "markets": args.markets,
+        "items": args.items,
+        "engine": dict(measure(lambda: compare_markets(db, 1), args.repeat), queries=engine_queries.count),
+        "legacy": dict(measure(lambda: legacy_compare(db, 1), args.repeat), queries=legacy_queries.count),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Ürün listesi benchmark'ı: joinedload + tam şema vs. sütun projeksiyonu + liste DTO'su.
+
+Çalıştırmak için (backend dizininde):
+    python -m benchmarks.bench_product_listing --products 100000 --markets 20
+"""
+import argparse
+import json
+import random
+
+from sqlalchemy import text
+from sqlalchemy.orm import joinedload
+
+from benchmarks.common import make_session, measure, QueryCounter
+from app.models import Category, Market, Product, ProductDetail
+from app.schemas.product import Product as ProductSchema, ProductListItem
+from app.utils.pagination import paginate
+from app.utils.price_summary import rebuild_price_summaries
+from app.utils.product_listing import LIST_COLUMNS, SUMMARY_JOIN, build_list_items, category_ids_query
+
+
+def seed(db, products: int, markets: int, categories: int = 50, seed_value: int = 11):
+    rnd = random.Random(seed_value)
+    db.add_all([Market(id=m, name=f"Market {m}") for m in range(1, markets + 1)])
+    db.add_all([Category(id=c, name=f"Kategori {c}") for c in range(1, categories + 1)])
+    db.flush()
+    connection = db.connection()
+    connection.execute(
+        text("INSERT INTO products (id, name, brand, barcode) VALUES (:id, :name, :brand, :barcode)"),
+        [{"id": p, "name": f"Ürün {p}", "brand": f"Marka {p % 97}", "barcode": f"869{p:010d}"}
+         for p in range(1, products + 1)]
+    )
+    connection.execute(
+        text("INSERT INTO product_category (product_id, category_id) VALUES (:p, :c)"),
+        [{"p": p, "c": 1 + p % categories} for p in range(1, products + 1)]
+    )
+    batch = []
+    for product_id in range(1, products + 1):
+        base = rnd.uniform(5, 200)
+        for market_id in range(1, markets + 1):
+            batch.append({"p": product_id, "m": market_id, "price": round(base * rnd.uniform(0.85, 1.15), 2)})
+        if len(batch) >= 100_000:
+            connection.execute(text("INSERT INTO product_details (product_id, market_id, price) VALUES (:p, :m, :price)"), batch)
+            batch = []
+    if batch:
+        connection.execute(text("INSERT INTO product_details (product_id, market_id, price) VALUES (:p, :m, :price)"), batch)
+    db.commit()
+    rebuild_price_summaries(db)
+
+
+def legacy_page(db, limit: int, skip: int):
+    """Eski liste: detaylar ve marketler joinedload ile, kategoriler serileştirmede tembel yüklenir."""
+    products = (
+        db.query(Product)
+        .options(joinedload(Product.details).joinedload(ProductDetail.market))
+        .order_by(Product.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    payload = [ProductSchema.model_validate(p).model_dump(mode="json") for p in products]
+    db.expunge_all()
+    return payload
+
+
+def projected_page(db, limit: int, cursor=None):
+    rows, next_cursor = paginate(
+        db.query(*LIST_COLUMNS).outerjoin(*SUMMARY_JOIN),
+        sort_column=Product.id, id_column=Product.id, limit=limit, cursor=cursor
+    )
+    items = build_list_items(rows, db.execute(category_ids_query([row.id for row in rows])).all())
+    return [ProductListItem.model_validate(item).model_dump(mode="json") for item in items], next_cursor
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--markets", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    db = make_session()
+    seed(db, args.products, args.markets)
+    engine = db.get_bind()
+
+    # Derin sayfa: listenin ortası (eski yöntem OFFSET, yenisi cursor)
+    deep_skip = (args.products // 2) // args.limit * args.limit
+    _, deep_cursor = projected_page(db, args.limit)
+    if deep_skip:
+        rows, deep_cursor = paginate(
+            db.query(Product.id), sort_column=Product.id, id_column=Product.id, limit=deep_skip
+        )
+
+    report = {"products": args.products, "markets": args.markets, "limit": args.limit, "pages": {}}
+    for page, skip, cursor in (("first", 0, None), ("deep", deep_skip, deep_cursor)):
+        with QueryCounter(engine) as legacy_queries:
+            legacy = legacy_page(db, args.limit, skip)
+        with QueryCounter(engine) as projected_queries:
+            projected, _ = projected_page(db, args.limit, cursor)
+        assert [p["id"] for p in legacy] == [p["id"] for p in projected]
+        report["pages"][page] = {
+            "legacy": {
+                "queries": legacy_queries.count,
+                "payload_bytes": len(json.dumps(legacy, ensure_ascii=False)),
+                **measure(lambda: legacy_page(db, args.limit, skip), args.repeat),
+            },
+            "projected": {
+                "queries": projected_queries.count,
+                "payload_bytes": len(json.dumps(projected, ensure_ascii=False)),
+                **measure(lambda: projected_page(db, args.limit, cursor), args.repeat),
+            },
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Ürün arama benchmark'ı: süreç içi ters indeks vs. ILIKE benzeri tam tarama.
+
+Çalıştırmak için (backend dizininde):
+    python -m benchmarks.bench_product_search --products 1000000
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks.common import measure
+from app.utils.product_search import ProductSearchIndex, normalize
+
+BRANDS = ["Pınar", "Sütaş", "Ülker", "Eti", "Torku", "İçim", "Şölen", "Tat", "Tamek", "Dimes",
+          "Uno", "Komili", "Yudum", "Banvit", "Erpiliç", "Doğuş", "Çaykur", "Filiz", "Nuh'un", "Bizim"]
+NOUNS = ["Süt", "Ayran", "Yoğurt", "Peynir", "Çikolata", "Gofret", "Bisküvi", "Makarna", "Pirinç",
+         "Bulgur", "Çay", "Kahve", "Şeker", "Un", "Zeytin", "Zeytinyağı", "Ekmek", "Salça", "Ketçap",
+         "Meyve Suyu", "Su", "Kola", "Dondurma", "Tavuk", "Sucuk", "Kaşar", "Lokum", "Helva", "Reçel", "Bal"]
+ADJECTIVES = ["Light", "Tam Yağlı", "Yarım Yağlı", "Organik", "Doğal", "Kakaolu", "Fındıklı",
+              "Çilekli", "Şekersiz", "Laktozsuz", "Ekonomik", "Aile Boyu", "Mini", "Klasik", "Sade"]
+SIZES = ["200g", "500g", "1kg", "1L", "2L", "330ml", "6'lı", "12'li", "750g", "5kg"]
+QUERIES = ["süt", "sut", "PINAR süt", "cikolata fındık", "ülker gofret", "içim", "yogurt light",
+           "zeytinyagi", "çay 1kg", "aile boyu dondurma", "şekersiz", "kaşar", "bal", "tavuk"]
+
+
+def generate_products(count: int, seed_value: int = 7):
+    rnd = random.Random(seed_value)
+    for product_id in range(1, count + 1):
+        brand = rnd.choice(BRANDS)
+        name = f"{brand} {rnd.choice(ADJECTIVES)} {rnd.choice(NOUNS)} {rnd.choice(SIZES)}"
+        yield product_id, name, brand, f"869{product_id:010d}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    rows = list(generate_products(args.products))
+
+    index = ProductSearchIndex()
+    start = time.perf_counter()
+    index.build(rows)
+    build_seconds = time.perf_counter() - start
+
+    # ILIKE '%q%' eşdeğeri: her sorguda tüm isimleri tara
+    haystack = [(product_id, normalize(f"{name} {brand}")) for product_id, name, brand, _ in rows]
+
+    def scan(query):
+        needle = normalize(query)
+        return [product_id for product_id, text in haystack if needle in text][:args.limit]
+
+    report = {
+        "products": args.products,
+        "build_seconds": round(build_seconds, 3),
+        "index": index.stats(),
+        "queries": {},
+    }
+    for query in QUERIES:
+        report["queries"][query] = {
+            "matches": len(index.search(query, args.limit)),
+            "index": measure(lambda: index.search(query, args.limit), args.repeat),
+            "scan": measure(lambda: scan(query), max(1, args.repeat // 2)),
+        }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
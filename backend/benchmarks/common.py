@@ -0,0 +1,85 @@
+import time
+import statistics
+from typing import Callable, Dict, Any, List, Sequence
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import StaticPool
+
+# app.db.base tüm modelleri içe aktarır; modellerden önce yüklenmelidir
+from app.db.base import Base
+
+
+def make_session(url: str = "sqlite://") -> Session:
+    """
+    Benchmark için boş bir veritabanı oluştur ve oturum döndür.
+    """
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False} if url.startswith("sqlite") else {},
+        poolclass=StaticPool if url == "sqlite://" else None,
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+class QueryCounter:
+    """
+    Bir engine üzerinde çalışan SQL ifadelerini sayar.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def measure(fn: Callable[[], Any], repeat: int = 20) -> Dict[str, float]:
+    """
+    Fonksiyonu `repeat` kez çalıştırıp milisaniye cinsinden istatistik döndür.
+    """
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "runs": repeat,
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p50_ms": round(timings[len(timings) // 2], 3),
+        "p95_ms": round(timings[min(int(len(timings) * 0.95), len(timings) - 1)], 3),
+        "max_ms": round(timings[-1], 3),
+    }
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """
+    Sıralı değerlerin q. yüzdeliği (en yakın sıra yöntemi, 0 < q <= 100).
+    """
+    index = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def latency_stats(latencies_ms: List[float]) -> Dict[str, float]:
+    """
+    Milisaniye cinsinden gecikmelerin ortalama, p50/p95/p99 ve en büyük değeri.
+    """
+    ordered = sorted(latencies_ms)
+    return {
+        "mean_ms": round(statistics.mean(ordered), 3),
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p95_ms": round(percentile(ordered, 95), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "max_ms": round(ordered[-1], 3),
+    }
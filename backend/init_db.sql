@@ -80,7 +80,9 @@ CREATE TABLE IF NOT EXISTS product_details (
     CONSTRAINT fk_product_details_product
     FOREIGN KEY (product_id) REFERENCES products(id),
     CONSTRAINT fk_product_details_market
-    FOREIGN KEY (market_id) REFERENCES markets(id)
+    FOREIGN KEY (market_id) REFERENCES markets(id),
+    CONSTRAINT uq_product_details_product_market
+    UNIQUE (product_id, market_id)
 );
 
 -- Create comments table
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import case
 from sqlalchemy.orm import Session
 from typing import List
 from database import get_db
 from models import Product
 from schemas import ProductCreate, Product as ProductSchema
+from app.utils.product_search import check_search_offset, search_product_ids, set_search_truncated
 
 router = APIRouter(
     prefix="/products",
@@ -12,6 +14,7 @@ router = APIRouter(
 
 @router.get("/", response_model=List[ProductSchema])
 def get_products(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
@@ -24,11 +27,14 @@ def get_products(
         query = query.filter(Product.category_id == category_id)
     
     if search:
-        search = f"%{search}%"
-        query = query.filter(
-            (Product.name.ilike(search)) |
-            (Product.brand.ilike(search)) |
-            (Product.barcode.ilike(search))
+        check_search_offset(skip)
+        # Ad, marka, barkod ve (rakam sorgularında) barkod parçası eşleşmeleri
+        ranked_ids = search_product_ids(db, search)
+        if not ranked_ids:
+            return []
+        set_search_truncated(response, ranked_ids)
+        query = query.filter(Product.id.in_(ranked_ids)).order_by(
+            case({product_id: rank for rank, product_id in enumerate(ranked_ids)}, value=Product.id)
         )
     
     products = query.offset(skip).limit(limit).all()
@@ -0,0 +1,14 @@
+"""
+Testlerin ortak ayarları.
+
+Motorlar ve ara katmanlar ayarlardan kurulduğu için ortam değişkenleri
+uygulama içe aktarılmadan önce, tüm test modülleri için bir kez ayarlanır;
+modüller aynı geçici SQLite veritabanını paylaşır.
+"""
+import os
+import tempfile
+
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'tests.db')}"
+os.environ["QUERY_INSPECTOR_MODE"] = "raise"
+os.environ["QUERY_INSPECTOR_EXPLAIN"] = "false"
+os.environ["RESPONSE_CACHE_BACKEND"] = "off"
@@ -0,0 +1,77 @@
+"""
+Fiyat alarmı değerlendiricisi testleri: tetikleme ve yeniden kurma kararları
+dilimin okunduğu andaki satırlara değil, UPDATE anındaki duruma göre verilir.
+
+Çalıştırmak için (backend dizininde):
+    python -m pytest tests
+"""
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from app.main import app  # noqa: F401  (modellerin ilişkileri uygulama ile yüklenir)
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.models import Product, User
+from app.models.notification import Notification
+from app.models.price_alert import PriceAlert
+from app.models.product_price_summary import ProductPriceSummary
+from app.utils.alert_evaluator import _batch_statement, apply_alert_batch
+
+
+@pytest.fixture
+def alert():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = User(name="Alarm", email=f"alarm{datetime.now().timestamp()}@example.com", password="x")
+        product = Product(name="Alarm Ürün")
+        db.add_all([user, product])
+        db.flush()
+        db.add(ProductPriceSummary(
+            product_id=product.id, min_price=20.0, max_price=20.0, avg_price=20.0,
+            market_count=1, updated_at=datetime.now(timezone.utc)
+        ))
+        alert = PriceAlert(user_id=user.id, product_id=product.id, target_price=10.0, notified=True)
+        db.add(alert)
+        db.commit()
+        yield db, alert.id, product.id, user.id
+    finally:
+        db.close()
+
+
+def evaluate(db, alert_id, before_apply=None):
+    rows = [row for row in db.execute(_batch_statement(alert_id - 1, 1)).all()]
+    if before_apply:
+        before_apply()
+    result = apply_alert_batch(db, rows, datetime.utcnow())
+    db.commit()
+    return result
+
+
+def test_rearms_when_price_is_above_target(alert):
+    db, alert_id, _, _ = alert
+    assert evaluate(db, alert_id)["rearmed"] == 1
+    assert db.scalar(select(PriceAlert.notified).where(PriceAlert.id == alert_id)) is False
+
+
+def test_does_not_rearm_an_alert_reached_after_the_read(alert):
+    db, alert_id, product_id, user_id = alert
+
+    def price_drops():
+        # Dilim okunduktan sonra fiyat hedefin altına iner ve tetikleyici alarmı bildirir
+        other = SessionLocal()
+        try:
+            other.execute(
+                update(ProductPriceSummary).where(ProductPriceSummary.product_id == product_id).values(min_price=8.0)
+            )
+            other.commit()
+        finally:
+            other.close()
+
+    assert evaluate(db, alert_id, price_drops)["rearmed"] == 0
+    assert db.scalar(select(PriceAlert.notified).where(PriceAlert.id == alert_id)) is True
+    # Sonraki çalıştırma aynı alarmı yeniden bildirmez
+    assert evaluate(db, alert_id)["notifications"] == 0
+    assert db.scalar(select(Notification.id).where(Notification.user_id == user_id)) is None
@@ -0,0 +1,39 @@
+"""
+Sepet planlayıcı testleri: kesin (tüm kombinasyonlar) aramanın da süre
+bütçesine uyması.
+
+Çalıştırmak için (backend dizininde):
+    python -m pytest tests
+"""
+import random
+import time
+from math import comb
+
+from app.main import app  # noqa: F401  (döngüsel içe aktarmayı önlemek için önce)
+from app.utils.basket_planner import EXACT_WORK_LIMIT, INF, BasketProblem, solve
+
+MARKETS = 60
+ITEMS = 50
+
+
+def problem() -> BasketProblem:
+    rng = random.Random(7)
+    items = [{"product_id": i, "product_name": f"Ürün {i}", "quantity": 1} for i in range(ITEMS)]
+    markets = [{"market_id": j, "market_name": f"Market {j}"} for j in range(MARKETS)]
+    costs = [[rng.uniform(1, 100) if rng.random() < 0.7 else INF for _ in markets] for _ in items]
+    return BasketProblem(items, markets, costs)
+
+
+def test_exact_search_respects_time_budget():
+    basket = problem()
+    assert comb(MARKETS, 2) * ITEMS <= EXACT_WORK_LIMIT
+
+    exact = solve(basket, max_markets=2, time_budget_ms=10_000)
+    assert (exact["solver"], exact["optimal"]) == ("exact", True)
+
+    start = time.perf_counter()
+    bounded = solve(basket, max_markets=2, time_budget_ms=0)
+    assert time.perf_counter() - start < 0.5
+    assert bounded["optimal"] is False
+    assert bounded["solver"] in ("exhaustive", "greedy")
+    assert bounded["score"] >= exact["score"]
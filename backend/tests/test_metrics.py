@@ -0,0 +1,44 @@
+"""
+/metrics testleri: bağlantı havuzu, okuma kopyası ve yanıt önbelleği
+sayaçları Prometheus çıktısında yer almalı.
+
+Çalıştırmak için (backend dizininde):
+    python -m pytest tests
+"""
+import asyncio
+
+import httpx
+
+from app.main import app
+
+
+def get(path: str) -> httpx.Response:
+    async def request():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path)
+
+    return asyncio.run(request())
+
+
+def test_metrics_include_pool_replica_and_cache_counters():
+    get("/api/v1/markets/")
+    response = get("/metrics")
+    assert response.status_code == 200
+    samples = {
+        line.split(" ")[0]: line.split(" ")[1]
+        for line in response.text.splitlines()
+        if line and not line.startswith("#")
+    }
+    # SQLite testlerinde havuz sayaçları sıfır kalabilir; seriler yine yayımlanır
+    for pool in ("sync", "async"):
+        assert f'db_pool_checkouts_total{{pool="{pool}"}}' in samples
+        assert f'db_pool_checkout_wait_seconds_max{{pool="{pool}"}}' in samples
+    assert samples["db_replica_configured"] == "0"
+    assert "response_cache_hits_total" in samples
+    assert "price_matrix_hits_total" in samples
+
+
+def test_database_stats_endpoints_are_gone():
+    assert get("/api/v1/database/pool-metrics").status_code == 404
+    assert get("/api/v1/database/response-cache-stats").status_code == 404
@@ -0,0 +1,109 @@
+"""
+Cursor (keyset) sayfalama testleri: bozuk cursor'ların reddedilmesi ve NULL
+sıralama değerleri olan sütunlarda sayfaların satır atlamadan, tekrarsız
+ilerlemesi.
+
+Çalıştırmak için (backend dizininde):
+    python -m pytest tests
+"""
+import asyncio
+import base64
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import update
+
+from app.main import app
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.models import Market, PriceHistory, Product
+from app.utils.pagination import paginate
+
+ROWS = 7
+
+
+def get(path: str) -> httpx.Response:
+    async def request():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path)
+
+    return asyncio.run(request())
+
+
+@pytest.fixture(scope="module")
+def history():
+    """created_at'i kısmen NULL olan fiyat geçmişi; (product_id, sıralı id'ler) döner."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        product = Product(name="Sayfalama Ürünü", barcode="8690000099999")
+        market = Market(name="Sayfalama Marketi")
+        db.add_all([product, market])
+        db.flush()
+        start = datetime(2024, 1, 1)
+        rows = [
+            PriceHistory(product_id=product.id, market_id=market.id, price=10.0 + i, created_at=start + timedelta(days=min(i, 3)))
+            for i in range(ROWS)
+        ]
+        db.add_all(rows)
+        db.flush()
+        # Çift satırlar NULL (server_default None'ı yutar); dolu olanlardan ikisi aynı zamanı paylaşır
+        db.execute(
+            update(PriceHistory)
+            .where(PriceHistory.id.in_([row.id for row in rows[::2]]))
+            .values(created_at=None)
+        )
+        db.commit()
+        rows = db.query(PriceHistory).filter(PriceHistory.product_id == product.id).populate_existing().all()
+        assert sum(row.created_at is None for row in rows) == (ROWS + 1) // 2
+        return product.id
+    finally:
+        db.close()
+
+
+def walk(product_id: int, descending: bool, limit: int = 2) -> list:
+    db = SessionLocal()
+    try:
+        query = db.query(PriceHistory).filter(PriceHistory.product_id == product_id)
+        ids, cursor = [], None
+        while True:
+            items, cursor = paginate(
+                query,
+                sort_column=PriceHistory.created_at,
+                id_column=PriceHistory.id,
+                limit=limit,
+                cursor=cursor,
+                descending=descending,
+            )
+            ids += [item.id for item in items]
+            if cursor is None:
+                return ids
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_pages_cross_null_sort_values(history, descending):
+    db = SessionLocal()
+    try:
+        rows = db.query(PriceHistory).filter(PriceHistory.product_id == history).all()
+    finally:
+        db.close()
+    # NULL en büyük değer sayılır: artanda sona, azalanda başa gelir
+    expected = sorted(
+        rows,
+        key=lambda row: (row.created_at is None, row.created_at or datetime.min, row.id),
+        reverse=descending,
+    )
+    for limit in (1, 2, 3):
+        assert walk(history, descending, limit) == [row.id for row in expected]
+
+
+@pytest.mark.parametrize("values", [["9"], [1.5], [True], [1, 2], [{"x": 1}]])
+def test_malformed_cursor_is_rejected(history, values):
+    cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+    response = get(f"/api/v1/products?limit=5&cursor={cursor}")
+    assert response.status_code == 400, response.text
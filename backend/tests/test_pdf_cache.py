@@ -0,0 +1,43 @@
+"""
+PDF önbelleği testleri: aynı içerik özetini paylaşan listeler birbirinin
+dosyasını silmemeli; liste -> dosya eşlemesi yeniden başlatmadan sonra da
+bilinmeli.
+
+Çalıştırmak için (backend dizininde):
+    python -m pytest tests
+"""
+import io
+
+from app.main import app  # noqa: F401  (döngüsel içe aktarmayı önlemek için önce)
+from app.utils.pdf_cache import PdfCache
+
+
+def read(cache: PdfCache, key: str, shopping_list_id: int):
+    handle = cache.open(key, shopping_list_id)
+    if handle is None:
+        return None
+    with handle:
+        return handle.read()
+
+
+def test_lists_sharing_a_key_keep_their_own_files(tmp_path):
+    cache = PdfCache(str(tmp_path), max_bytes=1 << 20)
+    cache.store("same", io.BytesIO(b"pdf"), shopping_list_id=1)
+    cache.store("same", io.BytesIO(b"pdf"), shopping_list_id=2)
+
+    # 1. listenin içeriği değişti, 2. liste silindi: diğerinin dosyası kalır
+    cache.store("changed", io.BytesIO(b"new"), shopping_list_id=1)
+    assert read(cache, "same", 2) == b"pdf"
+    cache.invalidate_list(2)
+    assert read(cache, "changed", 1) == b"new"
+    assert read(cache, "same", 2) is None
+
+
+def test_list_files_are_known_after_restart(tmp_path):
+    cache = PdfCache(str(tmp_path), max_bytes=1 << 20)
+    cache.store("a", io.BytesIO(b"pdf"), shopping_list_id=7)
+
+    restarted = PdfCache(str(tmp_path), max_bytes=1 << 20)
+    restarted.invalidate_list(7)
+    assert read(restarted, "a", 7) is None
+    assert list(tmp_path.iterdir()) == []
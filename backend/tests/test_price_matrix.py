@@ -0,0 +1,139 @@
+"""
+Süreç içi fiyat matrisi testleri: commit sonrası artımlı güncelleme,
+yeniden yükleme sırasında gelen yazmalar ve matristen hesaplanan market
+karşılaştırmasının product_details ile tutarlılığı.
+
+Çalıştırmak için (backend dizininde):
+    python -m pytest tests
+"""
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import text
+
+from app.main import app
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.models import Market, Product, ProductDetail, ShoppingList, ShoppingListItem, User
+from app.utils.basket_planner import plan_shopping_list
+from app.utils.market_comparison import compare_markets
+from app.utils.price_matrix import PriceMatrix, price_matrix
+
+# product_details'ten doğrudan hesaplanan beklenen fiyatlar
+EXPECTED_QUERY = text("""
+    SELECT pd.market_id, pd.product_id, pd.price
+    FROM shopping_list_items sli
+    JOIN product_details pd ON sli.product_id = pd.product_id
+    JOIN markets m ON pd.market_id = m.id
+    WHERE sli.shopping_list_id = :list_id
+""")
+
+
+def request(method: str, path: str, **kwargs) -> httpx.Response:
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.request(method, path, **kwargs)
+
+    return asyncio.run(send())
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = User(name="Matris", email="matrix@example.com", password="x")
+        markets = [Market(name=f"Matris Market {i}") for i in range(3)]
+        products = [Product(name=f"Matris Ürün {i}", barcode=f"7700{i:09d}") for i in range(4)]
+        db.add_all([user] + markets + products)
+        db.flush()
+        for i, product in enumerate(products[:3]):
+            for market in markets[:2]:
+                db.add(ProductDetail(product_id=product.id, market_id=market.id, price=10.0 + i + market.id))
+        shopping_list = ShoppingList(name="Matris", user_id=user.id)
+        db.add(shopping_list)
+        db.flush()
+        for quantity, product in enumerate(products, start=1):
+            db.add(ShoppingListItem(shopping_list_id=shopping_list.id, product_id=product.id, quantity=quantity))
+        db.commit()
+        return {
+            "list_id": shopping_list.id,
+            "product_ids": [product.id for product in products],
+            "market_ids": [market.id for market in markets],
+        }
+    finally:
+        db.close()
+
+
+def assert_matches_database(shopping_list_id: int) -> None:
+    db = SessionLocal()
+    try:
+        comparisons = compare_markets(db, shopping_list_id)
+        expected = {(r.market_id, r.product_id): r.price for r in db.execute(EXPECTED_QUERY, {"list_id": shopping_list_id})}
+    finally:
+        db.close()
+    actual = {
+        (comparison["market_id"], item["product_id"]): item["price"]
+        for comparison in comparisons
+        for item in comparison["items"]
+    }
+    assert actual == expected
+
+
+def test_matrix_cells():
+    matrix = PriceMatrix(column_headroom=1)
+    matrix._fill([(1, 10, 5.0), (2, 10, 6.0)])
+    matrix.set_prices([(1, 20, 4.0), (3, 30, 7.0)])
+    assert matrix._row_prices(1) == {10: 5.0, 20: 4.0}
+    matrix.remove_price(1, 10)
+    matrix.remove_market(30)
+    matrix.remove_product(2)
+    assert matrix._row_prices(1) == {20: 4.0}
+    assert matrix._row_prices(2) == {}
+    assert matrix._row_prices(3) == {}
+
+
+def test_writes_during_reload_survive_the_swap():
+    matrix = PriceMatrix()
+    matrix._fill([(1, 10, 5.0)])
+    matrix._pending = []
+    matrix.set_price(1, 10, 3.0)
+    matrix.set_price(2, 10, 8.0)
+    # Yeniden yükleme yazmalardan önce okunan durumu getirir
+    fresh = PriceMatrix()
+    fresh._fill([(1, 10, 5.0)])
+    with matrix._lock:
+        matrix._swap(fresh, None)
+    assert matrix._row_prices(1) == {10: 3.0}
+    assert matrix._row_prices(2) == {10: 8.0}
+
+
+def test_comparison_follows_committed_writes(seeded):
+    shopping_list_id = seeded["list_id"]
+    assert_matches_database(shopping_list_id)
+    assert price_matrix.stats()["loaded"]
+
+    created = request("POST", "/api/v1/product-details/", json={
+        "product_id": seeded["product_ids"][3], "market_id": seeded["market_ids"][2], "price": 2.5
+    })
+    assert created.status_code == 200, created.text
+    assert_matches_database(shopping_list_id)
+
+    updated = request("PUT", f"/api/v1/product-details/{created.json()['id']}", json={"price": 1.25})
+    assert updated.status_code == 200, updated.text
+    assert_matches_database(shopping_list_id)
+
+    assert request("DELETE", f"/api/v1/markets/{seeded['market_ids'][0]}").status_code == 200
+    assert_matches_database(shopping_list_id)
+
+
+def test_plan_uses_matrix_prices(seeded):
+    db = SessionLocal()
+    try:
+        plan = plan_shopping_list(db, seeded["list_id"], max_markets=1)
+    finally:
+        db.close()
+    assert plan["shopping_list_id"] == seeded["list_id"]
+    assert price_matrix.stats()["hits"] > 0
@@ -0,0 +1,74 @@
+"""
+Fiyat rollup testleri: geçmiş satırı silindiğinde kovaların yeniden
+hesaplanması.
+
+Çalıştırmak için (backend dizininde):
+    python -m pytest tests
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from app.main import app
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.models import Market, PriceHistory, Product
+from app.models.price_history_rollup import PriceHistoryRollup
+from app.utils.price_history_writer import record_price
+
+
+def request(method: str, path: str) -> httpx.Response:
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.request(method, path)
+
+    return asyncio.run(send())
+
+
+@pytest.fixture
+def history():
+    """Aynı güne düşen üç fiyat değişimi; (product_id, market_id, satır id'leri) döner."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        product = Product(name="Rollup Ürünü", barcode="8690000088888")
+        market = Market(name="Rollup Marketi")
+        db.add_all([product, market])
+        db.flush()
+        moment = datetime(2024, 3, 14, 9)
+        rows = [
+            record_price(db, product.id, market.id, price, moment + timedelta(hours=hour))
+            for hour, price in enumerate((10.0, 30.0, 20.0))
+        ]
+        db.commit()
+        return product.id, market.id, [row.id for row in rows]
+    finally:
+        db.close()
+
+
+def buckets(product_id: int, market_id: int):
+    db = SessionLocal()
+    try:
+        return {
+            rollup.granularity: (rollup.min_price, rollup.max_price, rollup.sum_price, rollup.sample_count, rollup.last_price)
+            for rollup in db.query(PriceHistoryRollup).filter(
+                PriceHistoryRollup.product_id == product_id, PriceHistoryRollup.market_id == market_id
+            )
+        }
+    finally:
+        db.close()
+
+
+def test_deleting_history_rebuilds_its_buckets(history):
+    product_id, market_id, ids = history
+    assert buckets(product_id, market_id) == {g: (10.0, 30.0, 60.0, 3, 20.0) for g in ("day", "week", "month")}
+
+    assert request("DELETE", f"/api/v1/price-history/{ids[1]}").status_code == 200
+    assert buckets(product_id, market_id) == {g: (10.0, 20.0, 30.0, 2, 20.0) for g in ("day", "week", "month")}
+
+    for row_id in (ids[0], ids[2]):
+        assert request("DELETE", f"/api/v1/price-history/{row_id}").status_code == 200
+    assert buckets(product_id, market_id) == {}
@@ -0,0 +1,47 @@
+"""
+Süreç içi ürün arama indeksi testleri: barkod parçası araması alt dizi
+indeksinden aynı sonuçları üretmeli ve güncellemeleri izlemeli.
+
+Çalıştırmak için (backend dizininde):
+    python -m pytest tests
+"""
+import random
+
+from app.main import app  # noqa: F401  (döngüsel içe aktarmayı önlemek için önce)
+from app.utils.product_search import ProductSearchIndex
+
+
+def barcodes():
+    rng = random.Random(3)
+    return {product_id: "".join(rng.choice("0123456789") for _ in range(13)) for product_id in range(1, 2001)}
+
+
+def fragment_matches(index: ProductSearchIndex, fragment: str):
+    return {product_id for product_id, _ in index.search(fragment, limit=10_000)}
+
+
+def test_barcode_fragments_match_a_linear_scan():
+    products = barcodes()
+    index = ProductSearchIndex()
+    index.build((product_id, "Ürün", None, barcode) for product_id, barcode in products.items())
+
+    rng = random.Random(5)
+    for _ in range(50):
+        barcode = rng.choice(list(products.values()))
+        start = rng.randrange(0, 9)
+        fragment = barcode[start:start + rng.randrange(4, 13 - start + 1)]
+        expected = {product_id for product_id, value in products.items() if fragment in value}
+        assert fragment_matches(index, fragment) == expected
+
+
+def test_barcode_fragments_follow_updates():
+    index = ProductSearchIndex()
+    index.build([(1, "Süt", None, "8690000012345"), (2, "Ayran", None, "8690000067890")])
+    assert fragment_matches(index, "12345") == {1}
+
+    index.update_product(1, "Süt", None, "8690000055555")
+    index.update_product(3, "Peynir", None, "1112345000000")
+    index.remove_product(2)
+    assert fragment_matches(index, "12345") == {3}
+    assert fragment_matches(index, "5555") == {1}
+    assert fragment_matches(index, "67890") == set()
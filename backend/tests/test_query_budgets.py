@@ -0,0 +1,144 @@
+"""
+Sorgu bütçesi regresyon testleri.
+
+Küçük bir SQLite veritabanı (tests/conftest.py) doldurulur ve DEFAULT_BUDGETS'taki her rota
+QUERY_INSPECTOR_MODE=raise ile çağrılır; tembel yüklenen bir ilişki (N+1)
+geri gelirse ya da bütçe aşılırsa istek QueryBudgetExceeded ile düşer.
+
+Çalıştırmak için (backend dizininde):
+    python -m pytest tests
+"""
+import asyncio
+from datetime import datetime
+
+import httpx
+import pytest
+
+from app.main import app
+from app.crud import crud_review
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.models import Category, Comment, Market, PriceHistory, Product, ProductDetail, User
+from app.utils import request_metrics
+from app.utils.category_tree import rebuild_category_tree
+from app.utils.price_summary import rebuild_price_summaries
+from app.utils.query_inspector import DEFAULT_BUDGETS, QueryBudgetExceeded, budget_for
+from app.core.config import settings
+
+# N+1 eşiğini aşacak kadar satır: tembel yükleme satır başına sorgu demektir
+ROWS = settings.N_PLUS_ONE_THRESHOLD + 5
+
+# Rota şablonu -> çağrılacak somut yol; id'ler bu modülün doldurduğu
+# satırlardan gelir (veritabanı diğer test modülleriyle paylaşılır)
+PATHS = {
+    "/api/v1/products": "/api/v1/products?limit=50",
+    "/api/v1/products/{product_id}": "/api/v1/products/{product_id}",
+    "/api/v1/products/{product_id}/similar": "/api/v1/products/{product_id}/similar",
+    "/api/v1/markets/": "/api/v1/markets/",
+    "/api/v1/markets/{market_id}": "/api/v1/markets/{market_id}",
+    "/api/v1/markets/{market_id}/products": "/api/v1/markets/{market_id}/products",
+    "/api/v1/categories": "/api/v1/categories",
+    "/api/v1/comments/": "/api/v1/comments/?product_id={product_id}",
+    "/api/v1/price-history/product/{product_id}": "/api/v1/price-history/product/{product_id}",
+}
+SEEDED = {}
+
+
+@pytest.fixture(scope="module")
+def client():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        parent = Category(name="Gıda")
+        db.add(parent)
+        db.flush()
+        categories = [Category(name=f"Kategori {i}", parent_id=parent.id) for i in range(3)]
+        markets = [Market(name=f"Market {i}") for i in range(ROWS)]
+        users = [User(name=f"Kullanıcı {i}", email=f"user{i}@example.com", password="x") for i in range(ROWS)]
+        db.add_all(categories + markets + users)
+        db.flush()
+        SEEDED["market_id"] = markets[0].id
+        for i in range(ROWS):
+            product = Product(name=f"Ürün {i}", brand="Marka", barcode=f"869{i:010d}")
+            product.categories = [categories[i % len(categories)]]
+            db.add(product)
+            db.flush()
+            SEEDED.setdefault("product_id", product.id)
+            for market in markets:
+                db.add(ProductDetail(product_id=product.id, market_id=market.id, price=10.0 + i + market.id))
+                db.add(PriceHistory(product_id=product.id, market_id=market.id, price=10.0 + i))
+            db.add(Comment(product_id=product.id, user_id=users[i].id, content="Güzel", updated_at=datetime.utcnow()))
+        for user in users:
+            db.add(Comment(product_id=SEEDED["product_id"], user_id=user.id, content="Tekrar aldım", updated_at=datetime.utcnow()))
+        db.commit()
+        rebuild_category_tree(db)
+        rebuild_price_summaries(db)
+    finally:
+        db.close()
+    yield get
+
+
+def get(path: str) -> httpx.Response:
+    async def request():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path)
+
+    return asyncio.run(request())
+
+
+def test_budget_routes_exist():
+    routes = {getattr(route, "path", None) for route in app.routes}
+    assert set(DEFAULT_BUDGETS) - routes == set()
+    assert set(PATHS) == set(DEFAULT_BUDGETS)
+
+
+@pytest.mark.parametrize("route", sorted(DEFAULT_BUDGETS))
+def test_route_within_query_budget(client, route):
+    response = client(PATHS[route].format(**SEEDED))
+    assert response.status_code == 200, response.text
+
+
+def test_product_reviews_load_users_in_one_query(client):
+    stats = request_metrics.RequestStats(inspect=True)
+    token = request_metrics._current.set(stats)
+    db = SessionLocal()
+    try:
+        reviews, _ = crud_review.get_product_reviews(db, product_id=SEEDED["product_id"], limit=100)
+    finally:
+        db.close()
+        request_metrics._current.reset(token)
+    assert len(reviews) == ROWS + 1
+    assert all(review.user_name for review in reviews)
+    assert stats.queries == 1
+
+
+def test_lazy_loading_raises(client):
+    stats = request_metrics.RequestStats(inspect=True)
+    token = request_metrics._current.set(stats)
+    db = SessionLocal()
+    try:
+        with pytest.raises(QueryBudgetExceeded):
+            for comment in db.query(Comment).filter(Comment.product_id == SEEDED["product_id"]).all():
+                comment.user.name
+    finally:
+        db.close()
+        request_metrics._current.reset(token)
+
+
+def test_failed_statement_does_not_leak_start_times(client):
+    stats = request_metrics.RequestStats()
+    token = request_metrics._current.set(stats)
+    try:
+        with engine.connect() as connection:
+            for _ in range(3):
+                with pytest.raises(Exception):
+                    connection.exec_driver_sql("SELECT * FROM no_such_table")
+            assert not connection.info.get("request_metrics_start")
+    finally:
+        request_metrics._current.reset(token)
+
+
+def test_budgets_apply_to_reads_only():
+    assert budget_for("/api/v1/markets/{market_id}", "GET") == DEFAULT_BUDGETS["/api/v1/markets/{market_id}"]
+    assert budget_for("/api/v1/markets/{market_id}", "DELETE") is None
@@ -0,0 +1,70 @@
+"""
+Yanıt önbelleği testleri: isabette uç nokta başlıklarının korunması ve fiyat
+olaylarının ürün listesi yanıtlarını düşürmesi.
+
+Çalıştırmak için (backend dizininde):
+    python -m pytest tests
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.main import app  # noqa: F401  (döngüsel içe aktarmayı önlemek için önce)
+from app.core.config import settings
+from app.utils.response_cache import (
+    MemoryBackend, ResponseCacheMiddleware, invalidate_on_price_change, invalidate_on_prices_change, response_cache
+)
+
+
+async def endpoint(scope, receive, send):
+    endpoint.calls += 1
+    await send({"type": "http.response.start", "status": 200, "headers": [
+        (b"content-type", b"application/json"),
+        (b"content-length", b"2"),
+        (b"x-search-truncated", b"true"),
+        (b"set-cookie", b"session=abc"),
+        (b"access-control-allow-origin", b"http://example.com"),
+    ]})
+    await send({"type": "http.response.body", "body": b"[]"})
+
+
+def get(path: str) -> httpx.Response:
+    async def send():
+        transport = httpx.ASGITransport(app=ResponseCacheMiddleware(endpoint))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path)
+
+    return asyncio.run(send())
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_BACKEND", "memory")
+    monkeypatch.setattr(response_cache, "_backend", MemoryBackend(100, 60.0))
+    endpoint.calls = 0
+    yield response_cache
+
+
+def test_hit_keeps_endpoint_headers(memory_cache):
+    path = f"{settings.API_V1_STR}/products?search=sut"
+    miss, hit = get(path), get(path)
+    assert (miss.headers["x-cache"], hit.headers["x-cache"]) == ("MISS", "HIT")
+    assert endpoint.calls == 1
+    for response in (miss, hit):
+        assert response.headers["x-search-truncated"] == "true"
+        assert response.headers["content-length"] == "2"
+    assert "set-cookie" not in hit.headers
+    assert "access-control-allow-origin" not in hit.headers
+
+
+@pytest.mark.parametrize("publish", [
+    lambda: invalidate_on_price_change(product_id=999, market_id=998),
+    lambda: invalidate_on_prices_change(changes=[(999, 998, 1.0)]),
+])
+def test_price_events_invalidate_product_lists(memory_cache, publish):
+    path = f"{settings.API_V1_STR}/products?min_price=1"
+    get(path)
+    publish()
+    assert get(path).headers["x-cache"] == "MISS"
+    assert endpoint.calls == 2
@@ -32,7 +32,7 @@ import {
 import { FavoriteBorder, CompareArrows, Close, Favorite, Logout, ShoppingCart } from '@mui/icons-material';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../contexts/AuthContext';
-import { productService, Product, ProductDetail } from '../services/product';
+import { productService, Product, ProductDetail, ProductListItem } from '../services/product';
 import { categoryService, Category } from '../services/category';
 import authService from '../services/auth';
 import { Market } from '../types/market';
@@ -41,7 +41,7 @@ import favoriteService from '../services/favorite';
 
 const Home: React.FC = () => {
   const navigate = useNavigate();
-  const [products, setProducts] = useState<Product[]>([]);
+  const [products, setProducts] = useState<ProductListItem[]>([]);
   const [categories, setCategories] = useState<Category[]>([]);
   const [loading, setLoading] = useState(true);
   const [searchQuery, setSearchQuery] = useState('');
@@ -171,7 +171,7 @@ const Home: React.FC = () => {
       if (categoryId) {
         // Frontend'de kategoriye göre filtreleme yap
         const filteredProducts = allProducts.filter(product => 
-          product.categories.some(category => category.id === categoryId)
+          product.category_ids.includes(categoryId)
         );
         console.log('Filtered products by category:', filteredProducts);
         setProducts(filteredProducts);
@@ -195,7 +195,7 @@ const Home: React.FC = () => {
       // Kategori filtresini uygula
       if (selectedCategory) {
         filteredProducts = filteredProducts.filter(product => 
-          product.categories.some(category => category.id === selectedCategory)
+          product.category_ids.includes(selectedCategory)
         );
       }
 
@@ -222,8 +222,8 @@ const Home: React.FC = () => {
   const handleSort = (value: string) => {
     setSortBy(value);
     const sortedProducts = [...products].sort((a, b) => {
-      const priceA = getLowestPrice(a.details || []);
-      const priceB = getLowestPrice(b.details || []);
+      const priceA = a.min_price;
+      const priceB = b.min_price;
       
       switch (value) {
         case 'price_asc':
@@ -259,7 +259,7 @@ const Home: React.FC = () => {
     }).format(price);
   };
 
-  const handleProductClick = async (product: Product) => {
+  const handleProductClick = async (product: ProductListItem) => {
     try {
       console.log('Fetching product details for:', product.id);
       const productWithDetails = await productService.getProductById(product.id);
@@ -448,12 +448,9 @@ const Home: React.FC = () => {
                         {product.brand}
                       </Typography>
                     )}
-                    <Typography variant="body2" color="text.secondary" sx={{ mb: 2 }}>
-                      {product.description}
-                    </Typography>
                     <Box sx={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
                       <Typography variant="h6" color="primary">
-                        {formatPrice(getLowestPrice(product.details || []))}
+                        {formatPrice(product.min_price)}
                       </Typography>
                       <Box>
                         <IconButton
@@ -14,6 +14,18 @@ export interface Product {
   categories: Category[];
 }
 
+// GET /products liste özeti; detaylar ve kategoriler /products/{id}'dedir
+export interface ProductListItem {
+  id: number;
+  name: string;
+  brand: string | null;
+  image_url: string | null;
+  min_price: number | null;
+  max_price: number | null;
+  market_count: number;
+  category_ids: number[];
+}
+
 export interface ProductDetail {
     id: number;
     product_id: number;
@@ -49,7 +61,7 @@ export interface Category {
 }
 
 export const productService = {
-  async getAllProducts(): Promise<Product[]> {
+  async getAllProducts(): Promise<ProductListItem[]> {
     const response = await api.get('/products/');
     return response.data;
   },